@@ -14,6 +14,16 @@ def _get_list(name: str, default: str) -> list[str]:
     return [s.strip() for s in os.getenv(name, default).split(",") if s.strip()]
 
 
+def _get_float_map(name: str, default: str) -> dict[str, float]:
+    # "key=value,key=value" -> {key: float(value)}
+    result = {}
+    for item in _get_list(name, default):
+        key, _, value = item.partition("=")
+        if key.strip() and value.strip():
+            result[key.strip()] = float(value)
+    return result
+
+
 @dataclass
 class Settings:
     # Bhashini
@@ -22,9 +32,104 @@ class Settings:
     BHASHINI_MT_URL: str = os.getenv("BHASHINI_MT_URL", "")
     BHASHINI_TTS_URL: str = os.getenv("BHASHINI_TTS_URL", "")
     BHASHINI_OCR_URL: str = os.getenv("BHASHINI_OCR_URL", "")
+    # Send Bhashini calls to another host (e.g. the bench mock server); paths are kept
+    BHASHINI_BASE_URL: str = os.getenv("BHASHINI_BASE_URL", "")
 
     # Gemini
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
+    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "")
+    # Alternative Gemini API host (e.g. the bench mock server)
+    GEMINI_BASE_URL: str = os.getenv("GEMINI_BASE_URL", "")
+    # How long a resolved model id is trusted before it is re-probed in the background
+    GEMINI_MODEL_CACHE_TTL: float = float(os.getenv("GEMINI_MODEL_CACHE_TTL", "900"))
+    # Ask Gemini to answer directly in target_lang (hi/te/kn) instead of translating via MT
+    GEMINI_NATIVE_TARGET_LANG: bool = _get_bool("GEMINI_NATIVE_TARGET_LANG", False)
+
+    # Map-reduce summarization for long inputs (token counts are estimates)
+    SUMMARY_MAP_THRESHOLD_TOKENS: int = int(os.getenv("SUMMARY_MAP_THRESHOLD_TOKENS", "3000"))
+    SUMMARY_CHUNK_TOKENS: int = int(os.getenv("SUMMARY_CHUNK_TOKENS", "1500"))
+    SUMMARY_MAP_CONCURRENCY: int = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+
+    # Streaming: max concurrent MT/TTS calls per streamed response
+    STREAM_MAX_CONCURRENCY: int = int(os.getenv("STREAM_MAX_CONCURRENCY", "4"))
+
+    # Itinerary cache
+    ITINERARY_CACHE_TTL: float = float(os.getenv("ITINERARY_CACHE_TTL", "21600"))
+    ITINERARY_CACHE_MAX_ENTRIES: int = int(os.getenv("ITINERARY_CACHE_MAX_ENTRIES", "512"))
+
+    # Cross-response cache of translated short phrases (place names, dishes, ...)
+    PHRASE_CACHE_TTL: float = float(os.getenv("PHRASE_CACHE_TTL", "86400"))
+    PHRASE_CACHE_MAX_ENTRIES: int = int(os.getenv("PHRASE_CACHE_MAX_ENTRIES", "10000"))
+
+    # SQLite file (WAL mode) holding the phrase/itinerary caches for all worker processes; empty = per process
+    SHARED_CACHE_DB: str = os.getenv("SHARED_CACHE_DB", "")
+    # Cache backend: memory, sqlite or redis (empty = sqlite if SHARED_CACHE_DB is set, else memory)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "").strip().lower()
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    CACHE_KEY_PREFIX: str = os.getenv("CACHE_KEY_PREFIX", "bhashayatra:")
+
+    # Chat sessions (set CHAT_SESSION_DB to a SQLite file path to persist them)
+    CHAT_SESSION_TTL: float = float(os.getenv("CHAT_SESSION_TTL", "7200"))
+    CHAT_SESSION_MAX_ENTRIES: int = int(os.getenv("CHAT_SESSION_MAX_ENTRIES", "1000"))
+    CHAT_SESSION_DB: str = os.getenv("CHAT_SESSION_DB", "")
+    CHAT_HISTORY_TOKEN_BUDGET: int = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+    CHAT_KEEP_RECENT_TURNS: int = int(os.getenv("CHAT_KEEP_RECENT_TURNS", "4"))
+
+    # Live speech translation over WebSocket (/speech/stream)
+    SPEECH_STREAM_MAX_INFLIGHT: int = int(os.getenv("SPEECH_STREAM_MAX_INFLIGHT", "2"))
+    VAD_ENERGY_THRESHOLD: float = float(os.getenv("VAD_ENERGY_THRESHOLD", "500"))
+    VAD_SILENCE_MS: int = int(os.getenv("VAD_SILENCE_MS", "600"))
+
+    # Request deadlines (seconds); clients may lower them with the X-Request-Timeout header
+    DEFAULT_REQUEST_TIMEOUT: float = float(os.getenv("DEFAULT_REQUEST_TIMEOUT", "120"))
+    REQUEST_TIMEOUTS: dict[str, float] = None
+
+    # Admission control: concurrency and wait-queue size per pool, max queueing time (seconds)
+    ADMISSION_ENABLED: bool = _get_bool("ADMISSION_ENABLED", True)
+    ADMISSION_CHEAP_CONCURRENCY: int = int(os.getenv("ADMISSION_CHEAP_CONCURRENCY", "32"))
+    ADMISSION_CHEAP_QUEUE: int = int(os.getenv("ADMISSION_CHEAP_QUEUE", "64"))
+    ADMISSION_EXPENSIVE_CONCURRENCY: int = int(os.getenv("ADMISSION_EXPENSIVE_CONCURRENCY", "8"))
+    ADMISSION_EXPENSIVE_QUEUE: int = int(os.getenv("ADMISSION_EXPENSIVE_QUEUE", "16"))
+    ADMISSION_MAX_QUEUE_WAIT: float = float(os.getenv("ADMISSION_MAX_QUEUE_WAIT", "5"))
+
+    # Upstream scheduling: concurrent calls per Bhashini endpoint, WFQ weights per priority
+    # class, and slots bulk calls may never take
+    UPSTREAM_MAX_CONCURRENCY: int = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "4"))
+    UPSTREAM_CLASS_WEIGHTS: dict[str, float] = None
+    UPSTREAM_INTERACTIVE_RESERVED: int = int(os.getenv("UPSTREAM_INTERACTIVE_RESERVED", "1"))
+
+    # Asynchronous jobs (POST /jobs): SQLite queue file, worker count, result retention (seconds),
+    # largest accepted request body (MB)
+    JOBS_DB: str = os.getenv("JOBS_DB", "jobs.db")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_RESULT_TTL: float = float(os.getenv("JOB_RESULT_TTL", "86400"))
+    JOB_MAX_UPLOAD_MB: float = float(os.getenv("JOB_MAX_UPLOAD_MB", "100"))
+    JOBS_RECOVER_ON_START: bool = _get_bool("JOBS_RECOVER_ON_START", True)
+    # Webhook hosts allowed even if they resolve to private/loopback addresses (e.g. an internal service)
+    JOB_WEBHOOK_ALLOWED_HOSTS: list[str] = None
+
+    # Per-request profiling: requests with X-Profile: <PROFILING_TOKEN> are profiled (pyinstrument)
+    PROFILING_ENABLED: bool = _get_bool("PROFILING_ENABLED", False)
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "50"))
+    PROFILE_INTERVAL: float = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+
+    # Event-loop lag monitor: stacks of code blocking the loop longer than the threshold are captured
+    LOOP_MONITOR_ENABLED: bool = _get_bool("LOOP_MONITOR_ENABLED", True)
+    LOOP_LAG_INTERVAL: float = float(os.getenv("LOOP_LAG_INTERVAL", "0.05"))
+    LOOP_LAG_THRESHOLD: float = float(os.getenv("LOOP_LAG_THRESHOLD", "0.1"))
+    LOOP_LAG_MAX_CAPTURES: int = int(os.getenv("LOOP_LAG_MAX_CAPTURES", "50"))
+
+    # Tracing: spans per request, pipeline stage and Bhashini call (W3C traceparent propagation)
+    TRACING_ENABLED: bool = _get_bool("TRACING_ENABLED", False)
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    OTEL_EXPORTER_OTLP_ENDPOINT: str = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "")
+
+    # Rolling per-endpoint upstream statistics (GET /admin/upstreams)
+    UPSTREAM_STATS_WINDOWS: list[float] = None
+    UPSTREAM_STATS_SLICE: float = float(os.getenv("UPSTREAM_STATS_SLICE", "10"))
 
     # CORS / Server
     ALLOWED_ORIGINS: list[str] = None
@@ -32,6 +137,22 @@ class Settings:
     PORT: int = int(os.getenv("PORT", "8000"))
 
     def __post_init__(self):
+        if self.REQUEST_TIMEOUTS is None:
+            # Per-endpoint defaults, longest path prefix wins
+            self.REQUEST_TIMEOUTS = _get_float_map(
+                "REQUEST_TIMEOUTS",
+                "/unified/text=20,/unified/audio=60,/unified/image=60,"
+                "/mt=20,/translate=20,/tts=30,/asr=45,/ocr=45"
+            )
+        if self.UPSTREAM_CLASS_WEIGHTS is None:
+            self.UPSTREAM_CLASS_WEIGHTS = _get_float_map(
+                "UPSTREAM_CLASS_WEIGHTS", "interactive=8,standard=3,bulk=1"
+            )
+        if self.JOB_WEBHOOK_ALLOWED_HOSTS is None:
+            self.JOB_WEBHOOK_ALLOWED_HOSTS = [h.lower() for h in _get_list("JOB_WEBHOOK_ALLOWED_HOSTS", "")]
+        if self.UPSTREAM_STATS_WINDOWS is None:
+            # Sliding windows (seconds) reported per upstream endpoint
+            self.UPSTREAM_STATS_WINDOWS = [float(w) for w in _get_list("UPSTREAM_STATS_WINDOWS", "60,300,900")]
         if self.ALLOWED_ORIGINS is None:
             # Default allow local dev origins, including simple static site on :5500 and Vite (:5173/:5174)
             self.ALLOWED_ORIGINS = _get_list(
@@ -1,13 +1,50 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from .config import settings
 from .routers import translate_speech, image_translate, itinerary, chat, summarize, mt
 from .routers import multilingual_translate, multilingual_asr, multilingual_tts, multilingual_ocr
-from .routers import unified_operations
+from .routers import unified_operations, admin, jobs
+from .routers.unified_operations import timing_headers
+from .services.jobs import start_workers, stop_workers
+from .utils.admission import AdmissionMiddleware
+from .utils.deadline import DeadlineMiddleware, DeadlineExceeded
+from .utils.loop_monitor import start_monitor, stop_monitor
+from .utils.metrics import MetricsMiddleware, mark_process_dead, render as render_metrics
+from .utils.priority import PriorityMiddleware
+from .utils.profiling import ProfilingMiddleware
+from .utils.tracing import TracingMiddleware, flush as flush_traces
 
 app = FastAPI(title="TourBuddy AI API", version="0.1.0")
 
+# Middleware added later wraps middleware added earlier, so the order is
+# CORS -> [tracing] -> metrics -> deadline -> priority -> admission -> [profiling] -> app: queueing time counts
+# against the deadline and shows in request latency, and load-shedding 503s still
+# carry CORS headers.
+
+# Opt-in per-request profiling (not installed at all unless enabled)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Admission control / load shedding (cheap vs expensive pools)
+app.add_middleware(AdmissionMiddleware)
+
+# Upstream priority class (interactive/standard/bulk, lowered by X-Priority)
+app.add_middleware(PriorityMiddleware)
+
+# Request deadlines (X-Request-Timeout header or per-endpoint default)
+app.add_middleware(DeadlineMiddleware)
+
+# Prometheus request metrics
+app.add_middleware(MetricsMiddleware)
+
+# Request tracing (not installed at all unless enabled)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -17,11 +54,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": str(exc)}, headers=timing_headers(request))
+
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_with_timing(request: Request, exc: StarletteHTTPException):
+    # Failed unified operations still report how far their pipeline got
+    response = await http_exception_handler(request, exc)
+    response.headers.update(timing_headers(request))
+    return response
+
+@app.on_event("startup")
+async def start_job_workers():
+    await start_workers()
+
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    start_monitor()
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await stop_workers()
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await stop_monitor()
+
+
+@app.on_event("shutdown")
+def release_metrics():
+    mark_process_dead()
+
+
+@app.on_event("shutdown")
+def export_pending_spans():
+    flush_traces()
+
 # Health
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+# Prometheus scrape endpoint (aggregates all workers when PROMETHEUS_MULTIPROC_DIR is set)
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 # Routers
 # Legacy endpoints (keep for backward compatibility)
 app.include_router(translate_speech.router)
@@ -39,3 +124,9 @@ app.include_router(multilingual_ocr.router)
 
 # Unified operations endpoint (recommended for UI)
 app.include_router(unified_operations.router)
+
+# Asynchronous jobs for long operations
+app.include_router(jobs.router)
+
+# Operational endpoints
+app.include_router(admin.router)
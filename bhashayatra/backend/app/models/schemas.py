@@ -8,6 +8,27 @@ class ItineraryRequest(BaseModel):
     interests: Optional[List[str]] = None
     target_lang: str = "en"
     speak: bool = True
+    use_cache: bool = True  # set to false to force a freshly generated plan
+
+
+class ItinerarySlot(BaseModel):
+    time_of_day: str  # morning / afternoon / evening
+    place: str
+    activity: str
+    travel_time: Optional[str] = None
+    entry_fee: Optional[str] = None
+    food: Optional[str] = None
+
+
+class ItineraryDay(BaseModel):
+    day: int
+    title: Optional[str] = None
+    slots: List[ItinerarySlot]
+
+
+class StructuredItinerary(BaseModel):
+    destination: str
+    days: List[ItineraryDay]
 
 
 class ChatMessage(BaseModel):
@@ -16,7 +37,10 @@ class ChatMessage(BaseModel):
 
 
 class ChatRequest(BaseModel):
-    messages: List[ChatMessage]
+    messages: List[ChatMessage] = []
+    # Server-side session mode: send only the new message, plus session_id after the first turn
+    session_id: Optional[str] = None
+    message: Optional[str] = None
     target_lang: str = "en"
     speak: bool = False
 
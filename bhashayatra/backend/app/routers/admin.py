@@ -0,0 +1,61 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from ..config import settings
+from ..services.bhashini import upstream_endpoints
+from ..services.upstream_scheduler import scheduler_stats
+from ..utils.admission import admission_stats
+from ..utils.loop_monitor import loop_lag_stats
+from ..utils.profiling import list_profiles, profile_file, token_matches
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/admission")
+async def admission():
+    """Per-pool admission state: in-flight, queued, admitted/rejected counts and queueing time."""
+    return admission_stats()
+
+
+@router.get("/scheduler")
+async def scheduler():
+    """Per-endpoint upstream call slots: in-flight, queued and completed calls by priority class."""
+    return scheduler_stats()
+
+
+@router.get("/upstreams")
+async def upstreams():
+    """Per Bhashini endpoint: p50/p90/p99 latency, error rate and call counts per sliding window, last success/error."""
+    return upstream_endpoints()
+
+
+@router.get("/loop-lag")
+async def loop_lag():
+    """Event-loop lag summary and recent blocking captures (stack and route), newest first."""
+    return loop_lag_stats()
+
+
+def _require_profiling(token: Optional[str]) -> None:
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not token_matches(token):
+        raise HTTPException(status_code=403, detail="Invalid X-Profile token")
+
+
+@router.get("/profiles")
+async def profiles(x_profile: Optional[str] = Header(None)):
+    """Recently captured request profiles, newest first (requires the X-Profile token)."""
+    _require_profiling(x_profile)
+    return list_profiles()
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """Download a profile as speedscope JSON (open at https://www.speedscope.app)."""
+    _require_profiling(x_profile)
+    path = profile_file(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.speedscope.json")
@@ -1,15 +1,106 @@
-from fastapi import APIRouter
+import asyncio
+from typing import AsyncIterator
+from fastapi import APIRouter, HTTPException
 from ..models.schemas import ChatRequest
-from ..services.gemini import chat_completion
-from ..services.bhashini import mt_translate, tts_synthesize
+from ..services.gemini import chat_completion, stream_chat
+from ..services.bhashini import tts_synthesize
+from ..services.localize import native_target_lang, localize_output
+from ..services.chat_sessions import (
+    ChatSession,
+    get_or_create_session,
+    get_session,
+    delete_session,
+    append_exchange,
+    schedule_compaction,
+)
+from ..services.streaming import stream_with_translation, sse_response, StreamEvent
+from ..utils.languages import validate_language
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
+def _uses_session(req: ChatRequest) -> bool:
+    return req.session_id is not None or req.message is not None
+
+
+async def _start_session_turn(req: ChatRequest) -> tuple[ChatSession, list[dict[str, str]]]:
+    """
+    The session and the history to prompt with, ending in the new user message.
+
+    The message is only added to the session together with the reply, so a
+    failed generation leaves no unanswered turn behind.
+    """
+    if not req.message:
+        raise HTTPException(status_code=400, detail="Missing message")
+    session = await asyncio.to_thread(get_or_create_session, req.session_id)
+    return session, list(session.turns) + [{"role": "user", "content": req.message}]
+
+
 @router.post("")
 async def chat(req: ChatRequest):
-    messages = [{"role": m.role, "content": m.content} for m in req.messages]
-    base = chat_completion(messages)
-    translated = await mt_translate(base) if req.target_lang else base
-    tts_url = await tts_synthesize(translated) if req.speak else None
-    return {"reply": base, "translated": translated if req.target_lang else None, "tts_url": tts_url}
+    session = None
+    native_lang = native_target_lang(req.target_lang)
+    if _uses_session(req):
+        session, history = await _start_session_turn(req)
+        base = await asyncio.to_thread(chat_completion, history, summary=session.summary, target_lang=native_lang)
+        await asyncio.to_thread(append_exchange, session, req.message, base)
+        schedule_compaction(session)
+    else:
+        messages = [{"role": m.role, "content": m.content} for m in req.messages]
+        base = await asyncio.to_thread(chat_completion, messages, target_lang=native_lang)
+    translated = await localize_output(base, req.target_lang, native_lang)
+    tts_url = await tts_synthesize(translated, language=req.target_lang or "en") if req.speak else None
+    response = {"reply": base, "translated": translated if req.target_lang else None, "tts_url": tts_url}
+    if session is not None:
+        response["session_id"] = session.session_id
+    return response
+
+
+async def _record_reply(
+    events: AsyncIterator[StreamEvent], session: ChatSession, message: str
+) -> AsyncIterator[StreamEvent]:
+    yield ("session", {"session_id": session.session_id})
+    async for event, data in events:
+        if event == "done":
+            await asyncio.to_thread(append_exchange, session, message, data["text"])
+            schedule_compaction(session)
+        yield event, data
+
+
+@router.post("/stream")
+async def chat_stream(req: ChatRequest):
+    """
+    Server-Sent Events variant of /chat.
+
+    Streams the reply sentence by sentence (event: original), followed by
+    per-sentence translations (event: translated) and TTS URLs (event: audio)
+    as they become ready, then a final event: done. In session mode the first
+    event is event: session carrying the session id.
+    """
+    try:
+        target_lang = validate_language(req.target_lang) if req.target_lang else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if _uses_session(req):
+        session, history = await _start_session_turn(req)
+        tokens = stream_chat(history, summary=session.summary)
+        events = _record_reply(stream_with_translation(tokens, target_lang, speak=req.speak), session, req.message)
+    else:
+        messages = [{"role": m.role, "content": m.content} for m in req.messages]
+        events = stream_with_translation(stream_chat(messages), target_lang, speak=req.speak)
+    return sse_response(events)
+
+
+@router.get("/sessions/{session_id}")
+async def get_chat_session(session_id: str):
+    session = await asyncio.to_thread(get_session, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return session.to_dict()
+
+
+@router.delete("/sessions/{session_id}")
+async def delete_chat_session(session_id: str):
+    if not await asyncio.to_thread(delete_session, session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return {"deleted": session_id}
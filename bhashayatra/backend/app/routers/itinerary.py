@@ -1,18 +1,137 @@
-from fastapi import APIRouter
-from ..models.schemas import ItineraryRequest
-from ..services.gemini import generate_itinerary
-from ..services.bhashini import mt_translate, tts_synthesize
+import asyncio
+from fastapi import APIRouter, HTTPException
+from ..models.schemas import ItineraryRequest, StructuredItinerary
+from ..services.gemini import generate_itinerary, generate_structured_itinerary, stream_itinerary
+from ..services.bhashini import tts_synthesize
+from ..services.localize import native_target_lang, is_native_output, localize_output
+from ..services import itinerary_cache
+from ..services.itinerary_cache import itinerary_key
+from ..services.phrase_translation import translate_phrases
+from ..services.streaming import stream_with_translation, sse_response
+from ..utils.languages import validate_language
 
 router = APIRouter(prefix="/itinerary", tags=["itinerary"])
 
+_TRANSLATABLE_SLOT_FIELDS = ("time_of_day", "place", "activity", "travel_time", "entry_fee", "food")
+
 
 @router.post("/generate")
 async def generate(req: ItineraryRequest):
-    base = generate_itinerary(req.destination, req.days, req.interests)
-    translated = await mt_translate(base) if req.target_lang else base
-    tts_url = await tts_synthesize(translated) if req.speak else None
+    key = itinerary_key(req.destination, req.days, req.interests)
+    native_lang = native_target_lang(req.target_lang)
+    base = await itinerary_cache.get_itinerary(key) if req.use_cache else None
+    translated = (
+        await itinerary_cache.get_translation(key, req.target_lang) if req.use_cache and req.target_lang else None
+    )
+    generated = False
+    translated_now = False
+
+    # Generate natively even when an English base is cached: it saves the MT hop
+    # (one call per sentence) for the whole itinerary
+    if native_lang and translated is None:
+        text = await asyncio.to_thread(
+            generate_itinerary, req.destination, req.days, req.interests, target_lang=native_lang
+        )
+        generated = True
+        if is_native_output(text, native_lang):
+            translated = text
+        elif base is None:
+            # Model ignored the language instruction; use its answer as the base for MT
+            base = text
+
+    if (req.target_lang and translated is None) or (not req.target_lang and base is None):
+        if base is None:
+            base = await asyncio.to_thread(generate_itinerary, req.destination, req.days, req.interests)
+            generated = True
+        translated = await localize_output(base, req.target_lang, native_lang)
+        translated_now = True
+    if generated or translated_now:
+        # Full cache hits are not written back, so entries still expire after ITINERARY_CACHE_TTL
+        await itinerary_cache.store_itinerary(key, base, req.target_lang, translated if req.target_lang else None)
+
+    tts_url = await tts_synthesize(translated, language=req.target_lang or "en") if req.speak else None
     return {
-        "itinerary": base,
+        "itinerary": base if base is not None else translated,
         "translated": translated if req.target_lang else None,
         "tts_url": tts_url,
+        "cached": not generated,
     }
+
+
+@router.post("/generate/stream")
+async def generate_stream(req: ItineraryRequest):
+    """
+    Server-Sent Events variant of /itinerary/generate.
+
+    Emits each itinerary sentence as soon as Gemini finishes it, then its
+    translation and audio URL (if speak=true) as they become ready.
+    """
+    try:
+        target_lang = validate_language(req.target_lang) if req.target_lang else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    events = stream_with_translation(
+        stream_itinerary(req.destination, req.days, req.interests),
+        target_lang,
+        speak=req.speak,
+    )
+    return sse_response(events)
+
+
+def _translatable_strings(itinerary: StructuredItinerary) -> list[str]:
+    strings = []
+    for day in itinerary.days:
+        if day.title:
+            strings.append(day.title)
+        for slot in day.slots:
+            strings.extend(getattr(slot, f) for f in _TRANSLATABLE_SLOT_FIELDS if getattr(slot, f))
+    return strings
+
+
+def _apply_translations(itinerary: StructuredItinerary, mapping: dict[str, str]) -> StructuredItinerary:
+    translated = itinerary.model_copy(deep=True)
+    for day in translated.days:
+        if day.title:
+            day.title = mapping.get(day.title.strip(), day.title)
+        for slot in day.slots:
+            for field in _TRANSLATABLE_SLOT_FIELDS:
+                value = getattr(slot, field)
+                if value:
+                    setattr(slot, field, mapping.get(value.strip(), value))
+    return translated
+
+
+@router.post("/generate/structured")
+async def generate_structured(req: ItineraryRequest):
+    """
+    Generate the itinerary as structured JSON (days -> slots -> place, activity,
+    travel time, entry fee, food) and translate it field by field.
+
+    Each distinct string is translated once per response (place names and
+    dishes repeat a lot), concurrently, and cached across responses.
+    The speak flag is ignored here.
+    """
+    try:
+        target_lang = validate_language(req.target_lang) if req.target_lang else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    key = itinerary_key(req.destination, req.days, req.interests) + ("structured",)
+    stored = await itinerary_cache.get_itinerary(key) if req.use_cache else None
+    cached = stored is not None
+    if cached:
+        itinerary = StructuredItinerary.model_validate(stored)
+    else:
+        try:
+            itinerary = await asyncio.to_thread(generate_structured_itinerary, req.destination, req.days, req.interests)
+        except ValueError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        # Stored as plain data: the shared backends hold msgpack, not Python objects
+        await itinerary_cache.store_itinerary(key, itinerary.model_dump())
+
+    translated = None
+    if target_lang and target_lang != "en":
+        mapping = await translate_phrases(_translatable_strings(itinerary), "en", target_lang)
+        translated = _apply_translations(itinerary, mapping)
+
+    return {"itinerary": itinerary, "translated": translated, "cached": cached}
@@ -0,0 +1,139 @@
+"""
+Asynchronous Job Endpoints
+
+POST /jobs accepts a long operation (text, one or more audio files, or one
+or more images) and returns a job id at once; GET /jobs/{id} reports
+progress and, once finished, the results. See services/jobs.py.
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.types import Message
+
+from ..config import settings
+from ..services.jobs import get_job, submit_job, validate_webhook_url
+from ..services.pipeline import InputType, OutputType
+from ..utils.languages import validate_language
+
+
+class _UploadLimitRoute(APIRoute):
+    """Reject request bodies over JOB_MAX_UPLOAD_MB before the multipart parser spools them."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request):
+            limit = int(settings.JOB_MAX_UPLOAD_MB * 1024 * 1024)
+            too_large = HTTPException(status_code=413, detail=f"Upload too large: limit is {settings.JOB_MAX_UPLOAD_MB:g} MB")
+            length = request.headers.get("content-length")
+            if length and length.isdigit() and int(length) > limit:
+                raise too_large
+            received = 0
+
+            async def receive() -> Message:
+                # Chunked bodies carry no Content-Length: count as they arrive
+                nonlocal received
+                message = await request.receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > limit:
+                        raise too_large
+                return message
+
+            return await handler(Request(request.scope, receive))
+
+        return limited_handler
+
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=_UploadLimitRoute)
+
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    progress_done: int
+    progress_total: int
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    finished_at: Optional[float] = None
+
+
+def _input_type(text: Optional[str], files: List[UploadFile]) -> InputType:
+    if text and files:
+        raise ValueError("Send either text or files, not both")
+    if text:
+        return InputType.TEXT
+    if not files:
+        raise ValueError("Send text or at least one audio/image file")
+    kinds = {(f.content_type or "").split("/")[0] for f in files}
+    if kinds == {"audio"}:
+        return InputType.AUDIO
+    if kinds == {"image"}:
+        return InputType.IMAGE
+    raise ValueError("Files must be all audio (WAV) or all images (JPG/PNG)")
+
+
+@router.post("", response_model=JobSubmitted, status_code=202)
+async def create_job(
+    source_language: str = Form(...),
+    target_language: str = Form(...),
+    output_type: str = Form("text"),
+    gender: Optional[str] = Form("female"),
+    text: Optional[str] = Form(None),
+    files: List[UploadFile] = File(default=[]),
+    webhook_url: Optional[str] = Form(None)
+):
+    """
+    Queue a long operation and return its job id.
+    
+    Long text is processed in sentence groups, long WAV audio in utterances
+    and each image separately; poll GET /jobs/{job_id} for progress, or pass
+    webhook_url (http/https, public host) to receive the finished job as a POST.
+    """
+    try:
+        input_type = _input_type(text, files)
+        params = {
+            "input_type": input_type.value,
+            "output_type": OutputType(output_type.lower()).value,
+            "source_language": validate_language(source_language),
+            "target_language": validate_language(target_language),
+            "gender": gender or "female",
+        }
+        if webhook_url:
+            await asyncio.to_thread(validate_webhook_url, webhook_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if input_type == InputType.TEXT:
+        params["text"] = text
+    stored_files = [(f.filename, f.content_type, await f.read()) for f in files]
+    job_id = await submit_job(params, stored_files, webhook_url or None)
+    return JobSubmitted(job_id=job_id, status="queued")
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str):
+    """Progress (segments done/total) and, once finished, the results of a job."""
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return JobStatus(
+        job_id=job["id"],
+        status=job["status"],
+        progress_done=job["progress_done"],
+        progress_total=job["progress_total"],
+        result=job["result"],
+        error=job["error"],
+        created_at=job["created_at"],
+        finished_at=job["finished_at"],
+    )
@@ -1,23 +1,28 @@
+import asyncio
 from fastapi import APIRouter, File, UploadFile
 from ..models.schemas import SummarizeRequest
 from ..services.gemini import summarize_text
-from ..services.bhashini import mt_translate, tts_synthesize, ocr_extract
+from ..services.bhashini import tts_synthesize, ocr_extract
+from ..services.localize import native_target_lang, localize_output
 
 router = APIRouter(prefix="/summarize", tags=["summarize"])
 
 
 @router.post("/text")
 async def summarize_from_text(req: SummarizeRequest):
-    base = summarize_text(req.text or "")
-    translated = await mt_translate(base) if req.target_lang else base
-    tts_url = await tts_synthesize(translated) if req.speak else None
+    native_lang = native_target_lang(req.target_lang)
+    # Long inputs take several Gemini calls (map-reduce); keep them off the event loop
+    base = await asyncio.to_thread(summarize_text, req.text or "", target_lang=native_lang)
+    translated = await localize_output(base, req.target_lang, native_lang)
+    tts_url = await tts_synthesize(translated, language=req.target_lang or "en") if req.speak else None
     return {"summary": base, "translated": translated if req.target_lang else None, "tts_url": tts_url}
 
 
 @router.post("/ocr")
 async def summarize_from_image(file: UploadFile = File(...), target_lang: str = "en", speak: bool = False):
     decoded = await ocr_extract(file)
-    base = summarize_text(decoded)
-    translated = await mt_translate(base) if target_lang else base
-    tts_url = await tts_synthesize(translated) if speak else None
+    native_lang = native_target_lang(target_lang)
+    base = await asyncio.to_thread(summarize_text, decoded, target_lang=native_lang)
+    translated = await localize_output(base, target_lang, native_lang)
+    tts_url = await tts_synthesize(translated, language=target_lang or "en") if speak else None
     return {"decoded_text": decoded, "summary": base, "translated": translated if target_lang else None, "tts_url": tts_url}
@@ -1,8 +1,21 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
+import asyncio
+import io
+import json
+from typing import Optional
+from fastapi import APIRouter, File, UploadFile, HTTPException, WebSocket, WebSocketDisconnect
+from starlette.datastructures import Headers
+from ..config import settings
 from ..services.bhashini import asr_transcribe, mt_translate, tts_synthesize
+from ..services.pipeline import execute_pipeline, InputType, OutputType
+from ..services.vad import UtteranceSegmenter, pcm_to_wav
+from ..utils.languages import validate_language
 
 router = APIRouter(prefix="/speech", tags=["speech"])
 
+# PCM sample rates accepted on /speech/stream
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 48000
+
 
 @router.post("/asr")
 async def asr(audio_file: UploadFile = File(...)):
@@ -33,3 +46,135 @@ async def translate_speech(audio_file: UploadFile = File(...), tts_gender: str =
         "translated_text": translated,
         "tts_url": tts_url,
     }
+
+
+def _is_end_message(text: Optional[str]) -> bool:
+    """Client signals end of audio with "end" or {"type": "end"}."""
+    text = (text or "").strip()
+    if text.lower() == "end":
+        return True
+    try:
+        return json.loads(text).get("type") == "end"
+    except (ValueError, AttributeError):
+        return False
+
+
+@router.websocket("/stream")
+async def translate_speech_stream(
+    websocket: WebSocket,
+    source_language: str = "en",
+    target_language: str = "en",
+    output_type: str = "text",
+    gender: str = "female",
+    sample_rate: int = 16000,
+):
+    """
+    Live speech translation over a WebSocket.
+
+    The client sends binary frames of raw 16-bit mono PCM at sample_rate
+    (8000-48000 Hz) and finally a text frame "end" (or just disconnects). Utterances are cut with
+    an incremental VAD and each one runs ASR -> MT -> (TTS) as soon as it
+    closes, while the next one is still being captured. Results are sent back
+    in utterance order:
+
+    - {"type": "utterance", "index": 0, "duration": 2.4}  utterance closed, processing
+    - {"type": "result", "index": 0, "recognized_text", "translated_text", "tts_url"}
+    - {"type": "error", "index": 0, "detail": "..."}
+
+    At most SPEECH_STREAM_MAX_INFLIGHT utterances are processed at once; when
+    the limit is reached the server stops reading until one finishes.
+    """
+    await websocket.accept()
+    try:
+        source_lang = validate_language(source_language)
+        target_lang = validate_language(target_language)
+        if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+            raise ValueError(f"sample_rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE} Hz")
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "index": None, "detail": str(e)})
+        await websocket.close(code=1008)
+        return
+
+    segmenter = UtteranceSegmenter(
+        sample_rate=sample_rate,
+        energy_threshold=settings.VAD_ENERGY_THRESHOLD,
+        silence_ms=settings.VAD_SILENCE_MS,
+    )
+    slots = asyncio.Semaphore(max(1, settings.SPEECH_STREAM_MAX_INFLIGHT))
+    ordered: asyncio.Queue = asyncio.Queue()
+    tasks: list[asyncio.Task] = []
+    send_lock = asyncio.Lock()
+    index = 0
+
+    async def send(payload: dict) -> None:
+        # Notices and results are sent from different coroutines
+        async with send_lock:
+            await websocket.send_json(payload)
+
+    async def process(i: int, pcm: bytes) -> dict:
+        try:
+            upload = UploadFile(
+                file=io.BytesIO(pcm_to_wav(pcm, sample_rate)),
+                filename=f"utterance-{i}.wav",
+                headers=Headers({"content-type": "audio/wav"}),
+            )
+            result = await execute_pipeline(
+                input_data=upload,
+                input_type=InputType.AUDIO,
+                output_type=OutputType.AUDIO if output_type.lower() == "audio" else OutputType.TEXT,
+                source_language=source_lang,
+                target_language=target_lang,
+                gender=gender,
+            )
+            return {
+                "type": "result",
+                "index": i,
+                "recognized_text": result.intermediate_results.get("asr_text", ""),
+                "translated_text": result.intermediate_results.get("translated_text"),
+                "tts_url": result.intermediate_results.get("tts_audio_url"),
+            }
+        except HTTPException as e:
+            return {"type": "error", "index": i, "detail": str(e.detail)}
+        except Exception as e:
+            return {"type": "error", "index": i, "detail": str(e) or e.__class__.__name__}
+        finally:
+            slots.release()
+
+    async def submit(pcm: bytes) -> None:
+        nonlocal index
+        await slots.acquire()
+        duration = len(pcm) / (2 * sample_rate)
+        await send({"type": "utterance", "index": index, "duration": round(duration, 2)})
+        task = asyncio.create_task(process(index, pcm))
+        tasks.append(task)
+        await ordered.put(task)
+        index += 1
+
+    async def send_in_order() -> None:
+        while (task := await ordered.get()) is not None:
+            await send(await task)
+
+    sender = asyncio.create_task(send_in_order())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                for pcm in segmenter.feed(message["bytes"]):
+                    await submit(pcm)
+            elif _is_end_message(message.get("text")):
+                break
+
+        tail = segmenter.flush()
+        if tail:
+            await submit(tail)
+        await ordered.put(None)
+        await sender
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        for task in tasks:
+            task.cancel()
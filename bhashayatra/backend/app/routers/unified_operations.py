@@ -17,9 +17,11 @@ Examples:
 - Image (Hindi) → Audio (English): Uses OCR + MT + TTS
 """
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Form
+import asyncio
+import io
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Form, Request, Response
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List, Dict, Union, AsyncIterator
 
 from ..services.pipeline import (
     text_to_text_pipeline,
@@ -28,22 +30,45 @@ from ..services.pipeline import (
     audio_to_audio_pipeline,
     image_to_text_pipeline,
     image_to_audio_pipeline,
-    PipelineResult
+    execute_multi_target_pipeline,
+    execute_pipeline,
+    Stage,
+    StageResult,
+    InputType,
+    OutputType,
+    PipelineResult,
+    MultiTargetResult,
+    track_results
 )
+from ..services.streaming import sse_response, StreamEvent
 from ..utils.languages import validate_language, LANGUAGE_NAMES, SUPPORTED_LANGUAGES
 
-router = APIRouter(prefix="/unified", tags=["unified-operations"])
+async def _track_pipelines(request: Request) -> None:
+    # Keeps the pipeline runs reachable from exception handlers (timing_headers)
+    request.state.pipeline_results = track_results()
+
+router = APIRouter(prefix="/unified", tags=["unified-operations"], dependencies=[Depends(_track_pipelines)])
 
 class TextOperationRequest(BaseModel):
     text: str
     source_language: str
-    target_language: str
+    target_language: Optional[str] = None
+    target_languages: Optional[List[str]] = None  # fan out to several targets in one request
     output_type: str = "text"  # "text" or "audio"
     gender: Optional[str] = "female"
 
+class StageTiming(BaseModel):
+    stage: str
+    start_ms: Optional[float] = None  # offset from the pipeline start
+    end_ms: Optional[float] = None
+    duration_ms: Optional[float] = None
+    input_bytes: Optional[int] = None
+    output_bytes: Optional[int] = None
+    ok: bool = True
+
 class OperationResponse(BaseModel):
     success: bool
-    final_output: str
+    final_output: Optional[str]
     source_language: str
     target_language: str
     input_type: str
@@ -51,23 +76,131 @@ class OperationResponse(BaseModel):
     operations_performed: list[str]
     intermediate_results: dict
     message: str
+    deadline_exceeded: bool = False
+    skipped_operations: list[str] = []
+    timings: list[StageTiming] = []
+
+class TargetOperationResult(BaseModel):
+    success: bool
+    final_output: Optional[str] = None
+    operations_performed: list[str]
+    intermediate_results: dict
+    error: Optional[str] = None
+    skipped_operations: list[str] = []
+    timings: list[StageTiming] = []
+
+class MultiTargetOperationResponse(BaseModel):
+    success: bool
+    source_language: str
+    target_languages: list[str]
+    input_type: str
+    output_type: str
+    source_text: str
+    results: Dict[str, TargetOperationResult]
+    message: str
 
 def create_response(result: PipelineResult, message: str = "Operation completed successfully") -> OperationResponse:
     """Helper to create standardized response from pipeline result"""
+    if result.deadline_exceeded:
+        # Partial result: whatever finished before the request deadline
+        message = f"Deadline exceeded; skipped {', '.join(result.skipped_operations)}"
     return OperationResponse(
-        success=True,
-        final_output=str(result.final_output),
+        success=not result.deadline_exceeded,
+        final_output=None if result.final_output is None else str(result.final_output),
         source_language=result.source_language,
         target_language=result.target_language, 
         input_type=result.input_type,
         output_type=result.output_type,
         operations_performed=result.operations_performed,
         intermediate_results=result.intermediate_results,
+        message=message,
+        deadline_exceeded=result.deadline_exceeded,
+        skipped_operations=result.skipped_operations,
+        timings=result.stage_timings()
+    )
+
+def create_multi_response(multi: MultiTargetResult, message: str) -> MultiTargetOperationResponse:
+    """Helper to create a per-language response from a multi-target pipeline result"""
+    return MultiTargetOperationResponse(
+        success=len(multi.errors) < len(multi.target_languages),
+        source_language=multi.source_language,
+        target_languages=multi.target_languages,
+        input_type=multi.input_type,
+        output_type=multi.output_type,
+        source_text=str(multi.source_text),
+        results={
+            lang: TargetOperationResult(
+                success=lang not in multi.errors,
+                final_output=None if result.final_output is None else str(result.final_output),
+                operations_performed=result.operations_performed,
+                intermediate_results=result.intermediate_results,
+                error=multi.errors.get(lang),
+                skipped_operations=result.skipped_operations,
+                timings=result.stage_timings(),
+            )
+            for lang, result in multi.results.items()
+        },
         message=message
     )
 
-@router.post("/text", response_model=OperationResponse)
-async def process_text(request: TextOperationRequest):
+def server_timing(*results: PipelineResult) -> str:
+    """
+    Server-Timing header value: one metric per stage that ran, plus the
+    whole pipeline as 'total' (e.g. 'asr;dur=812.4, mt;dur=95.1, total;dur=910.2').
+    """
+    metrics: Dict[str, float] = {}
+    total = 0.0
+    for result in results:
+        for stage_result in result.stage_results.values():
+            if stage_result.duration_ms is not None:
+                # ':' is not allowed in metric names (per-target stages are 'mt:hi')
+                metrics[stage_result.name.replace(":", "-")] = stage_result.duration_ms
+        if result.started_at is not None and result.finished_at is not None:
+            total = max(total, (result.finished_at - result.started_at) * 1000)
+    parts = [f"{name};dur={duration:.1f}" for name, duration in metrics.items()]
+    parts.append(f"total;dur={total:.1f}")
+    return ", ".join(parts)
+
+def timing_headers(request: Request) -> Dict[str, str]:
+    """Server-Timing for an error response: the stages the request's pipelines got through (if any)."""
+    results = getattr(request.state, "pipeline_results", None)
+    return {"Server-Timing": server_timing(*results)} if results else {}
+
+def _parse_target_languages(target_languages: Optional[List[str]]) -> list[str]:
+    """Accept repeated fields and/or comma-separated values"""
+    return [lang.strip() for value in target_languages or [] for lang in value.split(",") if lang.strip()]
+
+def _single_target(target_language: Optional[str]) -> str:
+    if not target_language:
+        raise ValueError("target_language or target_languages is required")
+    return validate_language(target_language)
+
+async def _process_multi_target(
+    input_data: Union[str, UploadFile],
+    input_type: InputType,
+    output_type: str,
+    source_language: str,
+    target_languages: list[str],
+    gender: Optional[str],
+    response: Response
+) -> MultiTargetOperationResponse:
+    multi = await execute_multi_target_pipeline(
+        input_data=input_data,
+        input_type=input_type,
+        output_type=OutputType.AUDIO if output_type.lower() == "audio" else OutputType.TEXT,
+        source_language=source_language,
+        target_languages=target_languages,
+        gender=gender or "female"
+    )
+    names = ", ".join(LANGUAGE_NAMES[lang] for lang in multi.target_languages)
+    message = f"Processed {LANGUAGE_NAMES[multi.source_language]} {input_type.value} into {names}"
+    if multi.errors:
+        message += f" ({len(multi.errors)} target(s) failed)"
+    response.headers["Server-Timing"] = server_timing(*multi.results.values())
+    return create_multi_response(multi, message)
+
+@router.post("/text", response_model=Union[OperationResponse, MultiTargetOperationResponse])
+async def process_text(request: TextOperationRequest, response: Response):
     """
     Process text input with language selection.
     
@@ -79,11 +212,21 @@ async def process_text(request: TextOperationRequest):
     - Hindi text → Hindi audio (uses TTS) 
     - Hindi text → English audio (uses MT + TTS)
     - English text → English text (no operation needed, returns as-is)
+    
+    Pass target_languages (e.g. ["hi", "te", "kn"]) instead of target_language
+    to get every language in one response, keyed per language.
     """
     try:
+        targets = _parse_target_languages(request.target_languages)
+        if targets:
+            return await _process_multi_target(
+                request.text, InputType.TEXT, request.output_type,
+                request.source_language, targets, request.gender, response
+            )
+
         # Validate languages
         source_lang = validate_language(request.source_language)
-        target_lang = validate_language(request.target_language)
+        target_lang = _single_target(request.target_language)
         
         if request.output_type.lower() == "audio":
             # Text → Audio
@@ -106,6 +249,7 @@ async def process_text(request: TextOperationRequest):
             else:
                 message = f"Translated from {LANGUAGE_NAMES[source_lang]} to {LANGUAGE_NAMES[target_lang]}"
         
+        response.headers["Server-Timing"] = server_timing(result)
         return create_response(result, message)
         
     except ValueError as e:
@@ -117,13 +261,15 @@ async def process_text(request: TextOperationRequest):
         else:
             raise HTTPException(status_code=500, detail="Operation failed")
 
-@router.post("/audio", response_model=OperationResponse)
+@router.post("/audio", response_model=Union[OperationResponse, MultiTargetOperationResponse])
 async def process_audio(
+    response: Response,
     audio_file: UploadFile = File(...),
     source_language: str = Form(...),
-    target_language: str = Form(...),
+    target_language: Optional[str] = Form(None),
     output_type: str = Form("text"),
-    gender: Optional[str] = Form("female")
+    gender: Optional[str] = Form("female"),
+    target_languages: Optional[List[str]] = Form(None)
 ):
     """
     Process audio input with language selection.
@@ -136,11 +282,20 @@ async def process_audio(
     - Hindi audio → Hindi text (uses ASR)
     - Hindi audio → English audio (uses ASR + MT + TTS)
     - Hindi audio → Hindi audio (uses ASR + TTS)
+    
+    With target_languages (repeated or comma-separated), ASR runs once and
+    MT/TTS fan out concurrently per language.
     """
     try:
+        targets = _parse_target_languages(target_languages)
+        if targets:
+            return await _process_multi_target(
+                audio_file, InputType.AUDIO, output_type, source_language, targets, gender, response
+            )
+
         # Validate languages
         source_lang = validate_language(source_language)
-        target_lang = validate_language(target_language)
+        target_lang = _single_target(target_language)
         
         if output_type.lower() == "audio":
             # Audio → Audio
@@ -163,6 +318,7 @@ async def process_audio(
             else:
                 message = f"Transcribed and translated {LANGUAGE_NAMES[source_lang]} audio to {LANGUAGE_NAMES[target_lang]} text"
         
+        response.headers["Server-Timing"] = server_timing(result)
         return create_response(result, message)
         
     except ValueError as e:
@@ -174,13 +330,15 @@ async def process_audio(
         else:
             raise HTTPException(status_code=500, detail="Operation failed")
 
-@router.post("/image", response_model=OperationResponse)
+@router.post("/image", response_model=Union[OperationResponse, MultiTargetOperationResponse])
 async def process_image(
+    response: Response,
     image_file: UploadFile = File(...),
     source_language: str = Form(...),
-    target_language: str = Form(...), 
+    target_language: Optional[str] = Form(None), 
     output_type: str = Form("text"),
-    gender: Optional[str] = Form("female")
+    gender: Optional[str] = Form("female"),
+    target_languages: Optional[List[str]] = Form(None)
 ):
     """
     Process image input with language selection.
@@ -193,11 +351,20 @@ async def process_image(
     - Hindi image → Hindi text (uses OCR)
     - Hindi image → English audio (uses OCR + MT + TTS) 
     - Hindi image → Hindi audio (uses OCR + TTS)
+    
+    With target_languages (repeated or comma-separated), OCR runs once and
+    MT/TTS fan out concurrently per language.
     """
     try:
+        targets = _parse_target_languages(target_languages)
+        if targets:
+            return await _process_multi_target(
+                image_file, InputType.IMAGE, output_type, source_language, targets, gender, response
+            )
+
         # Validate languages
         source_lang = validate_language(source_language)
-        target_lang = validate_language(target_language)
+        target_lang = _single_target(target_language)
         
         if output_type.lower() == "audio":
             # Image → Audio
@@ -220,6 +387,7 @@ async def process_image(
             else:
                 message = f"Extracted {LANGUAGE_NAMES[source_lang]} text from image and translated to {LANGUAGE_NAMES[target_lang]}"
         
+        response.headers["Server-Timing"] = server_timing(result)
         return create_response(result, message)
         
     except ValueError as e:
@@ -231,6 +399,134 @@ async def process_image(
         else:
             raise HTTPException(status_code=500, detail="Operation failed")
 
+# ==================== STREAMING VARIANTS ====================
+
+def _failure_detail(e: Exception) -> str:
+    if isinstance(e, HTTPException):
+        return str(e.detail)
+    if isinstance(e, ValueError):
+        return str(e)
+    if "timeout" in str(e).lower() or "readtimeout" in str(e).lower():
+        return "Timeout error"
+    return "Operation failed"
+
+async def _detach_upload(upload: UploadFile) -> UploadFile:
+    """Copy an upload into memory so it outlives the request handler (streamed responses)."""
+    data = await upload.read()
+    return UploadFile(file=io.BytesIO(data), filename=upload.filename, headers=upload.headers)
+
+async def _pipeline_events(
+    input_data: Union[str, UploadFile],
+    input_type: InputType,
+    output_type: str,
+    source_language: str,
+    target_language: str,
+    gender: Optional[str]
+) -> AsyncIterator[StreamEvent]:
+    """
+    Run a pipeline and yield each intermediate result as it is produced.
+
+    Events are named after the intermediate_results key (asr_text, ocr_text,
+    translated_text, tts_audio_url); a failed stage yields an error event,
+    otherwise done carries the full OperationResponse. The last event is
+    timing: the Server-Timing value and per-stage timings, sent whether or
+    not the pipeline failed (headers are gone once the stream has started).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_stage(stage: Stage, stage_result: StageResult) -> None:
+        if stage_result.ok and stage.result_key:
+            await queue.put((stage.result_key, {"stage": stage.name, "value": stage_result.value}))
+
+    async def run() -> None:
+        tracked = track_results()
+        try:
+            result = await execute_pipeline(
+                input_data=input_data,
+                input_type=input_type,
+                output_type=OutputType.AUDIO if output_type.lower() == "audio" else OutputType.TEXT,
+                source_language=source_language,
+                target_language=target_language,
+                gender=gender or "female",
+                on_stage=on_stage
+            )
+            await queue.put(("done", create_response(result).model_dump()))
+        except Exception as e:
+            await queue.put(("error", {"detail": _failure_detail(e)}))
+        finally:
+            await queue.put(("timing", {
+                "server_timing": server_timing(*tracked),
+                "timings": [timing for result in tracked for timing in result.stage_timings()],
+            }))
+            await queue.put(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while (event := await queue.get()) is not None:
+            yield event
+    finally:
+        task.cancel()
+
+def _validate_stream_languages(source_language: str, target_language: Optional[str]) -> tuple[str, str]:
+    try:
+        return validate_language(source_language), _single_target(target_language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/text/stream")
+async def process_text_stream(request: TextOperationRequest):
+    """
+    Streaming (Server-Sent Events) variant of /unified/text.
+    
+    Emits translated_text as soon as MT finishes, then tts_audio_url if
+    audio output was requested, done with the full response and finally
+    timing (the Server-Timing value).
+    """
+    source_lang, target_lang = _validate_stream_languages(request.source_language, request.target_language)
+    return sse_response(_pipeline_events(
+        request.text, InputType.TEXT, request.output_type, source_lang, target_lang, request.gender
+    ))
+
+@router.post("/audio/stream")
+async def process_audio_stream(
+    audio_file: UploadFile = File(...),
+    source_language: str = Form(...),
+    target_language: str = Form(...),
+    output_type: str = Form("text"),
+    gender: Optional[str] = Form("female")
+):
+    """
+    Streaming (Server-Sent Events) variant of /unified/audio.
+    
+    The recognised text (asr_text) is pushed as soon as ASR finishes, so the
+    UI can show it while MT and TTS are still running.
+    """
+    source_lang, target_lang = _validate_stream_languages(source_language, target_language)
+    upload = await _detach_upload(audio_file)
+    return sse_response(_pipeline_events(
+        upload, InputType.AUDIO, output_type, source_lang, target_lang, gender
+    ))
+
+@router.post("/image/stream")
+async def process_image_stream(
+    image_file: UploadFile = File(...),
+    source_language: str = Form(...),
+    target_language: str = Form(...),
+    output_type: str = Form("text"),
+    gender: Optional[str] = Form("female")
+):
+    """
+    Streaming (Server-Sent Events) variant of /unified/image.
+    
+    The extracted text (ocr_text) is pushed as soon as OCR finishes, so the
+    UI can show it while MT and TTS are still running.
+    """
+    source_lang, target_lang = _validate_stream_languages(source_language, target_language)
+    upload = await _detach_upload(image_file)
+    return sse_response(_pipeline_events(
+        upload, InputType.IMAGE, output_type, source_lang, target_lang, gender
+    ))
+
 @router.get("/supported-languages")
 async def get_supported_languages():
     """
@@ -0,0 +1,94 @@
+"""
+Production launcher: several uvicorn worker processes on one port.
+
+A single process runs all JSON work, multipart parsing, WAV validation and
+image handling on one core. This launcher starts WEB_CONCURRENCY workers
+(default: one per usable CPU core) and prepares what they share:
+
+- PROMETHEUS_MULTIPROC_DIR (emptied at start) so /metrics covers all workers
+- SHARED_CACHE_DB so the phrase and itinerary caches are shared, not split N ways
+- CHAT_SESSION_DB so a chat session works whichever worker serves the next turn
+- JOBS_DB: jobs interrupted by a crash are re-queued once, here, before the
+  workers start
+
+Settings already present in the environment are left alone.
+
+Run (from the backend folder):
+    python -m app.serve --workers 4
+
+Graceful reload (Linux/macOS): `kill -HUP <launcher pid>` replaces the
+workers one at a time, starting each replacement before stopping the old
+worker, so deploys do not drop requests. SIGTTIN/SIGTTOU add/remove a worker.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+SHARED_STATE_DEFAULTS = {
+    "SHARED_CACHE_DB": "cache.db",
+    "CHAT_SESSION_DB": "chat_sessions.db",
+}
+
+
+def default_workers() -> int:
+    """Worker count: WEB_CONCURRENCY, else the number of CPU cores this process may use."""
+    if os.getenv("WEB_CONCURRENCY"):
+        return max(1, int(os.environ["WEB_CONCURRENCY"]))
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def _prepare_metrics_dir() -> None:
+    path = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "bhashayatra-metrics")
+    )
+    # Samples of workers from a previous run would otherwise be added to the new totals
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def _recover_jobs() -> None:
+    # Imported only now: the app modules read the environment prepared above
+    from .services import jobs
+
+    requeued = jobs._get_store().requeue_interrupted()
+    if requeued:
+        print(f"{len(requeued)} queued job(s) will be picked up by the workers")
+    os.environ["JOBS_RECOVER_ON_START"] = "false"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=None, help="default: WEB_CONCURRENCY or the CPU core count")
+    parser.add_argument("--graceful-timeout", type=float, default=30.0,
+                        help="seconds a stopping worker may spend finishing in-flight requests")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or default_workers()
+    if workers > 1:
+        for name, value in SHARED_STATE_DEFAULTS.items():
+            os.environ.setdefault(name, value)
+        _prepare_metrics_dir()
+        _recover_jobs()
+
+    print(f"Starting {workers} worker(s) on {args.host}:{args.port}")
+    import uvicorn
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
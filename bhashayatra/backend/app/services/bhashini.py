@@ -1,8 +1,17 @@
+import asyncio
+import json
+import time
 import httpx
 from typing import Optional
 from fastapi import UploadFile
 from ..config import settings
 from ..utils.validators import ensure_mt_constraints, ensure_tts_constraints, ensure_asr_constraints, ensure_ocr_constraints
+from ..utils.deadline import DeadlineExceeded, check_deadline, expired
+from ..utils import metrics
+from ..utils.tracing import outgoing_headers, span
+from ..utils.languages import SUPPORTED_LANGUAGES, get_translation_pairs
+from .upstream_scheduler import upstream_slot
+from .upstream_stats import endpoint_report, record_call
 
 # Inline API endpoints - you need to replace these URLs with actual working endpoints
 # Current endpoints are for demonstration - map each to your actual Bhashini API URLs
@@ -59,10 +68,118 @@ OCR_KANNADA_URL: str = "https://canvas.iiit.ac.in/sandboxbeprod/check_ocr_status
 
 TIMEOUT = httpx.Timeout(120.0, connect=30.0)  # Increased timeout for slow APIs
 
+CANVAS_ORIGIN = "https://canvas.iiit.ac.in"
+
+def _endpoint(url: str) -> str:
+    """Rewrite an endpoint URL onto BHASHINI_BASE_URL (same path), if one is configured."""
+    base = settings.BHASHINI_BASE_URL.rstrip("/")
+    if base and url.startswith(CANVAS_ORIGIN):
+        return base + url[len(CANVAS_ORIGIN):]
+    return url
+
 def _token() -> str:
     """Get the API token for Bhashini services"""
     return (INLINE_BHASHINI_API_KEY or settings.BHASHINI_API_KEY or "").strip()
 
+def _request_size(kwargs: dict) -> int:
+    if "files" in kwargs:
+        return sum(len(f[1]) for f in kwargs["files"].values())
+    if "json" in kwargs:
+        return len(json.dumps(kwargs["json"]).encode("utf-8"))
+    return 0
+
+def _error_kind(exc: Exception) -> str:
+    if isinstance(exc, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return "timeout"
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"http_{exc.response.status_code}"
+    if isinstance(exc, httpx.TransportError):
+        return "connection"
+    return "other"
+
+async def _post(url: str, operation: str, language: str, **kwargs) -> dict:
+    """
+    POST to a Bhashini endpoint and return the decoded JSON body.
+
+    The call waits for a slot on the endpoint in its priority class, gets
+    whatever is left of the request deadline (capped by the usual TIMEOUT)
+    and raises DeadlineExceeded when that budget runs out. Latency, errors
+    and payload sizes are recorded per operation and language (e.g. mt, en-hi),
+    and the call is traced as a client span carrying the trace context.
+    Latency and outcome also feed the endpoint's rolling statistics
+    (see upstream_stats).
+    """
+    url = _endpoint(url)
+    left = check_deadline(operation)
+    timeout = TIMEOUT if left is None else httpx.Timeout(min(120.0, left), connect=min(30.0, left))
+    request_bytes = _request_size(kwargs)
+    metrics.upstream_payload.labels(operation, "request").observe(request_bytes)
+
+    cancelled_after = None  # seconds the call ran before being cancelled
+
+    async def call() -> dict:
+        nonlocal cancelled_after
+        with span(f"bhashini {operation}", kind="client", operation=operation, language=language,
+                  **{"http.url": url, "request_bytes": request_bytes}) as trace_span:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **outgoing_headers()}
+            async with upstream_slot(url), httpx.AsyncClient(timeout=timeout) as client:
+                in_flight = metrics.upstream_in_flight.labels(operation)
+                in_flight.inc()
+                started = time.perf_counter()
+                outcome = "error"
+                error_kind = None
+                try:
+                    resp = await client.post(url, **kwargs)
+                    if trace_span:
+                        trace_span.set("http.status_code", resp.status_code)
+                        trace_span.set("response_bytes", len(resp.content))
+                    resp.raise_for_status()
+                    metrics.upstream_payload.labels(operation, "response").observe(len(resp.content))
+                    data = resp.json()
+                    outcome = "ok"
+                    return data
+                except Exception as exc:
+                    error_kind = _error_kind(exc)
+                    raise
+                except asyncio.CancelledError:
+                    # Recorded below if the budget ran out; not if a sibling stage failed
+                    cancelled_after = time.perf_counter() - started
+                    raise
+                finally:
+                    in_flight.dec()
+                    elapsed = time.perf_counter() - started
+                    metrics.upstream_duration.labels(operation, language, outcome).observe(elapsed)
+                    if outcome == "ok" or error_kind is not None:
+                        record_call(url, elapsed, error_kind)
+
+    try:
+        if left is None:
+            return await call()
+        # httpx timeouts are per phase; bound the whole call by the budget
+        return await asyncio.wait_for(call(), timeout=left)
+    except (httpx.TimeoutException, asyncio.TimeoutError) as exc:
+        if cancelled_after is not None:
+            # The endpoint did not answer within the budget: a timeout for its statistics
+            record_call(url, cancelled_after, "timeout")
+        metrics.upstream_errors.labels(operation, language, "deadline" if expired() else "timeout").inc()
+        if expired():
+            raise DeadlineExceeded(f"Request deadline exceeded during {operation}") from exc
+        raise
+    except Exception as exc:
+        metrics.upstream_errors.labels(operation, language, _error_kind(exc)).inc()
+        raise
+
+def upstream_endpoints() -> list[dict]:
+    """Every configured Bhashini endpoint (12 MT pairs, 4 ASR, 4 TTS, 4 OCR) with its rolling statistics."""
+    entries = [("mt", f"{src.value}-{tgt.value}", _get_mt_url(src, tgt)) for src, tgt in get_translation_pairs()]
+    for operation, get_url in (("asr", _get_asr_url), ("tts", _get_tts_url), ("ocr", _get_ocr_url)):
+        entries += [(operation, lang.value, get_url(lang.value)) for lang in SUPPORTED_LANGUAGES]
+    return [
+        {"operation": operation, "language": language, "url": _endpoint(url), **endpoint_report(_endpoint(url))}
+        for operation, language, url in entries
+        if url
+    ]
+
 def _get_mt_url(source_lang: str, target_lang: str) -> str:
     """Get translation URL based on source and target language pair"""
     # Map language pair to specific endpoint URL
@@ -147,20 +264,18 @@ async def mt_translate(input_text: str, source_lang: str = "en", target_lang: st
         raise RuntimeError("BHASHINI_API_KEY not configured")
     
     headers = {"access-token": token}
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        resp = await client.post(url, json={"input_text": input_text}, headers=headers)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("data", {}).get("output_text", "")
+    data = await _post(url, "mt", f"{source_lang}-{target_lang}", json={"input_text": input_text}, headers=headers)
+    return data.get("data", {}).get("output_text", "")
 
 
-async def asr_transcribe(audio_file: UploadFile, language: str = "en") -> str:
+async def asr_transcribe(audio_file: UploadFile, language: str = "en", validated: bool = False) -> str:
     """
     Convert audio to text in the specified language.
     
     Args:
         audio_file: WAV audio file to transcribe
         language: Language of the audio (en/hi/te/kn)
+        validated: The file already passed ensure_asr_constraints (the pipeline's validate stage)
     
     Returns:
         Recognized text in the same language as the audio
@@ -171,7 +286,14 @@ async def asr_transcribe(audio_file: UploadFile, language: str = "en") -> str:
     - te: Use ASR_TELUGU_URL (Telugu audio → Telugu text)
     - kn: Use ASR_KANNADA_URL (Kannada audio → Kannada text)
     """
-    data = ensure_asr_constraints(audio_file)
+    if validated:
+        data = audio_file.file.read()
+        audio_file.file.seek(0)
+    else:
+        with span("validate asr", language=language) as trace_span:
+            data = ensure_asr_constraints(audio_file)
+            if trace_span:
+                trace_span.set("payload_bytes", len(data))
     
     # Get the specific URL for this language
     url = _get_asr_url(language)
@@ -185,11 +307,8 @@ async def asr_transcribe(audio_file: UploadFile, language: str = "en") -> str:
     files = {"audio_file": (audio_file.filename, data, audio_file.content_type or "audio/wav")}
     headers = {"access-token": token}
     
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        resp = await client.post(url, headers=headers, files=files)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("data", {}).get("recognized_text", "")
+    data = await _post(url, "asr", language, headers=headers, files=files)
+    return data.get("data", {}).get("recognized_text", "")
 
 
 async def tts_synthesize(text: str, gender: Optional[str] = "female", language: str = "en") -> str:
@@ -226,20 +345,18 @@ async def tts_synthesize(text: str, gender: Optional[str] = "female", language:
         raise RuntimeError("BHASHINI_API_KEY not configured")
     
     headers = {"access-token": token}
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        resp = await client.post(url, json={"text": text, "gender": gender}, headers=headers)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("data", {}).get("s3_url", "")
+    data = await _post(url, "tts", language, json={"text": text, "gender": gender}, headers=headers)
+    return data.get("data", {}).get("s3_url", "")
 
 
-async def ocr_extract(image_file: UploadFile, language: str = "en") -> str:
+async def ocr_extract(image_file: UploadFile, language: str = "en", validated: bool = False) -> str:
     """
     Extract text from image in the specified language.
     
     Args:
         image_file: Image file (JPG/PNG) containing text
         language: Language of the text in the image (en/hi/te/kn)
+        validated: The file already passed ensure_ocr_constraints (the pipeline's validate stage)
     
     Returns:
         Extracted text in the same language as the image content
@@ -250,7 +367,14 @@ async def ocr_extract(image_file: UploadFile, language: str = "en") -> str:
     - te: Use OCR_TELUGU_URL (Image with Telugu text → Telugu text)
     - kn: Use OCR_KANNADA_URL (Image with Kannada text → Kannada text)
     """
-    data = ensure_ocr_constraints(image_file)
+    if validated:
+        data = image_file.file.read()
+        image_file.file.seek(0)
+    else:
+        with span("validate ocr", language=language) as trace_span:
+            data = ensure_ocr_constraints(image_file)
+            if trace_span:
+                trace_span.set("payload_bytes", len(data))
     
     # Get the specific URL for this language
     url = _get_ocr_url(language)
@@ -264,8 +388,5 @@ async def ocr_extract(image_file: UploadFile, language: str = "en") -> str:
     files = {"file": (image_file.filename, data, image_file.content_type or "image/png")}
     headers = {"access-token": token}
     
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        resp = await client.post(url, headers=headers, files=files)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("data", {}).get("decoded_text", "")
+    data = await _post(url, "ocr", language, headers=headers, files=files)
+    return data.get("data", {}).get("decoded_text", "")
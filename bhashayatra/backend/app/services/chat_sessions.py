@@ -0,0 +1,222 @@
+"""
+Server-Side Chat Sessions
+
+Clients used to re-upload the whole conversation on every /chat turn, so
+request size and prompt length grew with every message. Sessions keep the
+history on the server instead; the client only sends its new message and
+the session id.
+
+- Sessions live in an in-memory LRU store with a TTL (CHAT_SESSION_TTL).
+- If CHAT_SESSION_DB points to a SQLite file, sessions are also persisted
+  there and reloaded after a restart or LRU eviction. With several worker
+  processes (SHARED_CACHE_DB set) the database is the only copy, since
+  another worker may have added turns since the last read.
+- Once the history exceeds CHAT_HISTORY_TOKEN_BUDGET, the older turns are
+  folded into a rolling summary so the prompt (and latency) stays flat.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+from ..config import settings
+from ..utils.cache import TTLCache
+from .gemini import compact_history, estimate_tokens
+
+COMPACT_ATTEMPTS = 5  # conditional updates tried while other workers keep appending turns
+
+
+class ChatSession:
+    def __init__(self, session_id: str, summary: str = "", turns: Optional[list[dict[str, str]]] = None):
+        self.session_id = session_id
+        self.summary = summary
+        self.turns: list[dict[str, str]] = turns or []
+        self.updated_at = time.time()
+        self.lock = threading.Lock()
+        self.compacting = False
+
+    def to_dict(self) -> dict:
+        return {"session_id": self.session_id, "summary": self.summary, "turns": list(self.turns)}
+
+
+def history_tokens(session: ChatSession) -> int:
+    return estimate_tokens(session.summary) + sum(estimate_tokens(t["content"]) for t in session.turns)
+
+
+class _SQLiteSessionStore:
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_sessions ("
+                "id TEXT PRIMARY KEY, summary TEXT NOT NULL, turns TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def load(self, session_id: str) -> Optional[ChatSession]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, turns, updated_at FROM chat_sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        summary, turns, updated_at = row
+        if updated_at + settings.CHAT_SESSION_TTL < time.time():
+            self.delete(session_id)
+            return None
+        session = ChatSession(session_id, summary, json.loads(turns))
+        session.updated_at = updated_at
+        return session
+
+    def save(self, session: ChatSession) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chat_sessions (id, summary, turns, updated_at) VALUES (?, ?, ?, ?)",
+                (session.session_id, session.summary, json.dumps(session.turns, ensure_ascii=False), session.updated_at),
+            )
+            self._conn.commit()
+
+    def compact(self, session_id: str, previous_summary: str, old_turns: list[dict[str, str]], summary: str) -> bool:
+        """
+        Replace previous_summary by summary and drop old_turns from the front
+        of the stored history, keeping turns other workers appended since.
+
+        The row is rewritten only if it still holds exactly what was read
+        (compare-and-set), and re-read on a conflict. False if old_turns are
+        no longer there (another worker compacted first) or every attempt lost.
+        """
+        for _ in range(COMPACT_ATTEMPTS):
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT summary, turns FROM chat_sessions WHERE id = ?", (session_id,)
+                ).fetchone()
+            if row is None:
+                return False
+            stored_summary, stored_turns = row
+            turns = json.loads(stored_turns)
+            if stored_summary != previous_summary or turns[:len(old_turns)] != old_turns:
+                return False
+            with self._lock:
+                cursor = self._conn.execute(
+                    "UPDATE chat_sessions SET summary = ?, turns = ?, updated_at = ? "
+                    "WHERE id = ? AND summary = ? AND turns = ?",
+                    (summary, json.dumps(turns[len(old_turns):], ensure_ascii=False), time.time(),
+                     session_id, stored_summary, stored_turns),
+                )
+                self._conn.commit()
+            if cursor.rowcount == 1:
+                return True
+        return False
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,))
+            self._conn.commit()
+
+
+_sessions = TTLCache(max_entries=settings.CHAT_SESSION_MAX_ENTRIES, ttl=settings.CHAT_SESSION_TTL, name="chat_sessions")
+_db: Optional[_SQLiteSessionStore] = _SQLiteSessionStore(settings.CHAT_SESSION_DB) if settings.CHAT_SESSION_DB else None
+
+
+def get_session(session_id: str) -> Optional[ChatSession]:
+    if _db is not None and settings.SHARED_CACHE_DB:
+        return _db.load(session_id)
+    session = _sessions.get(session_id)
+    if session is None and _db is not None:
+        session = _db.load(session_id)
+        if session is not None:
+            _sessions.set(session_id, session)
+    return session
+
+
+def get_or_create_session(session_id: Optional[str] = None) -> ChatSession:
+    """Return the existing session, or start a new one (reusing session_id if the old one expired)."""
+    if session_id:
+        session = get_session(session_id)
+        if session is not None:
+            return session
+    session = ChatSession(session_id or uuid.uuid4().hex)
+    save_session(session)
+    return session
+
+
+def save_session(session: ChatSession) -> None:
+    session.updated_at = time.time()
+    _sessions.set(session.session_id, session)
+    if _db is not None:
+        _db.save(session)
+
+
+def delete_session(session_id: str) -> bool:
+    found = _sessions.pop(session_id) is not None
+    if _db is not None:
+        found = found or _db.load(session_id) is not None
+        _db.delete(session_id)
+    return found
+
+
+def append_exchange(session: ChatSession, message: str, reply: str) -> None:
+    """Record a user message and its reply together, once the reply exists (one save)."""
+    with session.lock:
+        session.turns.append({"role": "user", "content": message})
+        session.turns.append({"role": "assistant", "content": reply})
+    save_session(session)
+
+
+def needs_compaction(session: ChatSession) -> bool:
+    return (
+        history_tokens(session) > settings.CHAT_HISTORY_TOKEN_BUDGET
+        and len(session.turns) > settings.CHAT_KEEP_RECENT_TURNS
+    )
+
+
+def compact_session(session: ChatSession) -> None:
+    """
+    Fold all but the most recent turns into the rolling summary.
+
+    Runs after the reply has been sent (blocking Gemini call), so only the
+    turns that existed when compaction started are removed; turns appended
+    meanwhile are kept. With several workers (SHARED_CACHE_DB) this session
+    is one worker's copy, so the summary is applied to the stored row with a
+    compare-and-set instead of saving the copy over it.
+    """
+    with session.lock:
+        if session.compacting or not needs_compaction(session):
+            return
+        session.compacting = True
+        cutoff = len(session.turns) - settings.CHAT_KEEP_RECENT_TURNS
+        old_turns = session.turns[:cutoff]
+        previous_summary = session.summary
+
+    try:
+        summary = compact_history(previous_summary, old_turns)
+    except Exception as exc:
+        print(f"Chat history compaction failed for {session.session_id}: {exc}")
+        with session.lock:
+            session.compacting = False
+        return
+
+    if _db is not None and settings.SHARED_CACHE_DB:
+        if not _db.compact(session.session_id, previous_summary, old_turns, summary):
+            print(f"Chat history compaction for {session.session_id} dropped: the session changed meanwhile")
+        with session.lock:
+            session.compacting = False
+        return
+
+    with session.lock:
+        session.summary = summary
+        del session.turns[:cutoff]
+        session.compacting = False
+    save_session(session)
+
+
+def schedule_compaction(session: ChatSession) -> None:
+    """Compact the session off the request path if it has outgrown the token budget."""
+    if needs_compaction(session):
+        asyncio.get_running_loop().run_in_executor(None, compact_session, session)
@@ -1,6 +1,14 @@
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
+from pydantic import ValidationError
 from ..config import settings
-from typing import Optional
+from ..models.schemas import StructuredItinerary
+from ..utils.languages import LANGUAGE_NAMES, SCRIPT_NAMES
+from typing import AsyncIterator, Optional
 
 INLINE_GEMINI_API_KEY = "###"
 DEFAULT_GEMINI_MODEL = "gemini-1.5-flash"
@@ -13,22 +21,48 @@ def _get_api_key() -> str:
     return api_key
 
 
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token); good enough for budgeting."""
+    return (len(text or "") + 3) // 4
+
+
+FALLBACK_GEMINI_MODELS = ["gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-flash-8b"]
+
+# Process-wide client and model resolution cache.
+# _resolved_models maps the requested model id -> (resolved model id, resolved_at monotonic time)
+_client: Optional[genai.Client] = None
+_client_lock = threading.Lock()
+_resolved_models: dict[str, tuple[str, float]] = {}
+_resolve_lock = threading.Lock()
+_refreshing: set[str] = set()
+
+
 def _get_client() -> genai.Client:
-    return genai.Client(api_key=_get_api_key())
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http_options = {"base_url": settings.GEMINI_BASE_URL} if settings.GEMINI_BASE_URL else None
+                _client = genai.Client(api_key=_get_api_key(), http_options=http_options)
+    return _client
 
 
-def _select_model(model_override: Optional[str] = None) -> str:
+def _candidate_models(model_override: Optional[str] = None) -> list[str]:
     requested = (
         model_override
-        or getattr(settings, "GEMINI_MODEL", "")
+        or settings.GEMINI_MODEL
         or "gemini-2.0-flash"
     ).strip()
 
     candidates = [requested]
-    for fallback in ["gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-flash-8b"]:
+    for fallback in FALLBACK_GEMINI_MODELS:
         if fallback not in candidates:
             candidates.append(fallback)
+    return candidates
 
+
+def _probe_model(candidates: list[str]) -> str:
+    """Return the first candidate the API reports as available (one network round trip per miss)."""
     client = _get_client()
     last_error: Exception | None = None
 
@@ -46,40 +80,287 @@ def _select_model(model_override: Optional[str] = None) -> str:
     ) from last_error
 
 
-def generate_itinerary(destination: str, days: int, interests: list[str] | None) -> str:
-    prompt = (
+def _remember_model(requested: str, model_id: str) -> None:
+    with _resolve_lock:
+        _resolved_models[requested] = (model_id, time.monotonic())
+
+
+def _refresh_in_background(candidates: list[str]) -> None:
+    requested = candidates[0]
+    with _resolve_lock:
+        if requested in _refreshing:
+            return
+        _refreshing.add(requested)
+
+    def _run() -> None:
+        try:
+            _remember_model(requested, _probe_model(candidates))
+        except Exception as exc:
+            # Keep serving the previously resolved model; the next stale hit retries.
+            print(f"Background Gemini model refresh failed: {exc}")
+        finally:
+            with _resolve_lock:
+                _refreshing.discard(requested)
+
+    threading.Thread(target=_run, name="gemini-model-refresh", daemon=True).start()
+
+
+def _select_model(model_override: Optional[str] = None) -> str:
+    """
+    Resolve the model id to use for generation.
+
+    Only the very first call per requested model probes the API synchronously.
+    After that the cached id is returned immediately, and once it is older than
+    GEMINI_MODEL_CACHE_TTL a re-probe is started in a background thread.
+    """
+    candidates = _candidate_models(model_override)
+    requested = candidates[0]
+
+    cached = _resolved_models.get(requested)
+    if cached is not None:
+        model_id, resolved_at = cached
+        if time.monotonic() - resolved_at > settings.GEMINI_MODEL_CACHE_TTL:
+            _refresh_in_background(candidates)
+        return model_id
+
+    model_id = _probe_model(candidates)
+    _remember_model(requested, model_id)
+    return model_id
+
+
+def _generate(prompt: str, model_override: Optional[str] = None, config: Optional[dict] = None) -> str:
+    """
+    Run a generation against the resolved model.
+
+    If the call fails, fail over straight to the next candidate model (no probe)
+    and remember whichever one succeeds for subsequent requests.
+    """
+    candidates = _candidate_models(model_override)
+    requested = candidates[0]
+    client = _get_client()
+
+    model = _select_model(model_override)
+    # The resolved model always comes from candidates; only try it and those after it.
+    order = candidates[candidates.index(model):]
+    last_error: Exception | None = None
+
+    for model_id in order:
+        try:
+            resp = client.models.generate_content(model=model_id, contents=prompt, config=config)
+        except Exception as exc:
+            last_error = exc
+            print(f"Generation with {model_id} failed, failing over: {exc}")
+            continue
+        if model_id != model:
+            _remember_model(requested, model_id)
+        return getattr(resp, "text", "") or ""
+
+    raise RuntimeError(
+        f"Gemini generation failed. Tried: {', '.join(order)}"
+    ) from last_error
+
+
+async def _generate_stream(prompt: str, model_override: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    Stream generated text chunks as Gemini produces them.
+
+    Failover to the next candidate model only happens before the first chunk
+    has been yielded; once text has reached the caller the error is raised.
+    """
+    candidates = _candidate_models(model_override)
+    requested = candidates[0]
+    client = _get_client()
+
+    model = await asyncio.to_thread(_select_model, model_override)
+    order = candidates[candidates.index(model):]
+    last_error: Exception | None = None
+
+    for model_id in order:
+        started = False
+        try:
+            stream = await client.aio.models.generate_content_stream(model=model_id, contents=prompt)
+            async for chunk in stream:
+                text = getattr(chunk, "text", "") or ""
+                if text:
+                    started = True
+                    yield text
+        except Exception as exc:
+            if started:
+                raise
+            last_error = exc
+            print(f"Streaming with {model_id} failed, failing over: {exc}")
+            continue
+        if model_id != model:
+            _remember_model(requested, model_id)
+        return
+
+    raise RuntimeError(
+        f"Gemini generation failed. Tried: {', '.join(order)}"
+    ) from last_error
+
+
+def _language_instruction(target_lang: Optional[str]) -> str:
+    """Prompt suffix asking the model to answer directly in target_lang (empty for English/None)."""
+    if not target_lang or target_lang not in SCRIPT_NAMES:
+        return ""
+    return (
+        f"\n\nWrite the entire answer in {LANGUAGE_NAMES[target_lang]} using {SCRIPT_NAMES[target_lang]} script, "
+        "including place names. Do not include an English version."
+    )
+
+
+def _itinerary_prompt(destination: str, days: int, interests: list[str] | None) -> str:
+    return (
         "You are TourBuddy, a concise travel planner. Create a practical, time-boxed itinerary.\n"
         f"Destination: {destination}\n"
         f"Days: {days}\n"
         f"Interests: {', '.join(interests or []) or 'general sightseeing and local food'}\n\n"
         "Format per day with morning/afternoon/evening, include travel time hints, entry fees if known, and local food suggestions."
     )
-    client = _get_client()
-    model = _select_model()
-    resp = client.models.generate_content(model=model, contents=prompt)
-    return getattr(resp, "text", "") or ""
 
 
-def chat_completion(messages: list[dict[str, str]]) -> str:
+def _chat_prompt(messages: list[dict[str, str]], summary: Optional[str] = None) -> str:
     # Flatten messages into a single prompt (basic chat)
     formatted = []
+    if summary:
+        formatted.append(f"SYSTEM: Summary of the earlier conversation:\n{summary}")
     for m in messages:
         role = m.get("role", "user")
         content = m.get("content", "")
         formatted.append(f"{role.upper()}: {content}")
-    prompt = "\n".join(formatted) + "\nASSISTANT:"
-    client = _get_client()
-    model = _select_model()
-    resp = client.models.generate_content(model=model, contents=prompt)
-    return getattr(resp, "text", "") or ""
+    return "\n".join(formatted) + "\nASSISTANT:"
 
 
-def summarize_text(text: str) -> str:
-    prompt = (
+def _summary_prompt(text: str) -> str:
+    return (
         "Summarize the following content into clear bullet points with key facts, times, prices, and contacts if present.\n\n"
         f"CONTENT:\n{text}"
     )
-    client = _get_client()
-    model = _select_model()
-    resp = client.models.generate_content(model=model, contents=prompt)
-    return getattr(resp, "text", "") or ""
+
+
+def generate_itinerary(destination: str, days: int, interests: list[str] | None, target_lang: Optional[str] = None) -> str:
+    return _generate(_itinerary_prompt(destination, days, interests) + _language_instruction(target_lang))
+
+
+def generate_structured_itinerary(destination: str, days: int, interests: list[str] | None) -> StructuredItinerary:
+    """
+    Generate the itinerary as JSON (days -> slots -> place, activity, travel time, fee, food).
+
+    Raises ValueError if the model output does not match the schema.
+    """
+    prompt = (
+        _itinerary_prompt(destination, days, interests)
+        + "\n\nReturn JSON only. Use one slot per morning/afternoon/evening, keep every field short "
+        "(a phrase, not a paragraph) and leave entry_fee or food empty when unknown."
+    )
+    text = _generate(
+        prompt,
+        config={"response_mime_type": "application/json", "response_schema": StructuredItinerary},
+    )
+    try:
+        return StructuredItinerary.model_validate_json(text)
+    except ValidationError as exc:
+        raise ValueError(f"Gemini returned an invalid itinerary: {exc}") from exc
+
+
+def stream_itinerary(destination: str, days: int, interests: list[str] | None) -> AsyncIterator[str]:
+    return _generate_stream(_itinerary_prompt(destination, days, interests))
+
+
+def chat_completion(messages: list[dict[str, str]], summary: Optional[str] = None, target_lang: Optional[str] = None) -> str:
+    instruction = _language_instruction(target_lang)
+    if instruction:
+        # Keep the instruction ahead of the trailing "ASSISTANT:" cue
+        return _generate(f"SYSTEM: {instruction.strip()}\n" + _chat_prompt(messages, summary))
+    return _generate(_chat_prompt(messages, summary))
+
+
+def stream_chat(messages: list[dict[str, str]], summary: Optional[str] = None) -> AsyncIterator[str]:
+    return _generate_stream(_chat_prompt(messages, summary))
+
+
+def compact_history(summary: str, turns: list[dict[str, str]]) -> str:
+    """Fold older chat turns into a rolling summary of the conversation."""
+    turns_text = "\n".join(f"{t.get('role', 'user').upper()}: {t.get('content', '')}" for t in turns)
+    prompt = (
+        "Update the running summary of a conversation between a traveller and TourBuddy, a travel assistant. "
+        "Keep places, dates, preferences, bookings and open questions. Answer with the summary only, at most 150 words.\n\n"
+        f"CURRENT SUMMARY:\n{summary or '(none)'}\n\n"
+        f"NEW TURNS:\n{turns_text}"
+    )
+    return _generate(prompt).strip()
+
+
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?।॥])\s+")
+
+
+def _split_into_chunks(text: str, max_tokens: int) -> list[str]:
+    """Split text into chunks of at most ~max_tokens, breaking on lines, then sentences, then words."""
+    pieces: list[str] = []
+    for line in text.splitlines():
+        if estimate_tokens(line) <= max_tokens:
+            pieces.append(line)
+            continue
+        for sentence in _SENTENCE_BREAK_RE.split(line):
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            words = sentence.split()
+            window: list[str] = []
+            for word in words:
+                if window and estimate_tokens(" ".join(window + [word])) > max_tokens:
+                    pieces.append(" ".join(window))
+                    window = []
+                window.append(word)
+            if window:
+                pieces.append(" ".join(window))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for piece in pieces:
+        tokens = estimate_tokens(piece) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return [c for c in chunks if c.strip()]
+
+
+def _map_reduce_summary(text: str, target_lang: Optional[str] = None) -> str:
+    """
+    Summarize long content in two passes.
+
+    Map: each token-bounded chunk is summarized independently, with at most
+    SUMMARY_MAP_CONCURRENCY Gemini calls in flight. Reduce: the partial
+    summaries are merged into one bullet list in a single final call.
+    """
+    chunks = _split_into_chunks(text, settings.SUMMARY_CHUNK_TOKENS)
+    if len(chunks) <= 1:
+        return _generate(_summary_prompt(text) + _language_instruction(target_lang))
+
+    map_prompts = [
+        "Summarize this part of a longer document into bullet points with key facts, times, prices, and contacts if present.\n\n"
+        f"PART {i + 1} OF {len(chunks)}:\n{chunk}"
+        for i, chunk in enumerate(chunks)
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, settings.SUMMARY_MAP_CONCURRENCY)) as pool:
+        partials = list(pool.map(_generate, map_prompts))
+
+    joined = "\n\n".join(f"PART {i + 1}:\n{p}" for i, p in enumerate(partials))
+    reduce_prompt = (
+        "Merge these partial summaries of one document into a single set of clear bullet points. "
+        "Remove duplicates and keep key facts, times, prices, and contacts.\n\n"
+        f"PARTIAL SUMMARIES:\n{joined}"
+    )
+    # Only the reduce pass needs to be in the target language
+    return _generate(reduce_prompt + _language_instruction(target_lang))
+
+
+def summarize_text(text: str, target_lang: Optional[str] = None) -> str:
+    if estimate_tokens(text) > settings.SUMMARY_MAP_THRESHOLD_TOKENS:
+        return _map_reduce_summary(text, target_lang)
+    return _generate(_summary_prompt(text) + _language_instruction(target_lang))
@@ -0,0 +1,77 @@
+"""
+Itinerary Response Cache
+
+Itinerary traffic is heavily skewed towards a handful of destinations and
+interest sets, so generated plans are cached instead of regenerated.
+
+An entry is keyed on the normalized (destination, days, interests) and holds
+the base (English) itinerary plus every translation produced for it so far,
+so a lookup is effectively keyed on (destination, days, interests, target_lang).
+With a shared backend (SQLite or Redis, see CACHE_BACKEND) all workers and
+nodes share one cache; entries are merged with compare-and-set so two
+workers adding different translations at once do not overwrite each other.
+The functions are coroutines so shared-backend I/O stays off the event loop.
+"""
+
+import re
+from typing import Any, Optional
+
+from ..config import settings
+from ..utils.cache import make_cache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+STORE_ATTEMPTS = 3
+
+_cache = make_cache(
+    max_entries=settings.ITINERARY_CACHE_MAX_ENTRIES,
+    ttl=settings.ITINERARY_CACHE_TTL,
+    name="itinerary",
+)
+
+
+def _normalize(value: str) -> str:
+    return _WHITESPACE_RE.sub(" ", (value or "").strip()).casefold()
+
+
+def itinerary_key(destination: str, days: int, interests: Optional[list[str]]) -> tuple:
+    """Build the cache key: normalized destination, days and sorted, de-duplicated interests."""
+    normalized_interests = sorted({_normalize(i) for i in interests or [] if _normalize(i)})
+    return (_normalize(destination), int(days), tuple(normalized_interests))
+
+
+async def get_itinerary(key: tuple) -> Any:
+    """Return the cached base itinerary (text, or a dict for structured ones), if any."""
+    entry = await _cache.aget(key)
+    return entry["itinerary"] if entry else None
+
+
+async def get_translation(key: tuple, target_lang: str) -> Optional[str]:
+    """Return the cached translation of the itinerary for target_lang, if any."""
+    entry = await _cache.aget(key)
+    return entry["translations"].get(target_lang) if entry else None
+
+
+async def store_itinerary(key: tuple, itinerary: Any, target_lang: Optional[str] = None, translated: Optional[str] = None) -> None:
+    """
+    Store a generated itinerary, merging the translation into any existing entry.
+
+    A freshly generated base text replaces the old one and drops translations
+    made from it, since they no longer match. itinerary may be None when only
+    a target-language version was generated (LLM-native output).
+    """
+    for _ in range(STORE_ATTEMPTS):
+        current = await _cache.aget(key)
+        if current is None or itinerary is not None and current["itinerary"] != itinerary:
+            entry = {"itinerary": itinerary, "translations": {}}
+        else:
+            entry = {"itinerary": current["itinerary"], "translations": dict(current["translations"])}
+        if target_lang and translated is not None:
+            entry["translations"][target_lang] = translated
+        if await _cache.acompare_and_set(key, current, entry):
+            return
+    # Still contended: last writer wins, as before
+    await _cache.aset(key, entry)
+
+
+def clear() -> None:
+    _cache.clear()
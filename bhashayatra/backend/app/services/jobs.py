@@ -0,0 +1,446 @@
+"""
+Asynchronous Jobs for Long Operations
+
+Long inputs (multi-minute audio, long texts for TTS, several images) do not
+fit a synchronous request and a client disconnect would throw the work away.
+Jobs are accepted immediately, persisted and processed in the background:
+
+- Jobs and their input files are stored in SQLite (JOBS_DB), so queued and
+  interrupted jobs are picked up again after a restart.
+- A pool of JOB_WORKERS asyncio workers runs them through the existing
+  unified pipeline, at bulk upstream priority.
+- Inputs are split into segments the pipeline accepts: text into sentence
+  groups packed up to the MT/TTS word limits, long WAV audio into
+  utterances (VAD), and one segment per image. Progress is reported per
+  segment.
+- When a job finishes, its webhook_url (if any) receives the job as JSON.
+  Webhook URLs must be http(s) and must not resolve to loopback, private,
+  link-local or other non-public addresses (unless the host is listed in
+  JOB_WEBHOOK_ALLOWED_HOSTS); the check is repeated before every delivery
+  and redirects are not followed.
+- Finished jobs are kept for JOB_RESULT_TTL seconds.
+- Several worker processes can share JOBS_DB: a job runs in whichever
+  process claims it first. A job interrupted by a worker shutting down is
+  put back in the queue and picked up by the next sweep of any process.
+"""
+
+import asyncio
+import io
+import ipaddress
+import json
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import wave
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from ..config import settings
+from ..utils.priority import BULK, priority
+from ..utils.tracing import start_trace
+from ..utils.validators import MAX_ASR_SECONDS, MAX_MT_WORDS, MAX_TTS_WORDS, count_words
+from .pipeline import InputType, OutputType, execute_pipeline
+from .streaming import SentenceSplitter
+from .vad import BYTES_PER_SAMPLE, UtteranceSegmenter, pcm_to_wav
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+WEBHOOK_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+WEBHOOK_ATTEMPTS = 3
+PURGE_INTERVAL = 300  # seconds between sweeps for expired job results
+
+
+class _JobStore:
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT NOT NULL, webhook_url TEXT, "
+                "progress_done INTEGER NOT NULL DEFAULT 0, progress_total INTEGER NOT NULL DEFAULT 0, "
+                "result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, finished_at REAL);"
+                "CREATE TABLE IF NOT EXISTS job_files ("
+                "job_id TEXT NOT NULL, idx INTEGER NOT NULL, filename TEXT, content_type TEXT, data BLOB NOT NULL, "
+                "PRIMARY KEY (job_id, idx));"
+            )
+            self._conn.commit()
+
+    def insert(self, job_id: str, params: dict, webhook_url: Optional[str], files: list[tuple]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, params, webhook_url, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params, ensure_ascii=False), webhook_url, now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_files (job_id, idx, filename, content_type, data) VALUES (?, ?, ?, ?, ?)",
+                [(job_id, i, name, content_type, data) for i, (name, content_type, data) in enumerate(files)],
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, params, webhook_url, progress_done, progress_total, result, error, "
+                "created_at, updated_at, finished_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "status", "params", "webhook_url", "progress_done", "progress_total",
+                "result", "error", "created_at", "updated_at", "finished_at")
+        job = dict(zip(keys, row))
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def files(self, job_id: str) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT filename, content_type, data FROM job_files WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+
+    def claim(self, job_id: str) -> bool:
+        """Mark a queued job as running; False if another worker got it first."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, time.time(), job_id, QUEUED),
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def set_progress(self, job_id: str, done: int, total: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET progress_done = ?, progress_total = ?, updated_at = ? WHERE id = ?",
+                (done, total, time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def finish(self, job_id: str, status: str, result: Optional[dict], error: Optional[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error, now, now, job_id),
+            )
+            # Inputs are no longer needed once the job is done
+            self._conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+            self._conn.commit()
+
+    def requeue_interrupted(self) -> list[str]:
+        """Reset jobs left running by a previous process and return every queued job id, oldest first."""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = ? WHERE status = ?", (QUEUED, RUNNING))
+            self._conn.commit()
+        return self.queued()
+
+    def queued(self) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def release(self, job_id: str) -> None:
+        """Put a running job back in the queue (its worker is shutting down)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (QUEUED, time.time(), job_id, RUNNING),
+            )
+            self._conn.commit()
+
+    def purge_finished(self, older_than: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (older_than,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+_store: Optional[_JobStore] = None
+_queue: Optional[asyncio.Queue] = None
+_tasks: list[asyncio.Task] = []
+_webhooks: set[asyncio.Task] = set()
+
+
+def _get_store() -> _JobStore:
+    global _store
+    if _store is None:
+        _store = _JobStore(settings.JOBS_DB)
+    return _store
+
+
+# ==================== WEBHOOKS ====================
+
+def validate_webhook_url(url: str) -> str:
+    """
+    Check that url is an http(s) URL whose host resolves only to public addresses.
+
+    Blocks the server from being used to reach internal services (localhost,
+    the cloud metadata endpoint, private networks). Hosts in
+    JOB_WEBHOOK_ALLOWED_HOSTS are accepted as they are. Does a DNS lookup.
+
+    Raises:
+        ValueError: If the URL may not be used as a webhook
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        raise ValueError("webhook_url is not a valid URL")
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("webhook_url must be an http or https URL")
+    host = parts.hostname.lower()
+    if host in settings.JOB_WEBHOOK_ALLOWED_HOSTS:
+        return url
+    try:
+        infos = socket.getaddrinfo(host, port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        raise ValueError(f"webhook_url host {host} cannot be resolved")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"webhook_url host {host} resolves to a non-public address")
+    return url
+
+
+async def _notify(job: dict) -> None:
+    try:
+        await asyncio.to_thread(validate_webhook_url, job["webhook_url"])
+    except ValueError as exc:
+        # Checked at submission too; DNS may have changed since
+        print(f"Webhook for job {job['id']} not sent: {exc}")
+        return
+    payload = {k: job[k] for k in ("id", "status", "progress_done", "progress_total", "result", "error")}
+    for attempt in range(WEBHOOK_ATTEMPTS):
+        try:
+            async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT, follow_redirects=False) as client:
+                resp = await client.post(job["webhook_url"], json=payload)
+                resp.raise_for_status()
+                return
+        except httpx.HTTPError as exc:
+            print(f"Webhook for job {job['id']} failed (attempt {attempt + 1}): {exc}")
+            await asyncio.sleep(2 ** attempt)
+
+
+# ==================== PUBLIC API ====================
+
+async def submit_job(params: dict, files: list[tuple], webhook_url: Optional[str] = None) -> str:
+    """
+    Persist a new job and queue it for the workers.
+
+    Args:
+        params: input_type, output_type, source_language, target_language, gender (and text for text jobs)
+        files: (filename, content_type, data) for audio/image jobs
+        webhook_url: Optional URL to POST the finished job to
+
+    Returns:
+        The job id
+    """
+    job_id = uuid.uuid4().hex
+    await asyncio.to_thread(_get_store().insert, job_id, params, webhook_url, files)
+    if _queue is not None:
+        _queue.put_nowait(job_id)
+    return job_id
+
+
+async def get_job(job_id: str) -> Optional[dict]:
+    """Return the job, or None if it does not exist or its result has expired."""
+    job = await asyncio.to_thread(_get_store().get, job_id)
+    if job is None:
+        return None
+    if job["finished_at"] is not None and job["finished_at"] + settings.JOB_RESULT_TTL < time.time():
+        return None
+    return job
+
+
+async def start_workers() -> None:
+    """
+    Start the worker pool and queue the jobs waiting in JOBS_DB.
+
+    Jobs left running by a previous run are re-queued first, unless
+    JOBS_RECOVER_ON_START is off: with several worker processes the launcher
+    recovers them once, since a starting worker cannot tell a crashed
+    worker's jobs from a live one's.
+    """
+    global _queue
+    if _queue is not None:
+        return
+    _queue = asyncio.Queue()
+    store = _get_store()
+    recover = store.requeue_interrupted if settings.JOBS_RECOVER_ON_START else store.queued
+    for job_id in await asyncio.to_thread(recover):
+        _queue.put_nowait(job_id)
+    _tasks.extend(asyncio.create_task(_worker(i)) for i in range(max(1, settings.JOB_WORKERS)))
+    _tasks.append(asyncio.create_task(_purge_loop()))
+
+
+async def stop_workers() -> None:
+    """Cancel the workers; a job interrupted here is re-run after the next start."""
+    global _queue
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    # Webhooks still retrying are dropped with the workers
+    for task in list(_webhooks):
+        task.cancel()
+    await asyncio.gather(*_webhooks, return_exceptions=True)
+    _queue = None
+
+
+# ==================== SEGMENTATION ====================
+
+def _split_text(text: str, output_type: OutputType) -> list[str]:
+    max_words = MAX_TTS_WORDS if output_type == OutputType.AUDIO else MAX_MT_WORDS
+    splitter = SentenceSplitter(max_words)
+    # Pack consecutive sentences into as few pipeline calls as the word limit allows
+    segments: list[str] = []
+    words = 0
+    for sentence in splitter.feed(text) + splitter.flush():
+        n = count_words(sentence)
+        if segments and words + n <= max_words:
+            segments[-1] += " " + sentence
+            words += n
+        else:
+            segments.append(sentence)
+            words = n
+    return segments
+
+
+def _split_audio(filename: str, content_type: str, data: bytes) -> list[tuple]:
+    """Split long 16-bit mono WAV audio into utterances under the ASR duration limit."""
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            rate, channels, width = wf.getframerate(), wf.getnchannels(), wf.getsampwidth()
+            duration = wf.getnframes() / float(rate) if rate else 0.0
+            pcm = wf.readframes(wf.getnframes())
+    except wave.Error:
+        return [(filename, content_type, data)]  # let the pipeline report the invalid file
+    if duration <= MAX_ASR_SECONDS or channels != 1 or width != BYTES_PER_SAMPLE:
+        return [(filename, content_type, data)]
+
+    segmenter = UtteranceSegmenter(
+        sample_rate=rate,
+        energy_threshold=settings.VAD_ENERGY_THRESHOLD,
+        silence_ms=settings.VAD_SILENCE_MS,
+    )
+    utterances = segmenter.feed(pcm)
+    last = segmenter.flush()
+    if last:
+        utterances.append(last)
+    return [
+        (f"{filename or 'audio'}#{i}.wav", "audio/wav", pcm_to_wav(utterance, rate))
+        for i, utterance in enumerate(utterances)
+    ]
+
+
+def _segments(input_type: InputType, output_type: OutputType, params: dict, files: list[tuple]) -> list:
+    if input_type == InputType.TEXT:
+        return _split_text(params.get("text", ""), output_type)
+    if input_type == InputType.AUDIO:
+        return [segment for file in files for segment in _split_audio(*file)]
+    return list(files)
+
+
+def _as_upload(filename: str, content_type: str, data: bytes) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(data),
+        filename=filename,
+        headers=Headers({"content-type": content_type or ""}),
+    )
+
+
+# ==================== WORKERS ====================
+
+async def _run_job(job_id: str) -> None:
+    store = _get_store()
+    job = await asyncio.to_thread(store.get, job_id)
+    params = job["params"]
+    input_type = InputType(params["input_type"])
+    output_type = OutputType(params["output_type"])
+
+    files = await asyncio.to_thread(store.files, job_id)
+    # VAD over minutes of audio is CPU-bound
+    segments = await asyncio.to_thread(_segments, input_type, output_type, params, files)
+    await asyncio.to_thread(store.set_progress, job_id, 0, len(segments))
+
+    results = []
+    for i, segment in enumerate(segments):
+        input_data = segment if input_type == InputType.TEXT else _as_upload(*segment)
+        try:
+            outcome = await execute_pipeline(
+                input_data=input_data,
+                input_type=input_type,
+                output_type=output_type,
+                source_language=params["source_language"],
+                target_language=params["target_language"],
+                gender=params.get("gender"),
+            )
+            results.append({
+                "index": i,
+                "final_output": outcome.final_output,
+                "intermediate_results": outcome.intermediate_results,
+                "error": None,
+            })
+        except Exception as exc:
+            results.append({"index": i, "final_output": None, "intermediate_results": {}, "error": str(getattr(exc, "detail", exc))})
+        await asyncio.to_thread(store.set_progress, job_id, i + 1, len(segments))
+
+    outputs = [r["final_output"] for r in results if r["error"] is None]
+    if segments and not outputs:
+        await asyncio.to_thread(store.finish, job_id, FAILED, {"segments": results}, "All segments failed")
+        return
+    final_output = " ".join(o for o in outputs if o) if output_type == OutputType.TEXT else outputs
+    await asyncio.to_thread(store.finish, job_id, COMPLETED, {"final_output": final_output, "segments": results}, None)
+
+
+
+async def _worker(worker_id: int) -> None:
+    store = _get_store()
+    while True:
+        job_id = await _queue.get()
+        try:
+            if not await asyncio.to_thread(store.claim, job_id):
+                continue
+            try:
+                with priority(BULK), start_trace("job", kind="internal", **{"job.id": job_id}):
+                    await _run_job(job_id)
+            except asyncio.CancelledError:
+                await asyncio.to_thread(store.release, job_id)
+                raise
+            except Exception as exc:
+                print(f"Job {job_id} crashed in worker {worker_id}: {exc}")
+                await asyncio.to_thread(store.finish, job_id, FAILED, None, str(exc))
+            job = await asyncio.to_thread(store.get, job_id)
+            if job and job["webhook_url"]:
+                # Delivered in the background so retries do not hold up the next job
+                task = asyncio.create_task(_notify(job))
+                _webhooks.add(task)
+                task.add_done_callback(_webhooks.discard)
+        except Exception as exc:
+            # Keep the worker alive whatever happens to a single job (e.g. JOBS_DB errors)
+            print(f"Worker {worker_id} failed on job {job_id}: {exc}")
+
+
+async def _purge_loop() -> None:
+    while True:
+        await asyncio.to_thread(_get_store().purge_finished, time.time() - settings.JOB_RESULT_TTL)
+        await asyncio.sleep(PURGE_INTERVAL)
+        # Pick up jobs released by a worker process that shut down (claim() stops double runs)
+        for job_id in await asyncio.to_thread(_get_store().queued):
+            _queue.put_nowait(job_id)
@@ -0,0 +1,44 @@
+"""
+LLM-Native Target-Language Output
+
+With GEMINI_NATIVE_TARGET_LANG enabled, itinerary, chat and summary prompts
+ask Gemini to answer directly in the requested Indic language, which removes
+the separate MT hop (and its 50-word limit). The output is checked with a
+cheap script test; if the model answered in the wrong script the text is
+treated as English and sent through MT as before.
+"""
+
+from typing import Optional
+
+from .phrase_translation import translate_text
+from ..config import settings
+from ..utils.languages import SCRIPT_NAMES, matches_script
+
+
+def native_target_lang(target_lang: Optional[str]) -> Optional[str]:
+    """Return target_lang if it should be generated natively by the LLM, else None."""
+    if settings.GEMINI_NATIVE_TARGET_LANG and target_lang in SCRIPT_NAMES:
+        return target_lang
+    return None
+
+
+def is_native_output(text: str, native_lang: Optional[str]) -> bool:
+    return bool(native_lang) and matches_script(text, native_lang)
+
+
+async def localize_output(text: str, target_lang: Optional[str], native_lang: Optional[str]) -> str:
+    """
+    Produce the target-language version of generated text.
+
+    Native output that passes the script check is returned as-is; otherwise
+    fall back to the MT path (the generated text is English), sentence by
+    sentence so long output stays within the MT word limit. English or no
+    target_lang needs no translation.
+    """
+    if native_lang:
+        if is_native_output(text, native_lang):
+            return text
+        return await translate_text(text, "en", native_lang)
+    if not target_lang or target_lang == "en":
+        return text
+    return await translate_text(text, "en", target_lang)
@@ -0,0 +1,75 @@
+"""
+Phrase-Level Translation with De-duplication and Caching
+
+Structured output (e.g. the JSON itinerary) contains many short strings, and
+the same ones repeat: place names, dishes, "Free entry", "morning"... Rather
+than translating one oversized blob, every distinct phrase is translated once
+per response, concurrently, and remembered across responses.
+"""
+
+import asyncio
+from typing import Iterable
+
+from .bhashini import mt_translate
+from .streaming import SentenceSplitter
+from ..config import settings
+from ..utils.cache import make_cache
+from ..utils.validators import MAX_MT_WORDS
+
+# Max concurrent MT calls per translate_phrases() call
+MAX_PHRASE_CONCURRENCY = 8
+
+_phrase_cache = make_cache(max_entries=settings.PHRASE_CACHE_MAX_ENTRIES, ttl=settings.PHRASE_CACHE_TTL, name="phrase")
+
+
+async def _translate_one(text: str, source_lang: str, target_lang: str, limit: asyncio.Semaphore) -> str:
+    # Long fields are split so each MT call stays within the word limit
+    splitter = SentenceSplitter(MAX_MT_WORDS)
+    pieces = splitter.feed(text) + splitter.flush()
+
+    async def run(piece: str) -> str:
+        async with limit:
+            return await mt_translate(piece, source_lang, target_lang)
+
+    translated = await asyncio.gather(*(run(p) for p in pieces))
+    return " ".join(translated)
+
+
+async def translate_phrases(texts: Iterable[str], source_lang: str, target_lang: str) -> dict[str, str]:
+    """
+    Translate a collection of phrases, returning {original: translated}.
+
+    Duplicates and cached phrases cost no MT call; the rest are translated
+    concurrently (at most MAX_PHRASE_CONCURRENCY in flight).
+    """
+    unique = {t.strip() for t in texts if t and t.strip()}
+    if source_lang == target_lang:
+        return {t: t for t in unique}
+
+    # One batched lookup (a single round trip on the shared backends)
+    cached = await _phrase_cache.aget_many((source_lang, target_lang, text) for text in unique)
+    result: dict[str, str] = {key[2]: value for key, value in cached.items()}
+    missing = [text for text in unique if text not in result]
+
+    limit = asyncio.Semaphore(MAX_PHRASE_CONCURRENCY)
+    translations = await asyncio.gather(*(_translate_one(t, source_lang, target_lang, limit) for t in missing))
+    await asyncio.gather(*(
+        _phrase_cache.aset((source_lang, target_lang, text), translated)
+        for text, translated in zip(missing, translations)
+    ))
+    result.update(zip(missing, translations))
+    return result
+
+
+async def translate_text(text: str, source_lang: str, target_lang: str) -> str:
+    """
+    Translate text of any length, keeping its line breaks.
+
+    Each line is cut into sentences within the MT word limit and all of them
+    are translated concurrently (at most MAX_PHRASE_CONCURRENCY in flight),
+    so whole generated itineraries, replies and summaries fit the MT API.
+    """
+    limit = asyncio.Semaphore(MAX_PHRASE_CONCURRENCY)
+    lines = text.split("\n")
+    translated = await asyncio.gather(*(_translate_one(line, source_lang, target_lang, limit) for line in lines))
+    return "\n".join(translated)
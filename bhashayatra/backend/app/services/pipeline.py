@@ -13,14 +13,27 @@ then chains them automatically. Examples:
 - OCR: Hindi image → Hindi text (same language)
 - OCR+MT: Hindi image → English text (image in Hindi, want English text)
 - OCR+MT+TTS: Hindi image → English audio (image in Hindi, want English audio)
+
+Each combination is built as a PipelinePlan: a small DAG of Stages that
+declare the data keys they consume and produce. run_plan starts every stage
+as soon as its inputs exist, so independent branches run concurrently, and
+new stages plug into a plan without touching the executor.
 """
 
-from typing import Optional, Union, Tuple, Dict, Any
-from fastapi import UploadFile
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional, Union, Tuple, Dict, Any, Awaitable, Callable, Iterable
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import UploadFile as StarletteUploadFile
 from enum import Enum
 
 from .bhashini import asr_transcribe, mt_translate, tts_synthesize, ocr_extract
 from ..utils.languages import validate_language, LANGUAGE_NAMES
+from ..utils import metrics
+from ..utils.tracing import span
+from ..utils.deadline import DeadlineExceeded, expired as deadline_expired, remaining as deadline_remaining
+from ..utils.validators import ensure_asr_constraints, ensure_ocr_constraints
 
 class InputType(str, Enum):
     TEXT = "text"
@@ -31,45 +44,464 @@ class OutputType(str, Enum):
     TEXT = "text"
     AUDIO = "audio"
 
+class StageResult:
+    """
+    Outcome of a single pipeline stage (error is set if it failed or was skipped).
+
+    started_at/finished_at are time.monotonic() values (None if the stage
+    never ran); input_bytes/output_bytes are the payload sizes it consumed
+    and produced, where they can be measured.
+    """
+    def __init__(
+        self,
+        name: str,
+        output_key: str,
+        value: Any,
+        error: Optional[str] = None,
+        timed_out: bool = False,
+        started_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+        input_bytes: Optional[int] = None,
+        output_bytes: Optional[int] = None,
+    ):
+        self.name = name
+        self.output_key = output_key
+        self.value = value
+        self.error = error
+        self.timed_out = timed_out
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.input_bytes = input_bytes
+        self.output_bytes = output_bytes
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000
+
 class PipelineResult:
     def __init__(self):
         self.final_output: Any = None
         self.intermediate_results: Dict[str, Any] = {}
         self.operations_performed: list[str] = []
+        self.stage_results: Dict[str, StageResult] = {}
+        self.deadline_exceeded: bool = False
+        self.skipped_operations: list[str] = []
         self.source_language: str = ""
         self.target_language: str = ""
         self.input_type: str = ""
         self.output_type: str = ""
+        # time.monotonic() bounds of the whole plan run
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
 
-def determine_required_operations(
-    input_type: InputType, 
-    output_type: OutputType, 
-    source_lang: str, 
-    target_lang: str
-) -> list[str]:
+    def stage_timings(self) -> list[Dict[str, Any]]:
+        """Per-stage timing in run order, as millisecond offsets from the pipeline start."""
+        timings = []
+        origin = self.started_at
+        for result in sorted(self.stage_results.values(), key=lambda r: (r.started_at is None, r.started_at or 0.0)):
+            ran = result.started_at is not None and origin is not None
+            timings.append({
+                "stage": result.name,
+                "start_ms": round((result.started_at - origin) * 1000, 2) if ran else None,
+                "end_ms": round((result.finished_at - origin) * 1000, 2) if ran and result.finished_at is not None else None,
+                "duration_ms": None if result.duration_ms is None else round(result.duration_ms, 2),
+                "input_bytes": result.input_bytes,
+                "output_bytes": result.output_bytes,
+                "ok": result.ok,
+            })
+        return timings
+
+# PipelineResults run in the current context (request), kept even when a run fails
+_tracked: ContextVar[Optional[list]] = ContextVar("pipeline_results", default=None)
+
+def track_results() -> list[PipelineResult]:
+    """Collect every PipelineResult run from now on in the current context; returns the (live) list."""
+    tracked: list[PipelineResult] = []
+    _tracked.set(tracked)
+    return tracked
+
+def _track(result: PipelineResult) -> None:
+    tracked = _tracked.get()
+    if tracked is not None:
+        tracked.append(result)
+
+# ==================== DAG EXECUTOR ====================
+
+class Stage:
     """
-    Determine what operations are needed based on input/output types and languages.
-    
-    Returns list of operations in order: ['asr', 'mt', 'tts']
+    One node of a pipeline plan.
+
+    Args:
+        name: Operation name reported in operations_performed (e.g. 'mt')
+        inputs: Data keys this stage consumes, passed positionally to run
+        output: Data key this stage produces
+        run: Async callable producing the output from the inputs
+        result_key: Key under which the output is reported in intermediate_results (None = not reported)
+        critical: If False, a failure only skips the stages that depend on this
+            one instead of aborting the whole plan (used for per-target branches)
+        language: Language (or 'src-tgt' pair) the stage works in, for tracing
     """
-    operations = []
-    
-    # Step 1: Convert input to text if needed
-    if input_type == InputType.AUDIO:
-        operations.append('asr')
-    elif input_type == InputType.IMAGE:
-        operations.append('ocr')
-    # If input_type is TEXT, no conversion needed
-    
-    # Step 2: Translate if languages are different
-    if source_lang != target_lang:
-        operations.append('mt')
-    
-    # Step 3: Convert to audio if needed
-    if output_type == OutputType.AUDIO:
-        operations.append('tts')
-    
-    return operations
+    def __init__(
+        self,
+        name: str,
+        inputs: Tuple[str, ...],
+        output: str,
+        run: Callable[..., Awaitable[Any]],
+        result_key: Optional[str] = None,
+        critical: bool = True,
+        language: Optional[str] = None,
+    ):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.output = output
+        self.run = run
+        self.result_key = result_key
+        self.critical = critical
+        self.language = language
+
+class PipelinePlan:
+    """
+    A set of stages wired together by their input/output keys.
+
+    Stages run as soon as all of their inputs are available, so independent
+    branches (e.g. TTS of the source text and MT) run concurrently. New stages
+    (preprocessing, summarization, caching, ...) are added to a plan; the
+    executor itself never changes.
+    """
+    def __init__(self, stages: Iterable[Stage], final_output: str, initial_keys: Iterable[str] = ("input",)):
+        self.stages: list[Stage] = list(stages)
+        self.final_output = final_output
+        self.initial_keys = tuple(initial_keys)
+        self._validate()
+
+    def _validate(self) -> None:
+        produced = set(self.initial_keys)
+        names = set()
+        for stage in self.stages:
+            if stage.output in produced:
+                raise ValueError(f"Pipeline key '{stage.output}' is produced twice")
+            if stage.name in names:
+                raise ValueError(f"Duplicate pipeline stage '{stage.name}'")
+            produced.add(stage.output)
+            names.add(stage.name)
+        missing = {key for stage in self.stages for key in stage.inputs} - produced
+        if missing or self.final_output not in produced:
+            raise ValueError(f"Pipeline inputs never produced: {', '.join(sorted(missing | ({self.final_output} - produced)))}")
+
+    @property
+    def operations(self) -> list[str]:
+        return [stage.name for stage in self.stages]
+
+def _error_detail(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return str(exc.detail)
+    return str(exc) or exc.__class__.__name__
+
+def payload_size(value: Any) -> Optional[int]:
+    """Size in bytes of a stage payload (UTF-8 text, bytes or an upload), None if unknown."""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, StarletteUploadFile):  # also covers fastapi.UploadFile
+        if value.size is not None:
+            return value.size
+        try:
+            position = value.file.tell()
+            value.file.seek(0, 2)
+            size = value.file.tell()
+            value.file.seek(position)
+            return size
+        except Exception:
+            return None
+    return None
+
+def _sum_sizes(values: Iterable[Any]) -> Optional[int]:
+    sizes = [payload_size(v) for v in values]
+    return None if not sizes or None in sizes else sum(sizes)
+
+StageCallback = Callable[[Stage, StageResult], Awaitable[None]]
+
+async def run_plan(
+    plan: PipelinePlan,
+    initial: Dict[str, Any],
+    on_stage: Optional[StageCallback] = None,
+    results: Optional[Dict[str, StageResult]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, StageResult]]:
+    """
+    Execute a plan, running every stage whose inputs are ready concurrently.
+    on_stage, if given, is awaited with each StageResult as soon as it exists
+    (used to stream intermediate results). results, if given, is filled in
+    as stages finish, so a failed run still reports what it timed.
+
+    Returns:
+        (all data keys, stage results by stage name). The first failure of a
+        critical stage cancels the stages still running and is re-raised;
+        a non-critical failure is recorded and its dependents are skipped.
+        When the request deadline runs out, running stages are cancelled,
+        the rest are skipped (timed_out=True) and the partial data returned.
+    """
+    data = dict(initial)
+    results = {} if results is None else results
+    pending = list(plan.stages)
+    running: Dict[asyncio.Task, Stage] = {}
+    failed_keys: set[str] = set()
+    started: Dict[str, float] = {}
+    finished: Dict[str, float] = {}
+    input_bytes: Dict[str, Optional[int]] = {}
+
+    async def timed(stage: Stage, args: list) -> Any:
+        started[stage.name] = time.monotonic()
+        outcome = "error"
+        try:
+            with span(f"stage {stage.name}", stage=stage.name, language=stage.language,
+                      input_bytes=input_bytes.get(stage.name)) as trace_span:
+                value = await stage.run(*args)
+                if trace_span:
+                    trace_span.set("output_bytes", payload_size(value))
+            outcome = "ok"
+            return value
+        finally:
+            finished[stage.name] = time.monotonic()
+            # Per-target stages ('mt:hi') share the 'mt' series
+            metrics.stage_duration.labels(stage.name.split(":")[0], outcome).observe(
+                finished[stage.name] - started[stage.name]
+            )
+
+    def stage_result(stage: Stage, value: Any, error: Optional[str] = None, timed_out: bool = False) -> StageResult:
+        return StageResult(
+            stage.name, stage.output, value, error, timed_out,
+            started_at=started.get(stage.name),
+            finished_at=finished.get(stage.name, time.monotonic() if stage.name in started else None),
+            input_bytes=input_bytes.get(stage.name),
+            output_bytes=payload_size(value) if error is None else None,
+        )
+
+    try:
+        while pending or running:
+            # Skip everything downstream of a failed non-critical stage
+            blocked = [stage for stage in pending if failed_keys.intersection(stage.inputs)]
+            while blocked:
+                for stage in blocked:
+                    pending.remove(stage)
+                    missing = ", ".join(sorted(failed_keys.intersection(stage.inputs)))
+                    results[stage.name] = stage_result(
+                        stage, None, f"Skipped: {missing} unavailable", timed_out=deadline_expired()
+                    )
+                    failed_keys.add(stage.output)
+                    if on_stage:
+                        await on_stage(stage, results[stage.name])
+                blocked = [stage for stage in pending if failed_keys.intersection(stage.inputs)]
+            if not pending and not running:
+                break
+
+            ready = [stage for stage in pending if all(key in data for key in stage.inputs)]
+            for stage in ready:
+                pending.remove(stage)
+                args = [data[key] for key in stage.inputs]
+                input_bytes[stage.name] = _sum_sizes(args)
+                task = asyncio.create_task(timed(stage, args))
+                running[task] = stage
+            if not running:
+                raise RuntimeError(f"Pipeline stalled; unsatisfied stages: {', '.join(s.name for s in pending)}")
+
+            left = deadline_remaining()
+            done, _ = await asyncio.wait(
+                running,
+                timeout=None if left is None else max(0.0, left),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                # Request deadline reached: stop and report what completed
+                for task, stage in running.items():
+                    task.cancel()
+                    results[stage.name] = stage_result(stage, None, "Deadline exceeded", timed_out=True)
+                for stage in pending:
+                    results[stage.name] = stage_result(stage, None, "Skipped: deadline exceeded", timed_out=True)
+                if on_stage:
+                    for stage in list(running.values()) + pending:
+                        await on_stage(stage, results[stage.name])
+                running.clear()
+                pending.clear()
+                break
+
+            for task in done:
+                stage = running.pop(task)
+                try:
+                    value = task.result()
+                except DeadlineExceeded as exc:
+                    results[stage.name] = stage_result(stage, None, str(exc), timed_out=True)
+                    failed_keys.add(stage.output)
+                except Exception as exc:
+                    results[stage.name] = stage_result(stage, None, _error_detail(exc))
+                    if stage.critical:
+                        raise
+                    failed_keys.add(stage.output)
+                else:
+                    data[stage.output] = value
+                    results[stage.name] = stage_result(stage, value)
+                if on_stage:
+                    await on_stage(stage, results[stage.name])
+    finally:
+        for task in running:
+            task.cancel()
+
+    return data, results
+
+# ==================== STAGES ====================
+
+def validate_stage(input_type: InputType) -> Stage:
+    """Check an audio/image upload against the ASR/OCR limits (size, type, duration)"""
+    ensure = ensure_asr_constraints if input_type == InputType.AUDIO else ensure_ocr_constraints
+    async def run(upload: UploadFile) -> UploadFile:
+        ensure(upload)
+        return upload
+    return Stage("validate", ("input",), "upload", run)
+
+def asr_stage(language: str) -> Stage:
+    """Audio to text in the source language (after validate_stage)"""
+    async def run(audio_file: UploadFile) -> str:
+        return await asr_transcribe(audio_file, language=language, validated=True)
+    return Stage("asr", ("upload",), "source_text", run, result_key="asr_text", language=language)
+
+def ocr_stage(language: str) -> Stage:
+    """Image to text in the source language (after validate_stage)"""
+    async def run(image_file: UploadFile) -> str:
+        return await ocr_extract(image_file, language=language, validated=True)
+    return Stage("ocr", ("upload",), "source_text", run, result_key="ocr_text", language=language)
+
+def mt_stage(
+    source_lang: str,
+    target_lang: str,
+    text_key: str = "source_text",
+    name: str = "mt",
+    output: str = "target_text",
+    critical: bool = True,
+) -> Stage:
+    """Translate from source to target language"""
+    async def run(text: str) -> str:
+        return await mt_translate(text, source_lang, target_lang)
+    return Stage(
+        name, (text_key,), output, run, result_key="translated_text", critical=critical,
+        language=f"{source_lang}-{target_lang}",
+    )
+
+def tts_stage(
+    language: str,
+    gender: Optional[str],
+    text_key: str = "target_text",
+    name: str = "tts",
+    output: str = "audio_url",
+    critical: bool = True,
+) -> Stage:
+    """Text to speech in the given language"""
+    async def run(text: str) -> str:
+        return await tts_synthesize(text, gender, language=language)
+    return Stage(name, (text_key,), output, run, result_key="tts_audio_url", critical=critical, language=language)
+
+# ==================== PLAN DEFINITIONS ====================
+#
+# One plan per input/output combination. Uploads are checked first
+# ('upload'), text is 'source_text' (given, or recognised by ASR/OCR),
+# translated text 'target_text' and synthesized audio 'audio_url'. Each
+# stage needs the previous one's output, so these plans are chains;
+# concurrent branches come from fanning out (build_multi_target_plan).
+
+def _translate(stages: list[Stage], source_lang: str, target_lang: str) -> str:
+    """Append MT if the languages differ; returns the key holding the target-language text."""
+    if source_lang == target_lang:
+        return "source_text"
+    stages.append(mt_stage(source_lang, target_lang))
+    return "target_text"
+
+def text_to_text_plan(source_lang: str, target_lang: str, gender: Optional[str] = None) -> PipelinePlan:
+    """Text → Text (MT only if different languages)"""
+    stages: list[Stage] = []
+    text_key = _translate(stages, source_lang, target_lang)
+    return PipelinePlan(stages, text_key, ("input", "source_text"))
+
+def text_to_audio_plan(source_lang: str, target_lang: str, gender: Optional[str] = "female") -> PipelinePlan:
+    """Text → Audio (MT + TTS, or just TTS if same language)"""
+    stages: list[Stage] = []
+    stages.append(tts_stage(target_lang, gender, _translate(stages, source_lang, target_lang)))
+    return PipelinePlan(stages, "audio_url", ("input", "source_text"))
+
+def audio_to_text_plan(source_lang: str, target_lang: str, gender: Optional[str] = None) -> PipelinePlan:
+    """Audio → Text (ASR + MT, or just ASR if same language)"""
+    stages = [validate_stage(InputType.AUDIO), asr_stage(source_lang)]
+    text_key = _translate(stages, source_lang, target_lang)
+    return PipelinePlan(stages, text_key)
+
+def audio_to_audio_plan(source_lang: str, target_lang: str, gender: Optional[str] = "female") -> PipelinePlan:
+    """Audio → Audio (ASR + MT + TTS, or ASR + TTS if same language)"""
+    stages = [validate_stage(InputType.AUDIO), asr_stage(source_lang)]
+    stages.append(tts_stage(target_lang, gender, _translate(stages, source_lang, target_lang)))
+    return PipelinePlan(stages, "audio_url")
+
+def image_to_text_plan(source_lang: str, target_lang: str, gender: Optional[str] = None) -> PipelinePlan:
+    """Image → Text (OCR + MT, or just OCR if same language)"""
+    stages = [validate_stage(InputType.IMAGE), ocr_stage(source_lang)]
+    text_key = _translate(stages, source_lang, target_lang)
+    return PipelinePlan(stages, text_key)
+
+def image_to_audio_plan(source_lang: str, target_lang: str, gender: Optional[str] = "female") -> PipelinePlan:
+    """Image → Audio (OCR + MT + TTS, or OCR + TTS if same language)"""
+    stages = [validate_stage(InputType.IMAGE), ocr_stage(source_lang)]
+    stages.append(tts_stage(target_lang, gender, _translate(stages, source_lang, target_lang)))
+    return PipelinePlan(stages, "audio_url")
+
+PLANS: Dict[Tuple[InputType, OutputType], Callable[..., PipelinePlan]] = {
+    (InputType.TEXT, OutputType.TEXT): text_to_text_plan,
+    (InputType.TEXT, OutputType.AUDIO): text_to_audio_plan,
+    (InputType.AUDIO, OutputType.TEXT): audio_to_text_plan,
+    (InputType.AUDIO, OutputType.AUDIO): audio_to_audio_plan,
+    (InputType.IMAGE, OutputType.TEXT): image_to_text_plan,
+    (InputType.IMAGE, OutputType.AUDIO): image_to_audio_plan,
+}
+
+def build_plan(
+    input_type: InputType,
+    output_type: OutputType,
+    source_lang: str,
+    target_lang: str,
+    gender: Optional[str] = "female"
+) -> PipelinePlan:
+    """The plan definition for an input/output type and language combination."""
+    return PLANS[(InputType(input_type), OutputType(output_type))](source_lang, target_lang, gender)
+
+async def execute_plan(
+    plan: PipelinePlan,
+    input_data: Union[str, UploadFile],
+    result: PipelineResult,
+    on_stage: Optional[StageCallback] = None,
+) -> PipelineResult:
+    """Run a plan and record its outputs on result."""
+    initial = {key: input_data for key in plan.initial_keys}
+    _track(result)
+    result.started_at = time.monotonic()
+    try:
+        with span("pipeline", operations=",".join(plan.operations),
+                  source_language=result.source_language, target_language=result.target_language):
+            data, _ = await run_plan(plan, initial, on_stage, result.stage_results)
+    finally:
+        result.finished_at = time.monotonic()
+
+    result.operations_performed = plan.operations
+    for stage in plan.stages:
+        stage_result = result.stage_results[stage.name]
+        if stage_result.ok and stage.result_key:
+            result.intermediate_results[stage.result_key] = stage_result.value
+        elif stage_result.timed_out:
+            result.skipped_operations.append(stage.name)
+    result.deadline_exceeded = bool(result.skipped_operations)
+    result.final_output = data.get(plan.final_output)
+    return result
 
 async def execute_pipeline(
     input_data: Union[str, UploadFile],
@@ -77,7 +509,8 @@ async def execute_pipeline(
     output_type: OutputType,
     source_language: str,
     target_language: str,
-    gender: Optional[str] = "female"
+    gender: Optional[str] = "female",
+    on_stage: Optional[StageCallback] = None
 ) -> PipelineResult:
     """
     Execute the complete pipeline based on input/output requirements.
@@ -89,6 +522,7 @@ async def execute_pipeline(
         source_language: Language of the input
         target_language: Desired output language
         gender: Voice gender for TTS (if needed)
+        on_stage: Optional async callback invoked as each stage finishes
     
     Returns:
         PipelineResult with final output and metadata
@@ -104,57 +538,133 @@ async def execute_pipeline(
     result.input_type = input_type.value
     result.output_type = output_type.value
     
-    # Determine required operations
-    operations = determine_required_operations(input_type, output_type, source_lang, target_lang)
-    result.operations_performed = operations
-    
-    # Start with input data
-    current_data = input_data
-    current_lang = source_lang
-    
-    # Execute each operation in sequence
-    for operation in operations:
-        if operation == 'asr':
-            # Audio to text in source language
-            current_data = await asr_transcribe(current_data, language=current_lang)
-            result.intermediate_results['asr_text'] = current_data
-            
-        elif operation == 'ocr':
-            # Image to text in source language
-            current_data = await ocr_extract(current_data, language=current_lang) 
-            result.intermediate_results['ocr_text'] = current_data
-            
-        elif operation == 'mt':
-            # Translate from source to target language
-            current_data = await mt_translate(current_data, source_lang, target_lang)
-            result.intermediate_results['translated_text'] = current_data
-            current_lang = target_lang  # Language has changed
-            
-        elif operation == 'tts':
-            # Text to speech in current language (should be target language by now)
-            current_data = await tts_synthesize(current_data, gender, language=current_lang)
-            result.intermediate_results['tts_audio_url'] = current_data
-    
-    # Set final output
-    result.final_output = current_data
-    
-    return result
+    plan = build_plan(input_type, output_type, source_lang, target_lang, gender)
+    return await execute_plan(plan, input_data, result, on_stage)
+
+# ==================== MULTI-TARGET FAN-OUT ====================
 
-# Helper functions for common pipelines
+class MultiTargetResult:
+    """One input recognised once and fanned out to several target languages."""
+    def __init__(self):
+        self.source_language: str = ""
+        self.target_languages: list[str] = []
+        self.input_type: str = ""
+        self.output_type: str = ""
+        self.source_text: str = ""
+        self.results: Dict[str, PipelineResult] = {}
+        self.errors: Dict[str, str] = {}
+
+def build_multi_target_plan(
+    input_type: InputType,
+    output_type: OutputType,
+    source_lang: str,
+    target_langs: list[str],
+    gender: Optional[str] = "female"
+) -> PipelinePlan:
+    """
+    Validation and ASR/OCR once, then a non-critical MT (+TTS) branch per target language.
+    Branch keys are suffixed with the language, e.g. 'mt:hi' -> 'target_text:hi'.
+    """
+    stages: list[Stage] = []
+    initial_keys = ["input"]
+    if input_type == InputType.AUDIO:
+        stages += [validate_stage(input_type), asr_stage(source_lang)]
+    elif input_type == InputType.IMAGE:
+        stages += [validate_stage(input_type), ocr_stage(source_lang)]
+    else:
+        initial_keys.append("source_text")
+
+    for lang in target_langs:
+        text_key = "source_text"
+        if lang != source_lang:
+            stages.append(mt_stage(source_lang, lang, text_key, name=f"mt:{lang}", output=f"target_text:{lang}", critical=False))
+            text_key = f"target_text:{lang}"
+        if output_type == OutputType.AUDIO:
+            stages.append(tts_stage(lang, gender, text_key, name=f"tts:{lang}", output=f"audio_url:{lang}", critical=False))
+
+    return PipelinePlan(stages, "source_text", initial_keys)
+
+async def execute_multi_target_pipeline(
+    input_data: Union[str, UploadFile],
+    input_type: InputType,
+    output_type: OutputType,
+    source_language: str,
+    target_languages: list[str],
+    gender: Optional[str] = "female"
+) -> MultiTargetResult:
+    """
+    Execute one input against several target languages.
+
+    ASR/OCR runs once (its failure fails the request); MT and TTS run
+    concurrently per target and a failing target only reports its own error.
+    """
+    source_lang = validate_language(source_language)
+    targets: list[str] = []
+    for lang in target_languages:
+        lang = validate_language(lang)
+        if lang not in targets:
+            targets.append(lang)
+    if not targets:
+        raise ValueError("At least one target language is required")
+
+    plan = build_multi_target_plan(input_type, output_type, source_lang, targets, gender)
+    # The whole fan-out, for Server-Timing if it fails
+    run = PipelineResult()
+    _track(run)
+    run.started_at = time.monotonic()
+    try:
+        with span("pipeline", operations=",".join(plan.operations),
+                  source_language=source_lang, target_language=",".join(targets)):
+            data, stage_results = await run_plan(plan, {key: input_data for key in plan.initial_keys}, results=run.stage_results)
+    finally:
+        run.finished_at = time.monotonic()
+    started_at, finished_at = run.started_at, run.finished_at
+
+    multi = MultiTargetResult()
+    multi.source_language = source_lang
+    multi.target_languages = targets
+    multi.input_type = input_type.value
+    multi.output_type = output_type.value
+    multi.source_text = data.get("source_text", "")
+
+    shared = [stage for stage in plan.stages if stage.name in ("validate", "asr", "ocr")]
+    for lang in targets:
+        branch = [stage for stage in plan.stages if stage.name.endswith(f":{lang}")]
+        result = PipelineResult()
+        result.source_language = source_lang
+        result.target_language = lang
+        result.input_type = input_type.value
+        result.output_type = output_type.value
+        result.started_at, result.finished_at = started_at, finished_at
+        result.operations_performed = [stage.name.split(":")[0] for stage in shared + branch]
+        for stage in shared + branch:
+            stage_result = stage_results[stage.name]
+            result.stage_results[stage.name] = stage_result
+            if stage.result_key and stage_result.ok:
+                result.intermediate_results[stage.result_key] = stage_result.value
+            elif not stage_result.ok and lang not in multi.errors:
+                multi.errors[lang] = f"{stage.name.split(':')[0]}: {stage_result.error}"
+
+        final_key = "source_text"
+        if branch:
+            final_key = branch[-1].output
+        result.skipped_operations = [s.name.split(":")[0] for s in shared + branch if stage_results[s.name].timed_out]
+        result.deadline_exceeded = bool(result.skipped_operations)
+        if lang not in multi.errors:
+            result.final_output = data[final_key]
+        multi.results[lang] = result
+
+    return multi
+
+# Helper functions for common pipelines: each runs its plan definition
 
 async def text_to_text_pipeline(
     text: str,
     source_language: str, 
     target_language: str
 ) -> PipelineResult:
-    """Text → Text pipeline (MT only if different languages)"""
-    return await execute_pipeline(
-        input_data=text,
-        input_type=InputType.TEXT,
-        output_type=OutputType.TEXT,
-        source_language=source_language,
-        target_language=target_language
-    )
+    """Text → Text pipeline (text_to_text_plan)"""
+    return await execute_pipeline(text, InputType.TEXT, OutputType.TEXT, source_language, target_language)
 
 async def text_to_audio_pipeline(
     text: str,
@@ -162,29 +672,16 @@ async def text_to_audio_pipeline(
     target_language: str, 
     gender: str = "female"
 ) -> PipelineResult:
-    """Text → Audio pipeline (MT + TTS, or just TTS if same language)"""
-    return await execute_pipeline(
-        input_data=text,
-        input_type=InputType.TEXT,
-        output_type=OutputType.AUDIO,
-        source_language=source_language,
-        target_language=target_language,
-        gender=gender
-    )
+    """Text → Audio pipeline (text_to_audio_plan)"""
+    return await execute_pipeline(text, InputType.TEXT, OutputType.AUDIO, source_language, target_language, gender)
 
 async def audio_to_text_pipeline(
     audio_file: UploadFile,
     source_language: str,
     target_language: str
 ) -> PipelineResult:
-    """Audio → Text pipeline (ASR + MT, or just ASR if same language)"""
-    return await execute_pipeline(
-        input_data=audio_file,
-        input_type=InputType.AUDIO,
-        output_type=OutputType.TEXT,
-        source_language=source_language,
-        target_language=target_language
-    )
+    """Audio → Text pipeline (audio_to_text_plan)"""
+    return await execute_pipeline(audio_file, InputType.AUDIO, OutputType.TEXT, source_language, target_language)
 
 async def audio_to_audio_pipeline(
     audio_file: UploadFile,
@@ -192,29 +689,16 @@ async def audio_to_audio_pipeline(
     target_language: str,
     gender: str = "female"
 ) -> PipelineResult:
-    """Audio → Audio pipeline (ASR + MT + TTS, or ASR + TTS if same language)"""
-    return await execute_pipeline(
-        input_data=audio_file,
-        input_type=InputType.AUDIO,
-        output_type=OutputType.AUDIO,
-        source_language=source_language,
-        target_language=target_language,
-        gender=gender
-    )
+    """Audio → Audio pipeline (audio_to_audio_plan)"""
+    return await execute_pipeline(audio_file, InputType.AUDIO, OutputType.AUDIO, source_language, target_language, gender)
 
 async def image_to_text_pipeline(
     image_file: UploadFile,
     source_language: str,
     target_language: str
 ) -> PipelineResult:
-    """Image → Text pipeline (OCR + MT, or just OCR if same language)"""
-    return await execute_pipeline(
-        input_data=image_file,
-        input_type=InputType.IMAGE,
-        output_type=OutputType.TEXT,
-        source_language=source_language,
-        target_language=target_language
-    )
+    """Image → Text pipeline (image_to_text_plan)"""
+    return await execute_pipeline(image_file, InputType.IMAGE, OutputType.TEXT, source_language, target_language)
 
 async def image_to_audio_pipeline(
     image_file: UploadFile,
@@ -222,12 +706,5 @@ async def image_to_audio_pipeline(
     target_language: str,
     gender: str = "female"
 ) -> PipelineResult:
-    """Image → Audio pipeline (OCR + MT + TTS, or OCR + TTS if same language)"""
-    return await execute_pipeline(
-        input_data=image_file,
-        input_type=InputType.IMAGE,
-        output_type=OutputType.AUDIO,
-        source_language=source_language,
-        target_language=target_language,
-        gender=gender
-    )
\ No newline at end of file
+    """Image → Audio pipeline (image_to_audio_plan)"""
+    return await execute_pipeline(image_file, InputType.IMAGE, OutputType.AUDIO, source_language, target_language, gender)
@@ -0,0 +1,223 @@
+"""
+Streaming Service for Sentence-Level MT/TTS Pipelining
+
+Gemini output is streamed token by token. Instead of waiting for the whole
+reply and then translating/speaking it as one blob, the text is cut into
+sentences as they complete and each sentence goes through MT (and optionally
+TTS) while the model is still generating the rest.
+
+Events produced (in order per kind):
+- original:   {"index": 0, "text": "..."}   as soon as a sentence is complete
+- translated: {"index": 0, "text": "..."}   when MT for that sentence finishes
+- audio:      {"index": 0, "url": "..."}    when TTS for that sentence finishes
+- error:      {"index": 0, "stage": "mt", "detail": "..."}
+- done:       {"text": "...", "translated": "..." | None}
+"""
+
+import asyncio
+import json
+import re
+from typing import AsyncIterator, Optional, Tuple, Dict, Any
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from .bhashini import mt_translate, tts_synthesize
+from ..config import settings
+from ..utils.validators import count_words, MAX_MT_WORDS, MAX_TTS_WORDS
+
+# Sentence boundary: terminal punctuation (incl. Devanagari danda) followed by whitespace, or a line break
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?।॥])\s+|\n+")
+
+StreamEvent = Tuple[str, Dict[str, Any]]
+
+
+class SentenceSplitter:
+    """Incrementally cut streamed text into sentences no longer than max_words."""
+
+    def __init__(self, max_words: int = MAX_MT_WORDS):
+        self.max_words = max_words
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> list[str]:
+        self._buffer += chunk
+        parts = _SENTENCE_END_RE.split(self._buffer)
+        # The last part may still be growing
+        self._buffer = parts.pop()
+        return self._finalize(parts)
+
+    def flush(self) -> list[str]:
+        rest, self._buffer = self._buffer, ""
+        return self._finalize([rest])
+
+    def _finalize(self, parts: list[str]) -> list[str]:
+        sentences = []
+        for part in parts:
+            part = part.strip()
+            if not part:
+                continue
+            if count_words(part) <= self.max_words:
+                sentences.append(part)
+                continue
+            # Over-long sentence: split on whitespace so each piece fits the MT/TTS word limits
+            piece: list[str] = []
+            for token in part.split():
+                if piece and count_words(" ".join(piece + [token])) > self.max_words:
+                    sentences.append(" ".join(piece))
+                    piece = []
+                piece.append(token)
+            if piece:
+                sentences.append(" ".join(piece))
+        return sentences
+
+
+def _error_detail(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return str(exc.detail)
+    return str(exc) or exc.__class__.__name__
+
+
+async def stream_with_translation(
+    tokens: AsyncIterator[str],
+    target_lang: Optional[str],
+    speak: bool = False,
+    gender: Optional[str] = "female",
+    source_lang: str = "en",
+) -> AsyncIterator[StreamEvent]:
+    """
+    Pipeline streamed text through MT and TTS one sentence at a time.
+
+    Args:
+        tokens: Async iterator of generated text chunks
+        target_lang: Language to translate into (no MT if empty or same as source)
+        speak: Whether to synthesize audio for every sentence
+        gender: Voice gender for TTS
+        source_lang: Language of the generated text
+
+    Yields:
+        (event_name, payload) tuples, see module docstring
+    """
+    translate = bool(target_lang) and target_lang != source_lang
+    output_lang = target_lang if translate else source_lang
+    splitter = SentenceSplitter(MAX_TTS_WORDS if speak else MAX_MT_WORDS)
+    limit = asyncio.Semaphore(max(1, settings.STREAM_MAX_CONCURRENCY))
+
+    events: asyncio.Queue = asyncio.Queue()
+    mt_queue: asyncio.Queue = asyncio.Queue()
+    tts_queue: asyncio.Queue = asyncio.Queue()
+    originals: list[str] = []
+    translations: dict[int, str] = {}
+    finished = object()
+
+    async def translate_sentence(sentence: str) -> str:
+        if not translate:
+            return sentence
+        async with limit:
+            return await mt_translate(sentence, source_lang, target_lang)
+
+    async def speak_sentence(mt_task: asyncio.Task) -> Optional[str]:
+        try:
+            text = await mt_task
+        except Exception:
+            # Already reported by the MT emitter
+            return None
+        async with limit:
+            return await tts_synthesize(text, gender, language=output_lang)
+
+    async def produce() -> None:
+        index = 0
+
+        async def submit(sentence: str) -> None:
+            nonlocal index
+            originals.append(sentence)
+            await events.put(("original", {"index": index, "text": sentence}))
+            mt_task = asyncio.create_task(translate_sentence(sentence))
+            await mt_queue.put((index, mt_task))
+            if speak:
+                await tts_queue.put((index, asyncio.create_task(speak_sentence(mt_task))))
+            index += 1
+
+        try:
+            async for chunk in tokens:
+                for sentence in splitter.feed(chunk):
+                    await submit(sentence)
+            for sentence in splitter.flush():
+                await submit(sentence)
+        except Exception as exc:
+            await events.put(("error", {"index": index, "stage": "generate", "detail": _error_detail(exc)}))
+        finally:
+            await mt_queue.put(None)
+            await tts_queue.put(None)
+            await events.put(finished)
+
+    async def emit_translations() -> None:
+        while (item := await mt_queue.get()) is not None:
+            index, task = item
+            try:
+                text = await task
+            except Exception as exc:
+                await events.put(("error", {"index": index, "stage": "mt", "detail": _error_detail(exc)}))
+                continue
+            if translate:
+                translations[index] = text
+                await events.put(("translated", {"index": index, "text": text}))
+        await events.put(finished)
+
+    async def emit_audio() -> None:
+        while (item := await tts_queue.get()) is not None:
+            index, task = item
+            try:
+                url = await task
+            except Exception as exc:
+                await events.put(("error", {"index": index, "stage": "tts", "detail": _error_detail(exc)}))
+                continue
+            if url is not None:
+                await events.put(("audio", {"index": index, "url": url}))
+        await events.put(finished)
+
+    workers = [
+        asyncio.create_task(produce()),
+        asyncio.create_task(emit_translations()),
+        asyncio.create_task(emit_audio()),
+    ]
+    try:
+        remaining = len(workers)
+        while remaining:
+            event = await events.get()
+            if event is finished:
+                remaining -= 1
+                continue
+            yield event
+
+        yield ("done", {
+            "text": "\n".join(originals),
+            "translated": "\n".join(translations[i] for i in sorted(translations)) if translate else None,
+        })
+    finally:
+        # Client went away or we are done: stop any outstanding work
+        for worker in workers:
+            worker.cancel()
+        for queue in (mt_queue, tts_queue):
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def sse_response(events: AsyncIterator[StreamEvent]) -> StreamingResponse:
+    """Wrap an event iterator in a text/event-stream response."""
+
+    async def body() -> AsyncIterator[str]:
+        async for event, data in events:
+            yield format_sse(event, data)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,142 @@
+"""
+Priority-Aware Scheduling of Upstream Calls
+
+Every Bhashini endpoint URL gets its own scheduler with a fixed number of
+concurrent call slots (UPSTREAM_MAX_CONCURRENCY). When all slots are busy,
+callers queue by priority class and are served by weighted fair queueing:
+each queued call gets a virtual finish tag of
+
+    max(virtual_time, last_finish[class]) + 1 / weight[class]
+
+and the call with the smallest tag gets the next free slot, so under
+contention interactive, standard and bulk calls share the endpoint in
+proportion to UPSTREAM_CLASS_WEIGHTS.
+
+Bulk calls are additionally limited to spare capacity: they are only started
+while no interactive call is waiting, and never hold the last
+UPSTREAM_INTERACTIVE_RESERVED slots, so a burst of bulk work cannot delay an
+interactive caller by more than one in-flight call.
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+from ..config import settings
+from ..utils.priority import BULK, INTERACTIVE, PRIORITY_CLASSES, current_priority
+
+
+class EndpointScheduler:
+    def __init__(self, capacity: int, weights: dict[str, float], reserved: int = 1):
+        self.capacity = max(1, capacity)
+        self.weights = {cls: max(weights.get(cls, 1.0), 1e-6) for cls in PRIORITY_CLASSES}
+        self.reserved = max(0, reserved)
+        # Bulk may only start while fewer than capacity - reserved calls of any class are in
+        # flight (but can always start on an idle endpoint, or it would never run)
+        self.bulk_capacity = max(1, self.capacity - self.reserved)
+
+        self.in_flight = {cls: 0 for cls in PRIORITY_CLASSES}
+        self.completed = {cls: 0 for cls in PRIORITY_CLASSES}
+        self._queues: dict[str, deque] = {cls: deque() for cls in PRIORITY_CLASSES}
+        self._last_finish = {cls: 0.0 for cls in PRIORITY_CLASSES}
+        self._virtual_time = 0.0
+
+    @property
+    def total_in_flight(self) -> int:
+        return sum(self.in_flight.values())
+
+    def _eligible(self, cls: str) -> bool:
+        if self.total_in_flight >= self.capacity:
+            return False
+        if cls == BULK:
+            return not self._queues[INTERACTIVE] and self.total_in_flight < self.bulk_capacity
+        return True
+
+    def _start(self, cls: str) -> None:
+        self.in_flight[cls] += 1
+
+    def _dispatch(self) -> None:
+        while True:
+            heads = [
+                (queue[0][0], cls) for cls, queue in self._queues.items()
+                if queue and self._eligible(cls)
+            ]
+            if not heads:
+                return
+            finish, cls = min(heads)
+            _, waiter = self._queues[cls].popleft()
+            if waiter.done():
+                continue
+            self._virtual_time = finish
+            self._start(cls)
+            waiter.set_result(None)
+
+    async def acquire(self, cls: str) -> None:
+        if not any(self._queues.values()) and self._eligible(cls):
+            self._start(cls)
+            return
+
+        finish = max(self._virtual_time, self._last_finish[cls]) + 1.0 / self.weights[cls]
+        self._last_finish[cls] = finish
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (finish, waiter)
+        self._queues[cls].append(entry)
+        # A free slot may be usable even though other classes are waiting for theirs
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release(cls)
+            else:
+                try:
+                    self._queues[cls].remove(entry)
+                except ValueError:
+                    pass
+                self._dispatch()
+            raise
+
+    def release(self, cls: str) -> None:
+        self.in_flight[cls] -= 1
+        self.completed[cls] += 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "reserved": self.reserved,
+            "in_flight": dict(self.in_flight),
+            "queued": {cls: len(queue) for cls, queue in self._queues.items()},
+            "completed": dict(self.completed),
+        }
+
+
+_schedulers: dict[str, EndpointScheduler] = {}
+
+
+def scheduler_for(url: str) -> EndpointScheduler:
+    scheduler = _schedulers.get(url)
+    if scheduler is None:
+        scheduler = _schedulers[url] = EndpointScheduler(
+            settings.UPSTREAM_MAX_CONCURRENCY,
+            settings.UPSTREAM_CLASS_WEIGHTS,
+            settings.UPSTREAM_INTERACTIVE_RESERVED,
+        )
+    return scheduler
+
+
+@asynccontextmanager
+async def upstream_slot(url: str):
+    """Hold one of the endpoint's call slots, queued by the current priority class."""
+    cls = current_priority()
+    scheduler = scheduler_for(url)
+    await scheduler.acquire(cls)
+    try:
+        yield
+    finally:
+        scheduler.release(cls)
+
+
+def scheduler_stats() -> dict:
+    return {url: scheduler.stats() for url, scheduler in _schedulers.items()}
@@ -0,0 +1,174 @@
+"""
+Rolling Latency and Health Statistics per Upstream Endpoint
+
+Every Bhashini call is recorded against its endpoint URL: latency into a
+log-bucketed histogram (the HDR-histogram idea: bucket bounds grow by a
+constant factor, so every percentile is accurate to ~1% relative error
+whatever the range, and a sketch is a few hundred integer counters), plus
+success/error counts and the time of the last success and last error.
+
+Histograms are kept per time slice of UPSTREAM_STATS_SLICE seconds. A
+sliding window (each of UPSTREAM_STATS_WINDOWS, e.g. 1, 5 and 15 minutes)
+is answered by merging the slices it covers; merging is adding bucket
+counts, so sketches from several slices (or several processes) combine
+exactly.
+
+Calls cut off by the request deadline are recorded as timeouts with the
+time they ran, so a hung endpoint shows up as failing (not idle) and the
+slowest calls stay in the percentiles. Calls cancelled because a sibling
+stage failed are not recorded: they say nothing about the endpoint.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Iterable, Optional
+
+from ..config import settings
+
+# Bucket bounds grow by GAMMA: a value reported for a bucket is within ~1% of every value in it
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+MIN_MS = 0.01  # smaller values share the lowest bucket
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class LatencySketch:
+    """Mergeable latency histogram in milliseconds with ~1% relative error per percentile."""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        index = math.ceil(math.log(max(ms, MIN_MS)) / _LOG_GAMMA)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Midpoint (in relative terms) of (GAMMA^(i-1), GAMMA^i], clamped to what was observed
+                value = 2 * GAMMA ** index / (GAMMA + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @classmethod
+    def merged(cls, sketches: Iterable["LatencySketch"]) -> "LatencySketch":
+        result = cls()
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+
+class _Slice:
+    __slots__ = ("start", "latency", "errors")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.latency = LatencySketch()  # successful and failed calls alike
+        self.errors = 0
+
+
+class EndpointStats:
+    def __init__(self, slice_seconds: float, horizon: float):
+        self.slice_seconds = slice_seconds
+        self.horizon = horizon
+        self.slices: deque[_Slice] = deque()
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[float] = None
+        self.last_error_kind: Optional[str] = None
+
+    def _current(self, now: float) -> _Slice:
+        start = now - now % self.slice_seconds
+        if not self.slices or self.slices[-1].start != start:
+            self.slices.append(_Slice(start))
+        while self.slices and self.slices[0].start <= now - self.horizon - self.slice_seconds:
+            self.slices.popleft()
+        return self.slices[-1]
+
+    def record(self, ms: float, error_kind: Optional[str], now: float) -> None:
+        current = self._current(now)
+        current.latency.add(ms)
+        if error_kind is None:
+            self.last_success = now
+        else:
+            current.errors += 1
+            self.last_error = now
+            self.last_error_kind = error_kind
+
+    def window(self, seconds: float, now: float) -> dict:
+        slices = [s for s in self.slices if s.start > now - seconds - self.slice_seconds]
+        sketch = LatencySketch.merged(s.latency for s in slices)
+        errors = sum(s.errors for s in slices)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value, 1)
+
+        return {
+            "calls": sketch.count,
+            "errors": errors,
+            "error_rate": round(errors / sketch.count, 4) if sketch.count else None,
+            **{f"p{round(q * 100)}_ms": ms(sketch.quantile(q)) for q in PERCENTILES},
+            "max_ms": ms(sketch.max) if sketch.count else None,
+            "mean_ms": ms(sketch.total / sketch.count) if sketch.count else None,
+        }
+
+
+_endpoints: dict[str, EndpointStats] = {}
+
+
+def _horizon() -> float:
+    return max(settings.UPSTREAM_STATS_WINDOWS)
+
+
+def record_call(url: str, seconds: float, error_kind: Optional[str] = None) -> None:
+    """Record one finished call to url (error_kind None means it succeeded)."""
+    stats = _endpoints.get(url)
+    if stats is None:
+        stats = _endpoints[url] = EndpointStats(settings.UPSTREAM_STATS_SLICE, _horizon())
+    stats.record(seconds * 1000, error_kind, time.time())
+
+
+def endpoint_window(url: str, seconds: Optional[float] = None) -> Optional[dict]:
+    """Latency percentiles and error rate for url over the last `seconds` (default: shortest window)."""
+    stats = _endpoints.get(url)
+    if stats is None:
+        return None
+    return stats.window(seconds or min(settings.UPSTREAM_STATS_WINDOWS), time.time())
+
+
+def endpoint_report(url: str) -> dict:
+    """Every configured window plus last success/error for url (empty windows if never called)."""
+    now = time.time()
+    stats = _endpoints.get(url) or EndpointStats(settings.UPSTREAM_STATS_SLICE, _horizon())
+    return {
+        "windows": {f"{int(w)}s": stats.window(w, now) for w in settings.UPSTREAM_STATS_WINDOWS},
+        "last_success": stats.last_success,
+        "last_error": stats.last_error,
+        "last_error_kind": stats.last_error_kind,
+    }
@@ -0,0 +1,118 @@
+"""
+Incremental Voice Activity Detection for Live Speech
+
+Splits a continuous stream of 16-bit mono PCM into utterances on the fly,
+using frame energy (RMS) with a silence hangover:
+
+- A frame above the energy threshold starts (or continues) an utterance.
+- An utterance closes after `silence_ms` of consecutive quiet frames, or
+  when it reaches `max_utterance_s` (kept under the ASR duration limit).
+- Utterances shorter than `min_speech_ms` of voiced audio are dropped as noise.
+
+A short pre-roll of audio before the first voiced frame is kept so word
+onsets are not clipped.
+"""
+
+import io
+import math
+import wave
+from array import array
+from collections import deque
+from typing import Optional
+
+from ..utils.validators import MAX_ASR_SECONDS
+
+BYTES_PER_SAMPLE = 2  # 16-bit PCM
+
+
+def frame_rms(frame: bytes) -> float:
+    samples = array("h", frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(BYTES_PER_SAMPLE)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class UtteranceSegmenter:
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        energy_threshold: float = 500.0,
+        frame_ms: int = 30,
+        silence_ms: int = 600,
+        min_speech_ms: int = 250,
+        pre_roll_ms: int = 200,
+        max_utterance_s: float = MAX_ASR_SECONDS - 1.0,
+    ):
+        self.sample_rate = sample_rate
+        self.energy_threshold = energy_threshold
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * BYTES_PER_SAMPLE
+        self._silence_frames = max(1, silence_ms // frame_ms)
+        self._min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self._max_frames = max(1, int(max_utterance_s * 1000 / frame_ms))
+        self._pre_roll: deque[bytes] = deque(maxlen=max(0, pre_roll_ms // frame_ms))
+
+        self._pending = b""
+        self._frames: list[bytes] = []
+        self._voiced = 0
+        self._quiet_run = 0
+
+    @property
+    def in_utterance(self) -> bool:
+        return bool(self._frames)
+
+    def feed(self, pcm: bytes) -> list[bytes]:
+        """Consume a PCM chunk of any size; return utterances that closed in it."""
+        self._pending += pcm
+        closed = []
+        while len(self._pending) >= self.frame_bytes:
+            frame = self._pending[:self.frame_bytes]
+            self._pending = self._pending[self.frame_bytes:]
+            utterance = self._process_frame(frame)
+            if utterance is not None:
+                closed.append(utterance)
+        return closed
+
+    def flush(self) -> Optional[bytes]:
+        """Close any utterance in progress (end of stream)."""
+        if self._pending and self._frames:
+            self._frames.append(self._pending)
+        self._pending = b""
+        return self._close()
+
+    def _process_frame(self, frame: bytes) -> Optional[bytes]:
+        voiced = frame_rms(frame) >= self.energy_threshold
+        if not self._frames:
+            if not voiced:
+                self._pre_roll.append(frame)
+                return None
+            self._frames = list(self._pre_roll)
+            self._pre_roll.clear()
+
+        self._frames.append(frame)
+        if voiced:
+            self._voiced += 1
+            self._quiet_run = 0
+        else:
+            self._quiet_run += 1
+
+        if self._quiet_run >= self._silence_frames or len(self._frames) >= self._max_frames:
+            return self._close()
+        return None
+
+    def _close(self) -> Optional[bytes]:
+        frames, voiced = self._frames, self._voiced
+        self._frames, self._voiced, self._quiet_run = [], 0, 0
+        if voiced < self._min_speech_frames:
+            return None
+        return b"".join(frames)
@@ -0,0 +1,230 @@
+"""
+Admission control and load shedding.
+
+Requests are sorted into two concurrency pools by path:
+
+- cheap: text -> text work (/unified/text, /mt, /translate)
+- expensive: audio/image processing and LLM calls (/unified/audio,
+  /unified/image, /speech, /asr, /tts, /ocr, /image, /itinerary, /chat,
+  /summarize)
+
+/unified/text also synthesizes speech when the JSON body asks for
+output_type "audio", so for that path the (small) body is read first and
+audio-output requests go to the expensive pool.
+
+Each pool admits up to N requests at once and lets a bounded number wait.
+When the wait queue is full, or a request has waited longer than
+ADMISSION_MAX_QUEUE_WAIT (or its deadline), it is rejected immediately with
+503 and a Retry-After estimate, so admitted requests keep bounded latency
+instead of everyone slowing down together.
+"""
+
+import asyncio
+import json
+import math
+import time
+from typing import Optional
+
+from ..config import settings
+from . import metrics
+from .deadline import remaining as deadline_remaining
+
+CHEAP_PREFIXES = ("/unified/text", "/mt", "/translate")
+EXPENSIVE_PREFIXES = (
+    "/unified/audio", "/unified/image", "/speech", "/asr", "/tts", "/ocr",
+    "/image", "/itinerary", "/chat", "/summarize",
+)
+# Cheap paths whose cost depends on output_type in the JSON body
+OUTPUT_TYPE_PREFIXES = ("/unified/text",)
+MAX_PEEK_BODY = 64 * 1024  # larger bodies are not parsed, the path's pool applies
+
+
+class Overloaded(Exception):
+    def __init__(self, pool: str, reason: str, retry_after: int):
+        super().__init__(f"{pool} pool {reason}")
+        self.pool = pool
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionPool:
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._service_time_ewma = 1.0
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_wait_timeout = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    def retry_after(self) -> int:
+        # Rough time for the current backlog to drain
+        backlog = self.waiting + self.in_flight
+        return max(1, math.ceil(self._service_time_ewma * backlog / self.max_concurrency))
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns seconds spent queued. Raises Overloaded."""
+        started = time.monotonic()
+        if not self._slots.locked():
+            # Free slot: take it without queueing
+            await self._slots.acquire()
+            return self._admitted(started)
+        if self.waiting >= self.max_queue:
+            self.rejected_queue_full += 1
+            metrics.admission_rejections.labels(self.name, "queue_full").inc()
+            raise Overloaded(self.name, "queue full", self.retry_after())
+
+        max_wait = self.max_wait
+        left = deadline_remaining()
+        if left is not None:
+            max_wait = min(max_wait, max(0.0, left))
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=max_wait)
+        except asyncio.TimeoutError:
+            self.rejected_wait_timeout += 1
+            metrics.admission_rejections.labels(self.name, "wait_timeout").inc()
+            raise Overloaded(self.name, "wait timeout", self.retry_after())
+        finally:
+            self.waiting -= 1
+        return self._admitted(started)
+
+    def _admitted(self, started: float) -> float:
+        queued = time.monotonic() - started
+        self.in_flight += 1
+        self.admitted += 1
+        self.queue_time_total += queued
+        self.queue_time_max = max(self.queue_time_max, queued)
+        metrics.admission_queue_time.labels(self.name).observe(queued)
+        return queued
+
+    def release(self, service_time: float) -> None:
+        self.in_flight -= 1
+        self._service_time_ewma = 0.8 * self._service_time_ewma + 0.2 * service_time
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_wait_timeout": self.rejected_wait_timeout,
+            "queue_time_avg_ms": round(1000 * self.queue_time_total / self.admitted, 2) if self.admitted else 0.0,
+            "queue_time_max_ms": round(1000 * self.queue_time_max, 2),
+            "service_time_ewma_ms": round(1000 * self._service_time_ewma, 2),
+        }
+
+
+pools = {
+    "cheap": AdmissionPool(
+        "cheap",
+        settings.ADMISSION_CHEAP_CONCURRENCY,
+        settings.ADMISSION_CHEAP_QUEUE,
+        settings.ADMISSION_MAX_QUEUE_WAIT,
+    ),
+    "expensive": AdmissionPool(
+        "expensive",
+        settings.ADMISSION_EXPENSIVE_CONCURRENCY,
+        settings.ADMISSION_EXPENSIVE_QUEUE,
+        settings.ADMISSION_MAX_QUEUE_WAIT,
+    ),
+}
+
+
+def matched_prefix(path: str) -> Optional[str]:
+    """The CHEAP/EXPENSIVE prefix path falls under (labels rejections, which never reach routing)."""
+    return next((prefix for prefix in CHEAP_PREFIXES + EXPENSIVE_PREFIXES if path.startswith(prefix)), None)
+
+
+def pool_for(path: str, output_type: Optional[str] = None) -> Optional[AdmissionPool]:
+    if path.startswith(OUTPUT_TYPE_PREFIXES) and (output_type or "").lower() == "audio":
+        return pools["expensive"]
+    if path.startswith(CHEAP_PREFIXES):
+        return pools["cheap"]
+    if path.startswith(EXPENSIVE_PREFIXES):
+        return pools["expensive"]
+    return None
+
+
+async def _read_body(receive) -> list[dict]:
+    """The request's body messages, read up to MAX_PEEK_BODY bytes."""
+    messages, size = [], 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        size += len(message.get("body", b""))
+        if message["type"] != "http.request" or not message.get("more_body") or size > MAX_PEEK_BODY:
+            return messages
+
+
+def _output_type(messages: list[dict]) -> Optional[str]:
+    if messages[-1].get("more_body"):
+        return None
+    try:
+        body = json.loads(b"".join(m.get("body", b"") for m in messages))
+    except ValueError:
+        return None
+    return body.get("output_type") if isinstance(body, dict) else None
+
+
+def admission_stats() -> dict:
+    return {name: pool.stats() for name, pool in pools.items()}
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the admission pools to HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        pool = pool_for(path) if scope["type"] == "http" and settings.ADMISSION_ENABLED else None
+        # Only work-carrying requests are admitted; metadata GETs and CORS preflights pass through
+        if pool is None or scope.get("method") in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        if path.startswith(OUTPUT_TYPE_PREFIXES):
+            # Pick the pool from the body, then hand the buffered messages to the app
+            buffered = await _read_body(receive)
+            pool = pool_for(path, _output_type(buffered))
+            original_receive = receive
+
+            async def receive():
+                return buffered.pop(0) if buffered else await original_receive()
+
+        try:
+            await pool.acquire()
+        except Overloaded as exc:
+            # Read by MetricsMiddleware: a rejected request has no matched route
+            scope["admission_prefix"] = matched_prefix(path)
+            body = json.dumps({"detail": f"Server overloaded ({exc.reason}), retry later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(exc.retry_after).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release(time.monotonic() - started)
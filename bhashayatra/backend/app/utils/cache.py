@@ -0,0 +1,484 @@
+"""
+Caches with a common interface and interchangeable backends.
+
+Every cache supports get / get_many / set / ttl_of / compare_and_set / pop /
+clear, with a per-entry TTL:
+
+- TTLCache: in-process LRU (objects are stored as-is)
+- SQLiteTTLCache: a SQLite file in WAL mode, shared by the worker processes
+  of one host
+- RedisTTLCache: a Redis server (or anything speaking its protocol),
+  shared by every node behind the load balancer
+
+make_cache() picks the backend from CACHE_BACKEND. The shared backends
+serialize values with msgpack, so values must be msgpack-compatible
+(str/bytes/numbers/bool/None, lists and dicts; tuples come back as lists).
+
+A cache is an optimization, so a failing shared backend (Redis down, SQLite
+file locked) never fails a request: lookups count as misses and writes are
+skipped, the error is counted (cache_errors_total) and the backend is left
+alone for RETRY_AFTER seconds so requests do not each wait for a socket
+timeout. Event-loop code uses the async variants (aget, aget_many, aset,
+acompare_and_set), which run the shared backends' blocking I/O in a thread.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+import msgpack
+
+from ..config import settings
+from . import metrics
+from .tracing import add_to_attribute
+
+
+def _pack(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+def _key(key: Hashable) -> str:
+    return json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache whose entries expire after `ttl` seconds.
+
+    Least recently used entries are evicted once `max_entries` is reached.
+    Hit/miss/eviction counters are kept for observability, and exported to
+    /metrics under `name` when one is given; lookups of a named cache are also
+    counted on the current trace span (cache.<name>.hits / .misses).
+    """
+
+    def __init__(self, max_entries: int, ttl: float, name: Optional[str] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = float(ttl)
+        self.name = name
+        self._metric_hits = metrics.cache_hits.labels(name) if name else None
+        self._metric_misses = metrics.cache_misses.labels(name) if name else None
+        self._metric_evictions = metrics.cache_evictions.labels(name) if name else None
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _count(self, hits: int, misses: int) -> None:
+        self.hits += hits
+        self.misses += misses
+        if self.name:
+            if hits:
+                self._metric_hits.inc(hits)
+                add_to_attribute(f"cache.{self.name}.hits", hits)
+            if misses:
+                self._metric_misses.inc(misses)
+                add_to_attribute(f"cache.{self.name}.misses", misses)
+
+    def _evicted(self, n: int) -> None:
+        self.evictions += n
+        if self._metric_evictions:
+            self._metric_evictions.inc(n)
+
+    def _lookup(self, key: Hashable, now: float) -> Optional[tuple[float, Any]]:
+        item = self._data.get(key)
+        if item is not None and item[0] < now:
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._lookup(key, time.monotonic())
+            if item is not None:
+                self._data.move_to_end(key)
+        self._count(int(item is not None), int(item is None))
+        return default if item is None else item[1]
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict:
+        """{key: value} for the keys that are cached; missing keys are left out."""
+        found = {}
+        keys = list(keys)
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                item = self._lookup(key, now)
+                if item is not None:
+                    self._data.move_to_end(key)
+                    found[key] = item[1]
+        self._count(len(found), len(keys) - len(found))
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._evicted(evicted)
+
+    def ttl_of(self, key: Hashable) -> Optional[float]:
+        """Seconds until key expires, or None if it is not cached."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._lookup(key, now)
+        return None if item is None else item[0] - now
+
+    def compare_and_set(self, key: Hashable, expected: Any, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Set key to value only if its current value equals expected (None: key absent).
+
+        Returns False, changing nothing, if another writer got there first;
+        read-modify-write callers retry with the value they read now.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            item = self._lookup(key, time.monotonic())
+            if (None if item is None else item[1]) != expected:
+                return False
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._evicted(evicted)
+        return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ---- async variants, for code running on the event loop ----
+
+    BLOCKING = False  # whether calls do I/O and must run off the event loop
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(fn, *args) if self.BLOCKING else fn(*args)
+
+    async def aget(self, key: Hashable, default: Any = None) -> Any:
+        return await self._run(self.get, key, default)
+
+    async def aget_many(self, keys: Iterable[Hashable]) -> dict:
+        return await self._run(self.get_many, list(keys))
+
+    async def aset(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        await self._run(self.set, key, value, ttl)
+
+    async def acompare_and_set(self, key: Hashable, expected: Any, value: Any, ttl: Optional[float] = None) -> bool:
+        return await self._run(self.compare_and_set, key, expected, value, ttl)
+
+
+class _SharedCache(TTLCache):
+    """
+    Base of the shared backends: backend errors degrade to misses and skipped writes.
+
+    Subclasses implement the underscored operations and set _backend_errors
+    to the exceptions their client raises when the backend is unavailable.
+    """
+
+    BLOCKING = True
+    RETRY_AFTER = 5.0  # seconds a failing backend is bypassed before it is tried again
+
+    def __init__(self, max_entries: int, ttl: float, name: str):
+        super().__init__(max_entries, ttl, name)
+        self._backend_errors: tuple = ()
+        self._metric_errors = metrics.cache_errors.labels(name)
+        self._bypass_until = 0.0
+        self.errors = 0
+
+    def _guarded(self, fallback: Any, operation, *args) -> Any:
+        if self._bypass_until and time.monotonic() < self._bypass_until:
+            return fallback
+        try:
+            result = operation(*args)
+        except self._backend_errors as exc:
+            self.errors += 1
+            self._metric_errors.inc()
+            if not self._bypass_until:
+                print(f"Cache '{self.name}' backend failed, bypassing it for {self.RETRY_AFTER:g}s at a time: {exc!r}")
+            self._bypass_until = time.monotonic() + self.RETRY_AFTER
+            return fallback
+        if self._bypass_until:
+            print(f"Cache '{self.name}' backend recovered")
+            self._bypass_until = 0.0
+        return result
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found = self.get_many([key])
+        return found[key] if key in found else default
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found = self._guarded(None, self._get_many, keys)
+        if found is None:
+            found = {}
+        self._count(len(found), len(keys) - len(found))
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._guarded(None, self._set, key, value, ttl)
+
+    def ttl_of(self, key: Hashable) -> Optional[float]:
+        return self._guarded(None, self._ttl_of, key)
+
+    def compare_and_set(self, key: Hashable, expected: Any, value: Any, ttl: Optional[float] = None) -> bool:
+        # A skipped write reports success: retrying against a failing backend would only add latency
+        return self._guarded(True, self._compare_and_set, key, expected, value, ttl)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._guarded(default, self._pop, key, default)
+
+    def clear(self) -> None:
+        self._guarded(None, self._clear)
+
+    def __len__(self) -> int:
+        return self._guarded(0, self._len)
+
+
+class SQLiteTTLCache(_SharedCache):
+    """
+    TTLCache stored in a SQLite database in WAL mode, shared by every process using the same file.
+
+    With several workers each process would otherwise warm its own copy and
+    the hit rate would drop with the worker count. Reads do not write, so
+    instead of LRU the entries closest to expiry are evicted once the cache
+    grows past `max_entries`; the size is checked every TRIM_EVERY writes.
+    """
+
+    TRIM_EVERY = 64
+    BATCH = 500  # keys per query in get_many (SQLite caps bound parameters)
+
+    def __init__(self, path: str, max_entries: int, ttl: float, name: str):
+        super().__init__(max_entries, ttl, name)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=1.0, isolation_level=None)
+        self._backend_errors = (sqlite3.Error,)
+        self._writes = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "name TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (name, key))"
+            )
+
+    def _get_many(self, keys: list) -> dict:
+        by_text = {_key(key): key for key in keys}
+        texts = list(by_text)
+        found = {}
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(texts), self.BATCH):
+                chunk = texts[i:i + self.BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache_entries WHERE name = ? AND expires_at >= ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    (self.name, now, *chunk),
+                ).fetchall()
+                for text, value in rows:
+                    found[by_text[text]] = _unpack(value)
+        return found
+
+    def _write(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (name, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (self.name, _key(key), _pack(value), time.time() + (self.ttl if ttl is None else ttl)),
+        )
+        self._writes += 1
+        if self._writes % self.TRIM_EVERY == 0:
+            self._trim()
+
+    def _set(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        with self._lock:
+            self._write(key, value, ttl)
+
+    def _ttl_of(self, key: Hashable) -> Optional[float]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM cache_entries WHERE name = ? AND key = ? AND expires_at >= ?",
+                (self.name, _key(key), now),
+            ).fetchone()
+        return None if row is None else row[0] - now
+
+    def _compare_and_set(self, key: Hashable, expected: Any, value: Any, ttl: Optional[float]) -> bool:
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock, so no other process can change the row in between
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM cache_entries WHERE name = ? AND key = ? AND expires_at >= ?",
+                    (self.name, _key(key), time.time()),
+                ).fetchone()
+                if (None if row is None else _unpack(row[0])) != expected:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._write(key, value, ttl)
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+
+    def _trim(self) -> None:
+        self._conn.execute("DELETE FROM cache_entries WHERE name = ? AND expires_at < ?", (self.name, time.time()))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache_entries WHERE name = ?", (self.name,)).fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                "SELECT rowid FROM cache_entries WHERE name = ? ORDER BY expires_at LIMIT ?)",
+                (self.name, excess),
+            )
+            self._evicted(excess)
+
+    def _pop(self, key: Hashable, default: Any) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE name = ? AND key = ?", (self.name, _key(key))
+            ).fetchone()
+            self._conn.execute("DELETE FROM cache_entries WHERE name = ? AND key = ?", (self.name, _key(key)))
+        return default if row is None or row[1] < time.time() else _unpack(row[0])
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE name = ?", (self.name,))
+
+    def _len(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE name = ? AND expires_at >= ?", (self.name, time.time())
+            ).fetchone()
+        return count
+
+
+class RedisTTLCache(_SharedCache):
+    """
+    TTLCache stored in Redis under "<CACHE_KEY_PREFIX><name>:<key>", shared by every node.
+
+    Entries expire through Redis key TTLs and size is bounded by the server's
+    maxmemory policy (e.g. allkeys-lru), so max_entries is not enforced here.
+    get_many is a single MGET round trip and compare_and_set uses
+    WATCH/MULTI/EXEC. Calls are synchronous, like the SQLite backend (use the
+    async variants on the event loop); keep the server close (same host or
+    network) so they stay sub-millisecond.
+
+    `client` is any redis-py compatible client, e.g. fakeredis.FakeRedis()
+    in tests; by default one is created from REDIS_URL.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, name: str, client=None):
+        super().__init__(max_entries, ttl, name)
+        from redis.exceptions import RedisError
+
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self._redis = client
+        self._backend_errors = (RedisError,)
+        self._prefix = f"{settings.CACHE_KEY_PREFIX}{name}:"
+
+    def _rkey(self, key: Hashable) -> str:
+        return self._prefix + _key(key)
+
+    def _ms(self, ttl: Optional[float]) -> int:
+        return max(1, int((self.ttl if ttl is None else ttl) * 1000))
+
+    def _get_many(self, keys: list) -> dict:
+        values = self._redis.mget([self._rkey(key) for key in keys])
+        return {key: _unpack(value) for key, value in zip(keys, values) if value is not None}
+
+    def _set(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        self._redis.set(self._rkey(key), _pack(value), px=self._ms(ttl))
+
+    def _ttl_of(self, key: Hashable) -> Optional[float]:
+        ms = self._redis.pttl(self._rkey(key))
+        return None if ms is None or ms < 0 else ms / 1000
+
+    def _compare_and_set(self, key: Hashable, expected: Any, value: Any, ttl: Optional[float]) -> bool:
+        from redis.exceptions import WatchError
+
+        rkey = self._rkey(key)
+        with self._redis.pipeline() as pipe:
+            try:
+                pipe.watch(rkey)
+                current = pipe.get(rkey)
+                if (None if current is None else _unpack(current)) != expected:
+                    return False
+                pipe.multi()
+                pipe.set(rkey, _pack(value), px=self._ms(ttl))
+                pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    def _pop(self, key: Hashable, default: Any) -> Any:
+        rkey = self._rkey(key)
+        with self._redis.pipeline() as pipe:
+            pipe.get(rkey)
+            pipe.delete(rkey)
+            value, _ = pipe.execute()
+        return default if value is None else _unpack(value)
+
+    def _keys(self) -> Iterable[bytes]:
+        return self._redis.scan_iter(match=self._prefix + "*", count=500)
+
+    def _clear(self) -> None:
+        batch = []
+        for rkey in self._keys():
+            batch.append(rkey)
+            if len(batch) >= 500:
+                self._redis.delete(*batch)
+                batch.clear()
+        if batch:
+            self._redis.delete(*batch)
+
+    def _len(self) -> int:
+        return sum(1 for _ in self._keys())
+
+
+CACHE_BACKENDS = ("memory", "sqlite", "redis")
+
+
+def make_cache(max_entries: int, ttl: float, name: str) -> TTLCache:
+    """
+    A cache on the configured backend (CACHE_BACKEND).
+
+    Without CACHE_BACKEND, caches are shared through SQLite when
+    SHARED_CACHE_DB is set (several workers on one host) and in-process
+    otherwise.
+    """
+    backend = settings.CACHE_BACKEND or ("sqlite" if settings.SHARED_CACHE_DB else "memory")
+    if backend == "redis":
+        return RedisTTLCache(max_entries, ttl, name)
+    if backend == "sqlite":
+        return SQLiteTTLCache(settings.SHARED_CACHE_DB or "cache.db", max_entries, ttl, name)
+    if backend != "memory":
+        raise ValueError(f"Unknown CACHE_BACKEND '{backend}' (expected one of {', '.join(CACHE_BACKENDS)})")
+    return TTLCache(max_entries, ttl, name)
@@ -0,0 +1,93 @@
+"""
+End-to-end request deadlines.
+
+Every HTTP request gets a deadline, either from the X-Request-Timeout header
+(seconds) or from a per-endpoint default (REQUEST_TIMEOUTS, falling back to
+DEFAULT_REQUEST_TIMEOUT). It is stored in a context variable so pipeline
+stages and upstream calls can size their timeouts to the remaining budget
+instead of the fixed per-call timeout.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from ..config import settings
+
+DEADLINE_HEADER = "x-request-timeout"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when there is no time budget left for an operation."""
+
+
+def set_deadline(seconds: Optional[float]):
+    """Set the deadline `seconds` from now for the current context; returns a reset token."""
+    return _deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+
+def reset_deadline(token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (may be negative), or None if there is none."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline(operation: str = "operation") -> Optional[float]:
+    """Return the remaining budget, raising DeadlineExceeded if it is used up."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Request deadline exceeded before {operation}")
+    return left
+
+
+def default_timeout_for(path: str) -> float:
+    """Per-endpoint default: longest matching REQUEST_TIMEOUTS prefix, else DEFAULT_REQUEST_TIMEOUT."""
+    best = None
+    for prefix, seconds in settings.REQUEST_TIMEOUTS.items():
+        if path.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, seconds)
+    return best[1] if best else settings.DEFAULT_REQUEST_TIMEOUT
+
+
+def _header_timeout(scope) -> Optional[float]:
+    for name, value in scope.get("headers") or []:
+        if name.decode("latin-1").lower() == DEADLINE_HEADER:
+            try:
+                seconds = float(value.decode("latin-1"))
+            except ValueError:
+                return None
+            return seconds if seconds > 0 else None
+    return None
+
+
+class DeadlineMiddleware:
+    """ASGI middleware that sets the request deadline for HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        default = default_timeout_for(scope.get("path", ""))
+        requested = _header_timeout(scope)
+        # Clients may ask for less time than the default, never for more
+        seconds = min(requested, default) if requested is not None else default
+        token = set_deadline(seconds)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
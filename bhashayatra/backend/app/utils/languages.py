@@ -8,6 +8,7 @@ Supported Languages:
 - Kannada (kn)
 """
 
+import unicodedata
 from typing import Dict, List, Tuple
 from enum import Enum
 
@@ -26,6 +27,19 @@ LANGUAGE_NAMES = {
     Language.KANNADA: "Kannada"
 }
 
+# Native script of each Indic language and its Unicode block (inclusive)
+SCRIPT_NAMES = {
+    Language.HINDI: "Devanagari",
+    Language.TELUGU: "Telugu",
+    Language.KANNADA: "Kannada",
+}
+
+SCRIPT_RANGES = {
+    Language.HINDI: (0x0900, 0x097F),
+    Language.TELUGU: (0x0C00, 0x0C7F),
+    Language.KANNADA: (0x0C80, 0x0CFF),
+}
+
 # All supported languages list
 SUPPORTED_LANGUAGES = [Language.ENGLISH, Language.HINDI, Language.TELUGU, Language.KANNADA]
 
@@ -61,4 +75,25 @@ def format_language_pair(source: str, target: str) -> str:
     """Format language pair for display (e.g., 'English to Hindi')"""
     source_name = LANGUAGE_NAMES.get(source, source)
     target_name = LANGUAGE_NAMES.get(target, target)
-    return f"{source_name} to {target_name}"
\ No newline at end of file
+    return f"{source_name} to {target_name}"
+
+def script_ratio(text: str, lang_code: str) -> float:
+    """
+    Fraction of letters (including combining vowel signs) in text that belong
+    to the native script of lang_code. English counts ASCII letters.
+    Returns 0.0 for text without letters.
+    """
+    letters = [c for c in text or "" if c.isalpha() or unicodedata.category(c).startswith("M")]
+    if not letters:
+        return 0.0
+    if lang_code == Language.ENGLISH:
+        matching = sum(1 for c in letters if c.isascii())
+    else:
+        low, high = SCRIPT_RANGES.get(lang_code, (0, -1))
+        matching = sum(1 for c in letters if low <= ord(c) <= high)
+    return matching / len(letters)
+
+
+def matches_script(text: str, lang_code: str, threshold: float = 0.6) -> bool:
+    """Cheap check that text is really written in lang_code's script (e.g. LLM output)."""
+    return script_ratio(text, lang_code) >= threshold
@@ -0,0 +1,158 @@
+"""
+Event-loop lag monitor.
+
+A background task sleeps for LOOP_LAG_INTERVAL seconds at a time and
+records how late it wakes up. That scheduling delay is the time the loop
+spent running something else without yielding: a sync SDK call, a file
+read or `wave.open` inside an `async def` handler. Every sample goes into
+the bhashayatra_event_loop_lag_seconds histogram.
+
+A watchdog thread checks the monitor's heartbeat. When the loop is overdue
+by more than LOOP_LAG_THRESHOLD, the watchdog captures the loop thread's
+current stack (the blocking code) and the route of the request being
+served, prints it and keeps the newest LOOP_LAG_MAX_CAPTURES captures for
+/admin/loop-lag. When the loop resumes, the capture is updated with the
+total stall time.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional
+
+from ..config import settings
+from . import metrics
+
+MAX_STACK_FRAMES = 40
+
+
+def _route_of(frame) -> tuple[Optional[str], Optional[str]]:
+    # The blocked task's coroutine frames are on the loop thread's stack; the
+    # ASGI middlewares among them hold the request scope in a local
+    while frame is not None:
+        try:
+            scope = frame.f_locals.get("scope")
+        except Exception:
+            scope = None
+        if isinstance(scope, dict) and scope.get("type") in ("http", "websocket"):
+            route = getattr(scope.get("route"), "path", None)
+            return scope.get("method", "WS"), route or scope.get("path")
+        frame = frame.f_back
+    return None, None
+
+
+class LoopMonitor:
+    def __init__(self, interval: float, threshold: float, max_captures: int):
+        self.interval = interval
+        self.threshold = threshold
+        self.captures: deque = deque(maxlen=max_captures)
+        self.samples = 0
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self._expected: Optional[float] = None
+        self._capture: Optional[dict] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    # ---- loop side ----
+
+    async def _measure(self) -> None:
+        while True:
+            self._expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._expected)
+            self._expected = None
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            metrics.event_loop_lag.observe(lag)
+            capture, self._capture = self._capture, None
+            if capture is not None:
+                capture["lag_ms"] = round(lag * 1000, 1)
+                print(f"Event loop blocked for {capture['lag_ms']} ms in {capture['method']} {capture['route']}")
+
+    # ---- watchdog side ----
+
+    def _watch(self) -> None:
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            expected = self._expected
+            if expected is None or self._capture is not None:
+                continue
+            overdue = time.perf_counter() - expected
+            if overdue > self.threshold:
+                self._take_capture(expected, overdue)
+
+    def _take_capture(self, expected: float, overdue: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        method, route = _route_of(frame)
+        stack = traceback.format_stack(frame, limit=MAX_STACK_FRAMES)
+        if self._expected != expected:
+            return  # the loop resumed while the stack was being read
+        capture = {
+            "at": time.time(),
+            "lag_ms": round(overdue * 1000, 1),  # updated with the full stall when the loop resumes
+            "method": method,
+            "route": route,
+            "stack": [line.rstrip("\n") for line in stack],
+        }
+        self.stalls += 1
+        self.captures.append(capture)
+        self._capture = capture
+        metrics.event_loop_stalls.labels(route or "unknown").inc()
+        print(f"Event loop blocked for >{capture['lag_ms']} ms in {method} {route}; stack:\n{''.join(stack[-8:])}")
+
+    # ---- lifecycle ----
+
+    def start(self) -> None:
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.create_task(self._measure())
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+            "captures": list(reversed(self.captures)),
+        }
+
+
+monitor = LoopMonitor(settings.LOOP_LAG_INTERVAL, settings.LOOP_LAG_THRESHOLD, settings.LOOP_LAG_MAX_CAPTURES)
+
+
+def start_monitor() -> None:
+    if settings.LOOP_MONITOR_ENABLED:
+        monitor.start()
+
+
+async def stop_monitor() -> None:
+    await monitor.stop()
+
+
+def loop_lag_stats() -> dict:
+    """Lag summary and recent blocking captures, newest first."""
+    return {"enabled": settings.LOOP_MONITOR_ENABLED, **monitor.stats()}
@@ -0,0 +1,178 @@
+"""
+Prometheus metrics.
+
+Series (all prefixed bhashayatra_):
+
+- http_request_duration_seconds{router, endpoint, method, status}
+- http_requests_in_flight{router}
+- http_request_size_bytes / http_response_size_bytes{router, endpoint}
+- upstream_request_duration_seconds{capability, language, outcome}
+- upstream_errors_total{capability, language, kind}
+- upstream_in_flight{capability}
+- upstream_payload_bytes{capability, direction}
+- pipeline_stage_duration_seconds{stage, outcome}
+- cache_{hits,misses,evictions,errors}_total{cache}
+- admission_queue_seconds{pool}, admission_rejections_total{pool, reason}
+- event_loop_lag_seconds, event_loop_stalls_total{route}
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory before the workers start: every process then writes its
+samples there and /metrics aggregates them. Recording a sample is a dict
+lookup plus a lock-protected add, so the per-request cost is a few
+microseconds.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+PREFIX = "bhashayatra_"
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 5242880, 10485760)
+
+http_request_duration = Histogram(
+    PREFIX + "http_request_duration_seconds", "HTTP request latency",
+    ["router", "endpoint", "method", "status"], buckets=LATENCY_BUCKETS,
+)
+http_in_flight = Gauge(
+    PREFIX + "http_requests_in_flight", "HTTP requests being served",
+    ["router"], multiprocess_mode="livesum",
+)
+http_request_size = Histogram(
+    PREFIX + "http_request_size_bytes", "HTTP request body size",
+    ["router", "endpoint"], buckets=SIZE_BUCKETS,
+)
+http_response_size = Histogram(
+    PREFIX + "http_response_size_bytes", "HTTP response body size",
+    ["router", "endpoint"], buckets=SIZE_BUCKETS,
+)
+
+upstream_duration = Histogram(
+    PREFIX + "upstream_request_duration_seconds", "Bhashini call latency",
+    ["capability", "language", "outcome"], buckets=LATENCY_BUCKETS,
+)
+upstream_errors = Counter(
+    PREFIX + "upstream_errors_total", "Failed Bhashini calls",
+    ["capability", "language", "kind"],
+)
+upstream_in_flight = Gauge(
+    PREFIX + "upstream_in_flight", "Bhashini calls in progress",
+    ["capability"], multiprocess_mode="livesum",
+)
+upstream_payload = Histogram(
+    PREFIX + "upstream_payload_bytes", "Bhashini request/response payload size",
+    ["capability", "direction"], buckets=SIZE_BUCKETS,
+)
+
+stage_duration = Histogram(
+    PREFIX + "pipeline_stage_duration_seconds", "Unified pipeline stage latency",
+    ["stage", "outcome"], buckets=LATENCY_BUCKETS,
+)
+
+cache_hits = Counter(PREFIX + "cache_hits_total", "Cache hits", ["cache"])
+cache_misses = Counter(PREFIX + "cache_misses_total", "Cache misses", ["cache"])
+cache_evictions = Counter(PREFIX + "cache_evictions_total", "Cache LRU evictions", ["cache"])
+cache_errors = Counter(PREFIX + "cache_errors_total", "Shared cache backend errors (treated as misses)", ["cache"])
+
+admission_queue_time = Histogram(
+    PREFIX + "admission_queue_seconds", "Time spent waiting for an admission slot",
+    ["pool"], buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+admission_rejections = Counter(
+    PREFIX + "admission_rejections_total", "Requests shed by admission control",
+    ["pool", "reason"],
+)
+
+event_loop_lag = Histogram(
+    PREFIX + "event_loop_lag_seconds", "Event loop scheduling delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+event_loop_stalls = Counter(
+    PREFIX + "event_loop_stalls_total", "Event loop blocked longer than LOOP_LAG_THRESHOLD",
+    ["route"],
+)
+
+
+def render() -> tuple[bytes, str]:
+    """Return the exposition-format body and its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the aggregation directory on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def _route_labels(scope) -> tuple[str, str]:
+    # Use the route template, not the raw path, to keep label cardinality bounded
+    route = scope.get("route")
+    # Requests shed by admission control never reach routing: use the path prefix they were admitted by
+    endpoint = getattr(route, "path", None) or scope.get("admission_prefix")
+    if endpoint is None:
+        return "unmatched", "unmatched"
+    router = endpoint.strip("/").split("/", 1)[0] or "root"
+    return router, endpoint
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight and payload size per HTTP endpoint."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+        top = scope.get("path", "").strip("/").split("/", 1)[0] or "root"
+        in_flight = http_in_flight.labels(top)
+
+        async def counting_receive():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        in_flight.inc()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            in_flight.dec()
+            router, endpoint = _route_labels(scope)
+            http_request_duration.labels(router, endpoint, scope.get("method", ""), str(status)).observe(
+                time.perf_counter() - started
+            )
+            http_request_size.labels(router, endpoint).observe(request_bytes)
+            http_response_size.labels(router, endpoint).observe(response_bytes)
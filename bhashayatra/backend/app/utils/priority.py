@@ -0,0 +1,84 @@
+"""
+Request priority classes for upstream scheduling.
+
+- interactive: a user waiting on the answer (/unified, /speech, /chat)
+- standard: everything else served synchronously
+- bulk: batch and background work that should only use spare capacity
+
+The class is kept in a context variable, like the request deadline, so the
+Bhashini service layer can schedule calls without it being threaded through
+every function. Clients may lower their priority with the X-Priority header
+but never raise it.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+INTERACTIVE = "interactive"
+STANDARD = "standard"
+BULK = "bulk"
+PRIORITY_CLASSES = (INTERACTIVE, STANDARD, BULK)  # highest first
+
+PRIORITY_HEADER = "x-priority"
+INTERACTIVE_PREFIXES = ("/unified", "/speech", "/chat")
+
+_priority: ContextVar[str] = ContextVar("request_priority", default=STANDARD)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def set_priority(priority: str):
+    """Set the priority class for the current context; returns a reset token."""
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {priority}")
+    return _priority.set(priority)
+
+
+def reset_priority(token) -> None:
+    _priority.reset(token)
+
+
+@contextmanager
+def priority(priority_class: str):
+    """Run a block (e.g. background work) under the given priority class."""
+    token = set_priority(priority_class)
+    try:
+        yield
+    finally:
+        reset_priority(token)
+
+
+def default_priority_for(path: str) -> str:
+    return INTERACTIVE if path.startswith(INTERACTIVE_PREFIXES) else STANDARD
+
+
+def _header_priority(scope):
+    for name, value in scope.get("headers") or []:
+        if name.decode("latin-1").lower() == PRIORITY_HEADER:
+            requested = value.decode("latin-1").strip().lower()
+            return requested if requested in PRIORITY_CLASSES else None
+    return None
+
+
+class PriorityMiddleware:
+    """ASGI middleware that sets the priority class for HTTP and WebSocket requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        default = default_priority_for(scope.get("path", ""))
+        requested = _header_priority(scope)
+        # Lower index = higher priority; a client can only step down
+        chosen = max(default, requested or default, key=PRIORITY_CLASSES.index)
+        token = set_priority(chosen)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_priority(token)
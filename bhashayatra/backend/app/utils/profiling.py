@@ -0,0 +1,131 @@
+"""
+Opt-in per-request profiling.
+
+With PROFILING_ENABLED=true and a PROFILING_TOKEN configured, a request that
+sends `X-Profile: <token>` is run under pyinstrument's statistical profiler
+(async-aware, so time spent awaiting upstreams is attributed to the awaiting
+code). The profile is written as a speedscope JSON file (open it at
+https://www.speedscope.app) into PROFILE_DIR, which keeps only the newest
+PROFILE_MAX_FILES profiles. The response carries the profile id in
+X-Profile-Id; /admin/profiles lists and serves them.
+
+When profiling is disabled the middleware is not installed and pyinstrument
+is never imported, so there is no per-request cost.
+"""
+
+import asyncio
+import hmac
+import os
+import re
+import time
+import uuid
+from typing import Optional
+
+from ..config import settings
+
+PROFILE_HEADER = "x-profile"
+PROFILE_SUFFIX = ".speedscope.json"
+_ID_RE = re.compile(r"^[\w.-]+$")
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+def token_matches(value: Optional[str]) -> bool:
+    """True if value is the configured profiling token (never true without one)."""
+    token = settings.PROFILING_TOKEN
+    return bool(token) and value is not None and hmac.compare_digest(value.encode(), token.encode())
+
+
+def _profile_path(profile_id: str) -> Optional[str]:
+    if not _ID_RE.match(profile_id):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, profile_id + PROFILE_SUFFIX)
+    return path if os.path.isfile(path) else None
+
+
+def list_profiles() -> list[dict]:
+    """Stored profiles, newest first."""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if not name.endswith(PROFILE_SUFFIX):
+            continue
+        path = os.path.join(settings.PROFILE_DIR, name)
+        stat = os.stat(path)
+        profile_id = name[: -len(PROFILE_SUFFIX)]
+        # <epoch ms>_<method>_<path slug>_<random>
+        parts = profile_id.split("_")
+        profiles.append({
+            "id": profile_id,
+            "created_at": stat.st_mtime,
+            "size_bytes": stat.st_size,
+            "method": parts[1] if len(parts) == 4 else None,
+            "path": parts[2] if len(parts) == 4 else None,
+        })
+    profiles.sort(key=lambda p: p["created_at"], reverse=True)
+    return profiles
+
+
+def profile_file(profile_id: str) -> Optional[str]:
+    """Path of a stored profile, or None if there is no such profile."""
+    return _profile_path(profile_id)
+
+
+def _save_profile(profiler, profile_id: str) -> None:
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(settings.PROFILE_DIR, profile_id + PROFILE_SUFFIX)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(profiler.output(SpeedscopeRenderer()))
+
+    # Ring buffer: drop the oldest profiles beyond PROFILE_MAX_FILES
+    stored = sorted(
+        (os.path.join(settings.PROFILE_DIR, n) for n in os.listdir(settings.PROFILE_DIR) if n.endswith(PROFILE_SUFFIX)),
+        key=os.path.getmtime,
+    )
+    for old in stored[: max(0, len(stored) - settings.PROFILE_MAX_FILES)]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+def _header(scope, name: str) -> Optional[str]:
+    for key, value in scope.get("headers") or []:
+        if key.decode("latin-1").lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling HTTP requests that carry a valid X-Profile token."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not token_matches(_header(scope, PROFILE_HEADER)):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        slug = _SLUG_RE.sub("-", scope.get("path", "")).strip("-")[:60] or "root"
+        profile_id = f"{int(time.time() * 1000)}_{scope.get('method', '')}_{slug}_{uuid.uuid4().hex[:8]}"
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILE_INTERVAL, async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop()
+            try:
+                await asyncio.to_thread(_save_profile, profiler, profile_id)
+            except Exception as exc:
+                print(f"Saving profile {profile_id} failed: {exc}")
@@ -0,0 +1,386 @@
+"""
+Lightweight distributed tracing.
+
+With TRACING_ENABLED=true every HTTP request gets a server span, and the
+work done for it is recorded as child spans: each pipeline stage (asr, ocr,
+mt:hi, tts:hi, ...), upload validation and each Bhashini call. Spans carry
+attributes such as the language, payload sizes and cache hits/misses.
+
+Trace context follows W3C Trace Context: an incoming `traceparent` header
+continues the caller's trace (and its sampling decision), otherwise a new
+trace is sampled with probability TRACE_SAMPLE_RATE. Outgoing Bhashini
+calls carry a `traceparent` for the current span, and responses return the
+trace id in X-Trace-Id.
+
+Finished spans are queued and written by a background thread, one JSON
+object per line, to TRACE_FILE and, if OTEL_EXPORTER_OTLP_ENDPOINT is set,
+posted to an OpenTelemetry collector as OTLP/HTTP JSON (/v1/traces).
+
+When tracing is disabled (or a request is not sampled) `span()` does not
+record anything, so instrumented code pays one context-variable lookup.
+"""
+
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+import httpx
+
+from ..config import settings
+
+SERVICE_NAME = "bhashayatra-backend"
+TRACEPARENT_HEADER = "traceparent"
+EXPORT_INTERVAL = 1.0
+EXPORT_BATCH = 512
+QUEUE_SIZE = 10000
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_KIND_CODES = {"internal": 1, "server": 2, "client": 3}
+
+
+class Span:
+    """A timed operation within a trace. Only sampled spans are recorded and exported."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "sampled",
+                 "attributes", "start_ns", "end_ns", "status", "status_message")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, kind: str = "internal"):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.sampled = sampled
+        self.attributes: dict[str, Any] = {}
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "unset"
+        self.status_message: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            "status": self.status,
+            "status_message": self.status_message,
+            "attributes": self.attributes,
+        }
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Set an attribute on the current span, if it is being recorded."""
+    span_ = _current.get()
+    if span_ is not None and span_.sampled:
+        span_.set(key, value)
+
+
+def add_to_attribute(key: str, amount: int = 1) -> None:
+    """Increment a counter attribute (e.g. cache hits) on the current span, if it is being recorded."""
+    span_ = _current.get()
+    if span_ is not None and span_.sampled:
+        span_.attributes[key] = span_.attributes.get(key, 0) + amount
+
+
+def outgoing_headers() -> dict[str, str]:
+    """Headers propagating the current trace context to an upstream call."""
+    span_ = _current.get()
+    return {TRACEPARENT_HEADER: span_.traceparent()} if span_ is not None else {}
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[tuple[str, str, bool]]:
+    """(trace id, parent span id, sampled) from a traceparent header, or None if invalid."""
+    match = _TRACEPARENT_RE.match((value or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+def _finish(span_: Span, exc: Optional[BaseException]) -> None:
+    span_.end_ns = time.time_ns()
+    if exc is not None:
+        span_.status = "error"
+        span_.status_message = f"{exc.__class__.__name__}: {getattr(exc, 'detail', exc)}"[:500]
+    elif span_.status == "unset":
+        span_.status = "ok"
+    _exporter.submit(span_)
+
+
+@contextmanager
+def start_trace(name: str, traceparent: Optional[str] = None, kind: str = "server", **attributes):
+    """
+    Open the root span of a unit of work (an HTTP request, a background job).
+
+    Continues the trace in `traceparent` when it is valid, otherwise starts a
+    new trace sampled with probability TRACE_SAMPLE_RATE. Yields None when
+    tracing is disabled.
+    """
+    if not settings.TRACING_ENABLED:
+        yield None
+        return
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id, sampled = os.urandom(16).hex(), None, random.random() < settings.TRACE_SAMPLE_RATE
+    root = Span(name, trace_id, parent_id, sampled, kind)
+    for key, value in attributes.items():
+        root.set(key, value)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as exc:
+        if sampled:
+            _finish(root, exc)
+        raise
+    else:
+        if sampled:
+            _finish(root, None)
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """
+    Record a child span of the current span for the enclosed block.
+
+    Outside a trace, or inside an unsampled one, nothing is recorded and the
+    current (possibly None) span is yielded, so callers can always do
+    `with span(...) as s: ...` and guard attribute updates with `if s`.
+    """
+    parent = _current.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+    child = Span(name, parent.trace_id, parent.span_id, True, kind)
+    for key, value in attributes.items():
+        child.set(key, value)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        _finish(child, exc)
+        raise
+    else:
+        _finish(child, None)
+    finally:
+        _current.reset(token)
+
+
+# ==================== EXPORT ====================
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_payload(spans: list[Span]) -> dict:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{
+            "scope": {"name": "bhashayatra.tracing"},
+            "spans": [{
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                "name": s.name,
+                "kind": _KIND_CODES.get(s.kind, 1),
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                "status": {"code": 2, "message": s.status_message or ""} if s.status == "error" else {"code": 1},
+            } for s in spans],
+        }],
+    }]}
+
+
+class _Exporter:
+    """Background thread batching finished spans to the JSONL file and the OTLP collector."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()  # one writer to TRACE_FILE at a time
+        self.exported = 0
+        self.dropped = 0
+
+    def submit(self, span_: Span) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(span_)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _drain(self, timeout: float) -> list[Span]:
+        batch = []
+        try:
+            item = self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+            while True:
+                if item is not None:  # None only wakes the thread up to stop
+                    batch.append(item)
+                if len(batch) >= EXPORT_BATCH:
+                    break
+                item = self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self, stop: threading.Event) -> None:
+        client = httpx.Client(timeout=10.0) if settings.OTEL_EXPORTER_OTLP_ENDPOINT else None
+        try:
+            while not stop.is_set():
+                batch = self._drain(EXPORT_INTERVAL)
+                if batch:
+                    self.export(batch, client)
+        finally:
+            if client is not None:
+                client.close()
+
+    def export(self, batch: list[Span], client: Optional[httpx.Client] = None) -> None:
+        with self._export_lock:
+            self._export(batch, client)
+
+    def _export(self, batch: list[Span], client: Optional[httpx.Client]) -> None:
+        if settings.TRACE_FILE:
+            try:
+                with open(settings.TRACE_FILE, "a", encoding="utf-8") as f:
+                    for s in batch:
+                        f.write(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n")
+            except OSError as exc:
+                print(f"Writing spans to {settings.TRACE_FILE} failed: {exc}")
+        if client is not None:
+            url = settings.OTEL_EXPORTER_OTLP_ENDPOINT.rstrip("/") + "/v1/traces"
+            try:
+                client.post(url, json=_otlp_payload(batch)).raise_for_status()
+            except httpx.HTTPError as exc:
+                print(f"Exporting {len(batch)} spans to {url} failed: {exc}")
+        self.exported += len(batch)
+
+    def flush(self, timeout: float = 30.0) -> None:
+        """
+        Stop the exporter thread and export everything still queued (used at shutdown).
+
+        The thread finishes the batch it is writing first, so the remaining
+        spans are written by this thread alone. A later span starts a new
+        exporter thread.
+        """
+        with self._lock:
+            thread, stop, self._thread = self._thread, self._stop, None
+        if thread is not None:
+            stop.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass  # the thread is busy and will see the stop flag after this batch
+            thread.join(timeout)
+            if thread.is_alive():
+                print("Trace exporter did not stop in time; spans still queued are dropped")
+                return
+        client = httpx.Client(timeout=10.0) if settings.OTEL_EXPORTER_OTLP_ENDPOINT else None
+        try:
+            batch = self._drain(0)
+            while batch:
+                self.export(batch, client)
+                batch = self._drain(0)
+        finally:
+            if client is not None:
+                client.close()
+
+
+_exporter = _Exporter()
+
+
+def flush() -> None:
+    _exporter.flush()
+
+
+# ==================== MIDDLEWARE ====================
+
+def _header(scope, name: str) -> Optional[str]:
+    for key, value in scope.get("headers") or []:
+        if key.decode("latin-1").lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per HTTP request and returning its trace id."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope.get("method", "")
+        with start_trace(method, _header(scope, TRACEPARENT_HEADER), kind="server") as root:
+            if root is None:
+                await self.app(scope, receive, send)
+                return
+            root.set("http.method", method)
+            root.set("http.target", scope.get("path"))
+            length = _header(scope, "content-length")
+            root.set("http.request_content_length", int(length) if length and length.isdigit() else None)
+
+            async def send_with_trace(message):
+                if message["type"] == "http.response.start":
+                    root.set("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        root.status = "error"
+                    message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", root.trace_id.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                # Name the span after the route template once routing has happened
+                route = getattr(scope.get("route"), "path", None)
+                root.name = f"{method} {route or scope.get('path', '')}"
+                root.set("http.route", route)
+                if route:
+                    root.set("router", route.strip("/").split("/", 1)[0] or "root")
@@ -0,0 +1 @@
+"""Load-testing tools: a mock upstream server and an end-to-end load generator."""
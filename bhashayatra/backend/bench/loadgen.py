@@ -0,0 +1,230 @@
+"""
+End-to-End Load Generator
+
+Drives the backend's main endpoints at fixed concurrency levels (closed
+loop: each worker sends its next request as soon as the previous one
+returns) and writes a JSON report with RPS, latency percentiles and error
+rates per scenario and concurrency level.
+
+Run (backend pointed at bench.mock_upstream, see that module):
+    python -m bench.loadgen --base-url http://127.0.0.1:8000 \\
+        --scenarios text,audio,image,chat,itinerary --concurrency 1,8,32 \\
+        --duration 20 --output report.json
+
+Compare two reports (e.g. before/after a change):
+    python -m bench.loadgen compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import platform
+import struct
+import sys
+import time
+import wave
+import zlib
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import httpx
+
+SCENARIOS = ("text", "audio", "image", "chat", "itinerary")
+
+
+def _wav_bytes(seconds: float = 2.0, sample_rate: int = 16000) -> bytes:
+    """A 16-bit mono tone, within the ASR duration limit."""
+    frames = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * n / sample_rate)))
+        for n in range(int(seconds * sample_rate))
+    )
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(frames)
+    return buffer.getvalue()
+
+
+def _png_bytes(width: int = 64, height: int = 32) -> bytes:
+    """A small valid grayscale PNG."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    raw = b"".join(b"\x00" + bytes((x * 4) % 256 for x in range(width)) for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def build_requests(source_lang: str, target_lang: str) -> dict[str, Callable[[httpx.AsyncClient], object]]:
+    """One request factory per scenario; each returns the awaitable response."""
+    wav = _wav_bytes()
+    png = _png_bytes()
+    form = {"source_language": source_lang, "target_language": target_lang, "output_type": "text"}
+    return {
+        "text": lambda c: c.post("/unified/text", json={
+            "text": "Where is the nearest railway station and how much is a ticket to Hampi?",
+            **form,
+        }),
+        "audio": lambda c: c.post("/unified/audio", data=form, files={"audio_file": ("q.wav", wav, "audio/wav")}),
+        "image": lambda c: c.post("/unified/image", data=form, files={"image_file": ("sign.png", png, "image/png")}),
+        "chat": lambda c: c.post("/chat", json={
+            "messages": [{"role": "user", "content": "What should I eat in Hampi?"}],
+            "target_lang": target_lang,
+        }),
+        "itinerary": lambda c: c.post("/itinerary/generate", json={
+            "destination": "Hampi", "days": 2, "interests": ["temples", "food"],
+            "target_lang": target_lang, "speak": False, "use_cache": False,
+        }),
+    }
+
+
+def percentile(sorted_values: list[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float], statuses: dict[str, int], elapsed: float) -> dict:
+    total = sum(statuses.values())
+    errors = sum(n for status, n in statuses.items() if not status.startswith("2"))
+    ordered = sorted(latencies)
+
+    def ms(seconds: Optional[float]) -> Optional[float]:
+        return None if seconds is None else round(seconds * 1000, 2)
+
+    return {
+        "requests": total,
+        "duration_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+        "latency_ms": {
+            "p50": ms(percentile(ordered, 0.50)),
+            "p95": ms(percentile(ordered, 0.95)),
+            "p99": ms(percentile(ordered, 0.99)),
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else None,
+            "max": ms(ordered[-1]) if ordered else None,
+        },
+    }
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    send: Callable[[httpx.AsyncClient], object],
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int],
+) -> dict:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    sent = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal sent
+        while time.perf_counter() < deadline and (max_requests is None or sent < max_requests):
+            sent += 1
+            started = time.perf_counter()
+            try:
+                response = await send(client)
+                status = str(response.status_code)
+            except httpx.HTTPError as exc:
+                status = exc.__class__.__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    requests = build_requests(args.source_language, args.target_language)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "python": platform.python_version(),
+        "config": {
+            "duration_s": args.duration, "max_requests": args.requests, "concurrency": levels,
+            "source_language": args.source_language, "target_language": args.target_language,
+        },
+        "results": {},
+    }
+    limits = httpx.Limits(max_connections=max(levels) * 2, max_keepalive_connections=max(levels) * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        for scenario in scenarios:
+            report["results"][scenario] = {}
+            for level in levels:
+                result = await run_level(client, requests[scenario], level, args.duration, args.requests)
+                report["results"][scenario][str(level)] = result
+                lat = result["latency_ms"]
+                print(
+                    f"{scenario:>10} c={level:<4} rps={result['rps']:<8} p50={lat['p50']}ms "
+                    f"p95={lat['p95']}ms p99={lat['p99']}ms errors={result['error_rate']:.2%}"
+                )
+    return report
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print RPS, p95 and error-rate changes for every scenario/concurrency present in both reports."""
+    with open(old_path) as f:
+        old = json.load(f)["results"]
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+    print(f"{'scenario':>10} {'conc':>5} {'rps':>20} {'p95 ms':>22} {'errors':>18}")
+    for scenario, levels in new.items():
+        for level, result in levels.items():
+            before = old.get(scenario, {}).get(level)
+            if before is None:
+                continue
+            p95_old, p95_new = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+            change = f"{(p95_new - p95_old) / p95_old:+.1%}" if p95_old and p95_new is not None else "n/a"
+            print(
+                f"{scenario:>10} {level:>5} {before['rps']:>8} -> {result['rps']:<8} "
+                f"{p95_old} -> {p95_new} ({change}) "
+                f"{before['error_rate']:.2%} -> {result['error_rate']:.2%}"
+            )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["compare"]:
+        if len(argv) != 3:
+            raise SystemExit("usage: python -m bench.loadgen compare OLD.json NEW.json")
+        compare(argv[1], argv[2])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per scenario and level")
+    parser.add_argument("--requests", type=int, default=None, help="stop a level after this many requests")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--source-language", default="en")
+    parser.add_argument("--target-language", default="hi")
+    parser.add_argument("--output", default="bench-report.json")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
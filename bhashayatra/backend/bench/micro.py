@@ -0,0 +1,228 @@
+"""
+Micro-Benchmarks for CPU Hot Paths
+
+Times the pure-CPU work done on every request, with the Bhashini calls
+stubbed out:
+
+- count_words on long Indic text
+- ensure_asr_constraints / ensure_ocr_constraints on ~5 MB uploads
+- build_plan and execute_pipeline orchestration overhead
+- create_response construction and JSON serialization
+
+Each benchmark reports the best per-operation time over several repeats.
+Results are also normalized by a fixed pure-Python calibration loop, so a
+baseline recorded on one machine stays comparable on another.
+
+Run / record a baseline / check against it:
+    python -m bench.micro run
+    python -m bench.micro run --save bench/baselines/micro.json
+    python -m bench.micro compare --baseline bench/baselines/micro.json --threshold 1.75
+
+compare exits with status 1 when any benchmark's normalized time grew by
+more than the threshold factor.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import platform
+import sys
+import tempfile
+import timeit
+import wave
+from typing import Callable
+
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.services import pipeline
+from app.services.pipeline import InputType, OutputType, build_plan, execute_pipeline
+from app.routers.unified_operations import create_response
+from app.utils.validators import count_words, ensure_asr_constraints, ensure_ocr_constraints
+
+DEFAULT_BASELINE = "bench/baselines/micro.json"
+DEFAULT_THRESHOLD = 1.75
+REPEAT = 5
+SPOOL_MAX_SIZE = 1024 * 1024  # starlette.formparsers.MultiPartParser.spool_max_size
+
+INDIC_SAMPLE = (
+    "हम्पी के विरुपाक्ष मंदिर तक कैसे पहुँचें और टिकट कितने का है? "
+    "హంపిలోని విరూపాక్ష దేవాలయానికి ఎలా వెళ్ళాలి? "
+    "ಹಂಪಿಯ ವಿರೂಪಾಕ್ಷ ದೇವಾಲಯಕ್ಕೆ ಹೇಗೆ ಹೋಗುವುದು? "
+)
+
+
+def _upload(data: bytes, content_type: str, filename: str) -> UploadFile:
+    # Spooled like Starlette's multipart parser does: a 5 MB upload rolls over to a
+    # temporary file, so validators pay for the real read (a BytesIO read is zero-copy)
+    file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    file.write(data)
+    file.seek(0)
+    return UploadFile(file=file, filename=filename, headers=Headers({"content-type": content_type}))
+
+
+def _wav_5mb() -> bytes:
+    # 96 kHz stereo 24-bit keeps ~5 MB under the ASR duration limit (~8.6 s)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(3)
+        wf.setframerate(96000)
+        wf.writeframes(b"\x01\x02\x03" * 2 * 96000 * 8)
+    return buffer.getvalue()
+
+
+def _image_5mb() -> bytes:
+    return b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * (5 * 1024 * 1024 // 256 - 1)
+
+
+def _calibration() -> None:
+    total = 0
+    for i in range(10000):
+        total += i * i
+    return None
+
+
+async def _stub_mt(text: str, source_lang: str, target_lang: str) -> str:
+    return text
+
+
+async def _stub_tts(text: str, gender, language: str = "en") -> str:
+    return "https://example.invalid/audio.wav"
+
+
+async def _stub_asr(audio_file, language: str = "en", validated: bool = False) -> str:
+    return "recognized text"
+
+
+def _pipeline_benchmark(loop: asyncio.AbstractEventLoop, batch: int = 100) -> Callable[[], None]:
+    async def run_batch() -> None:
+        for _ in range(batch):
+            await execute_pipeline(
+                "Where is the railway station?", InputType.TEXT, OutputType.AUDIO, "en", "hi", "female"
+            )
+
+    def run() -> None:
+        loop.run_until_complete(run_batch())
+    run.batch = batch
+    return run
+
+
+def _benchmarks(loop: asyncio.AbstractEventLoop) -> dict[str, Callable[[], None]]:
+    long_indic = INDIC_SAMPLE * 400  # ~60 KB
+    wav = _wav_5mb()
+    image = _image_5mb()
+    combos = [
+        (i, o, s, t)
+        for i in InputType for o in OutputType
+        for s in ("en", "hi", "te", "kn") for t in ("en", "hi", "te", "kn")
+    ]
+
+    # The validators rewind the upload, so one spooled file serves every run
+    wav_upload = _upload(wav, "audio/wav", "a.wav")
+    image_upload = _upload(image, "image/png", "a.png")
+
+    def asr_check() -> None:
+        ensure_asr_constraints(wav_upload)
+
+    def ocr_check() -> None:
+        ensure_ocr_constraints(image_upload)
+
+    def plans() -> None:
+        for combo in combos:
+            build_plan(*combo)
+
+    result = loop.run_until_complete(execute_pipeline(
+        "Where is the railway station?", InputType.TEXT, OutputType.AUDIO, "en", "hi", "female"
+    ))
+
+    def response_serialization() -> None:
+        create_response(result, "Converted English text to Hindi audio").model_dump_json()
+
+    return {
+        "count_words_indic_60kb": lambda: count_words(long_indic),
+        "ensure_asr_constraints_5mb": asr_check,
+        "ensure_ocr_constraints_5mb": ocr_check,
+        "build_plan_x96": plans,
+        "execute_pipeline_text_to_audio": _pipeline_benchmark(loop),
+        "create_response_serialize": response_serialization,
+    }
+
+
+def _time_per_op(func: Callable[[], None]) -> float:
+    """Best per-operation time in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=REPEAT, number=number)) / number
+    return best * 1e6 / getattr(func, "batch", 1)
+
+
+def run_benchmarks() -> dict:
+    loop = asyncio.new_event_loop()
+    originals = (pipeline.mt_translate, pipeline.tts_synthesize, pipeline.asr_transcribe)
+    pipeline.mt_translate, pipeline.tts_synthesize, pipeline.asr_transcribe = _stub_mt, _stub_tts, _stub_asr
+    try:
+        calibration = _time_per_op(_calibration)
+        results = {}
+        for name, func in _benchmarks(loop).items():
+            try:
+                us = _time_per_op(func)
+            except HTTPException as exc:
+                raise SystemExit(f"{name}: unexpected validation failure: {exc.detail}")
+            results[name] = {"us_per_op": round(us, 3), "normalized": round(us / calibration, 5)}
+            print(f"{name:<38} {us:>12.2f} us/op   x{us / calibration:.4f} calibration")
+    finally:
+        pipeline.mt_translate, pipeline.tts_synthesize, pipeline.asr_transcribe = originals
+        loop.close()
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "calibration_us": round(calibration, 3),
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print the normalized change per benchmark; False if any exceeds the threshold."""
+    ok = True
+    for name, base in baseline["benchmarks"].items():
+        now = current["benchmarks"].get(name)
+        if now is None:
+            print(f"{name:<38} missing from current run")
+            continue
+        ratio = now["normalized"] / base["normalized"] if base["normalized"] else float("inf")
+        regressed = ratio > threshold
+        ok = ok and not regressed
+        print(f"{name:<38} x{ratio:.2f} vs baseline{'   REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--save", help="write the results to this file (e.g. a new baseline)")
+    compare_parser = sub.add_parser("compare", help="run and compare against a baseline")
+    compare_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="fail if normalized time grows by more than this factor")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks()
+    if args.command == "run":
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(current, f, indent=2)
+                f.write("\n")
+            print(f"Saved to {args.save}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if not compare(baseline, current, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Mock Bhashini / Gemini Upstream
+
+Serves the same request/response shapes as the canvas.iiit.ac.in sandbox
+endpoints used in app/services/bhashini.py and the Gemini generateContent
+API, with configurable latency and error rate per capability, so the
+backend can be load-tested without touching the real services.
+
+Run:
+    python -m bench.mock_upstream --port 9000 \\
+        --latency mt=lognormal:120:0.4 --latency gemini=lognormal:1500:0.5 \\
+        --error-rate asr=0.02
+
+and start the backend with BHASHINI_BASE_URL=http://127.0.0.1:9000,
+GEMINI_BASE_URL=http://127.0.0.1:9000 and any GEMINI_API_KEY.
+
+Latency specs (milliseconds):
+    fixed:<ms>                  always <ms>
+    uniform:<low>:<high>        uniform between low and high
+    normal:<mean>:<sd>          normal, clipped at 0
+    lognormal:<median>:<sigma>  log-normal with the given median (long tail)
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CAPABILITIES = ("mt", "asr", "tts", "ocr", "gemini")
+
+DEFAULT_LATENCY = {
+    "mt": "lognormal:150:0.4",
+    "asr": "lognormal:800:0.4",
+    "tts": "lognormal:600:0.4",
+    "ocr": "lognormal:700:0.4",
+    "gemini": "lognormal:1500:0.5",
+}
+
+MOCK_ITINERARY = {
+    "destination": "Hampi",
+    "days": [
+        {
+            "day": 1,
+            "title": "Royal Centre",
+            "slots": [
+                {"time_of_day": "morning", "place": "Virupaksha Temple", "activity": "Temple visit",
+                 "travel_time": "10 min", "entry_fee": "Free entry", "food": "Mango Tree"},
+                {"time_of_day": "afternoon", "place": "Vittala Temple", "activity": "Stone chariot",
+                 "travel_time": "20 min", "entry_fee": "INR 40", "food": "Thali"},
+            ],
+        }
+    ],
+}
+
+
+def parse_latency(spec: str):
+    """Turn a latency spec into a zero-argument sampler returning seconds."""
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda: random.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _parse_pairs(items: list[str]) -> dict[str, str]:
+    pairs = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        if key not in CAPABILITIES:
+            raise ValueError(f"Unknown capability '{key}' (expected one of {', '.join(CAPABILITIES)})")
+        pairs[key] = value
+    return pairs
+
+
+def create_app(latency: dict[str, str] = None, error_rates: dict[str, float] = None) -> FastAPI:
+    samplers = {cap: parse_latency((latency or {}).get(cap, DEFAULT_LATENCY[cap])) for cap in CAPABILITIES}
+    errors = {cap: float((error_rates or {}).get(cap, 0.0)) for cap in CAPABILITIES}
+    app = FastAPI(title="Mock Bhashini/Gemini upstream")
+
+    async def simulate(capability: str):
+        """Sleep for a sampled latency; return an error response for a sampled failure."""
+        await asyncio.sleep(samplers[capability]())
+        if random.random() < errors[capability]:
+            return JSONResponse(status_code=503, content={"detail": f"mock {capability} failure"})
+        return None
+
+    # ---- Bhashini (canvas sandbox) ----
+
+    @app.post("/sandboxbeprod/check_model_status_and_infer/{model_id}")
+    async def mt(model_id: str, request: Request):
+        body = await request.json()
+        if (failure := await simulate("mt")) is not None:
+            return failure
+        return {"status": "success", "data": {"output_text": f"[{model_id[-4:]}] {body.get('input_text', '')}"}}
+
+    @app.post("/sandboxbeprod/infer_asr/{model_id}")
+    async def asr(model_id: str, request: Request):
+        form = await request.form()
+        audio = await form["audio_file"].read()
+        if (failure := await simulate("asr")) is not None:
+            return failure
+        return {"status": "success", "data": {"recognized_text": f"mock transcript of {len(audio)} bytes"}}
+
+    @app.post("/sandboxbeprod/generate_tts/{model_id}")
+    async def tts(model_id: str, request: Request):
+        await request.json()
+        if (failure := await simulate("tts")) is not None:
+            return failure
+        return {"status": "success", "data": {"s3_url": f"https://mock.invalid/tts/{uuid.uuid4().hex}.wav"}}
+
+    @app.post("/sandboxbeprod/check_ocr_status_and_infer/{model_id}")
+    async def ocr(model_id: str, request: Request):
+        form = await request.form()
+        image = await form["file"].read()
+        if (failure := await simulate("ocr")) is not None:
+            return failure
+        return {"status": "success", "data": {"decoded_text": f"mock sign text ({len(image)} bytes)"}}
+
+    # ---- Gemini (generativelanguage v1beta) ----
+
+    def _reply_text(body: dict) -> str:
+        config = body.get("generationConfig") or {}
+        if config.get("responseMimeType") == "application/json":
+            return json.dumps(MOCK_ITINERARY)
+        return (
+            "Day 1: Start early at the Virupaksha Temple. Walk along the river to the Vittala Temple. "
+            "Have lunch at a local thali place. Watch the sunset from Hemakuta Hill."
+        )
+
+    def _candidate(text: str, finished: bool = True) -> dict:
+        candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+        if finished:
+            candidate["finishReason"] = "STOP"
+        return {"candidates": [candidate], "usageMetadata": {"promptTokenCount": 100, "candidatesTokenCount": len(text) // 4}}
+
+    @app.get("/v1beta/models/{model}")
+    async def get_model(model: str):
+        return {"name": f"models/{model}", "displayName": model, "supportedGenerationMethods": ["generateContent"]}
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate(model: str, request: Request):
+        body = await request.json()
+        if (failure := await simulate("gemini")) is not None:
+            return failure
+        return _candidate(_reply_text(body))
+
+    @app.post("/v1beta/models/{model}:streamGenerateContent")
+    async def stream_generate(model: str, request: Request):
+        body = await request.json()
+        # Time to first token is a fraction of the total; the rest is spread over chunks
+        total = samplers["gemini"]()
+        await asyncio.sleep(total * 0.3)
+        if random.random() < errors["gemini"]:
+            return JSONResponse(status_code=503, content={"detail": "mock gemini failure"})
+        words = _reply_text(body).split(" ")
+        chunks = [" ".join(words[i:i + 6]) + " " for i in range(0, len(words), 6)]
+
+        async def events():
+            for i, chunk in enumerate(chunks):
+                yield f"data: {json.dumps(_candidate(chunk, finished=i == len(chunks) - 1))}\r\n\r\n"
+                await asyncio.sleep(total * 0.7 / len(chunks))
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "latency": latency or DEFAULT_LATENCY, "error_rates": errors}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", action="append", default=[], help="capability=spec, e.g. mt=lognormal:120:0.4")
+    parser.add_argument("--error-rate", action="append", default=[], help="capability=fraction, e.g. asr=0.02")
+    parser.add_argument("--seed", type=int, default=int(os.getenv("MOCK_SEED", "0")) or None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    latency = {**DEFAULT_LATENCY, **_parse_pairs(args.latency)}
+    error_rates = {k: float(v) for k, v in _parse_pairs(args.error_rate).items()}
+
+    import uvicorn
+    uvicorn.run(create_app(latency, error_rates), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
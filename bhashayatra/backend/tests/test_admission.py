@@ -0,0 +1,119 @@
+"""
+Admission control: pool selection and 503 load shedding with Retry-After.
+
+Run from the backend folder: python -m pytest tests
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.utils import admission
+from app.utils.admission import AdmissionMiddleware, AdmissionPool, pool_for
+from app.utils.metrics import _route_labels
+
+
+@pytest.fixture(autouse=True)
+def small_pools(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", True)
+    monkeypatch.setitem(admission.pools, "cheap", AdmissionPool("cheap", 1, 1, 0.05))
+    monkeypatch.setitem(admission.pools, "expensive", AdmissionPool("expensive", 1, 0, 0.05))
+
+
+async def _call(app, path: str, body: bytes = b"") -> dict:
+    """Run one request through app; returns status, headers, body and the scope."""
+    scope = {"type": "http", "method": "POST", "path": path, "headers": []}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    return {
+        "status": start["status"],
+        "headers": dict(start.get("headers", [])),
+        "body": b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body"),
+        "scope": scope,
+    }
+
+
+def _app(release: asyncio.Event):
+    """An endpoint that echoes the request body, holding its slot until release is set."""
+    async def app(scope, receive, send):
+        message = await receive()
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": message.get("body", b"")})
+    return AdmissionMiddleware(app)
+
+
+def test_pool_for_routes_by_path_and_output_type():
+    assert pool_for("/unified/text").name == "cheap"
+    assert pool_for("/unified/text", "audio").name == "expensive"
+    assert pool_for("/unified/audio").name == "expensive"
+    assert pool_for("/metrics") is None
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def run():
+        release = asyncio.Event()
+        app = _app(release)
+        first = asyncio.create_task(_call(app, "/unified/audio"))
+        await asyncio.sleep(0.01)  # first holds the only slot; the expensive pool has no queue
+        rejected = await _call(app, "/unified/audio")
+        release.set()
+        return await first, rejected
+
+    first, rejected = asyncio.run(run())
+    assert first["status"] == 200
+    assert rejected["status"] == 503
+    assert int(rejected["headers"][b"retry-after"]) >= 1
+    assert "queue full" in json.loads(rejected["body"])["detail"]
+    assert admission.pools["expensive"].rejected_queue_full == 1
+    # Counted in the HTTP metrics under the prefix, not "unmatched"
+    assert _route_labels(rejected["scope"]) == ("unified", "/unified/audio")
+
+
+def test_queued_request_times_out_with_503():
+    async def run():
+        release = asyncio.Event()
+        app = _app(release)
+        first = asyncio.create_task(_call(app, "/mt"))
+        await asyncio.sleep(0.01)
+        queued = await _call(app, "/mt")  # waits in the cheap queue past its 50 ms limit
+        release.set()
+        await first
+        return queued
+
+    queued = asyncio.run(run())
+    assert queued["status"] == 503
+    assert b"retry-after" in queued["headers"]
+    assert admission.pools["cheap"].rejected_wait_timeout == 1
+
+
+def test_audio_output_text_request_uses_expensive_pool_and_keeps_its_body():
+    body = json.dumps({"text": "hello", "source_language": "en", "target_language": "hi", "output_type": "audio"}).encode()
+
+    async def run():
+        release = asyncio.Event()
+        app = _app(release)
+        # Occupy the expensive pool; a text-output request still gets the cheap one
+        audio = asyncio.create_task(_call(app, "/unified/text", body))
+        await asyncio.sleep(0.01)
+        text = asyncio.create_task(_call(app, "/unified/text", body.replace(b'"audio"', b'"text"')))
+        await asyncio.sleep(0.01)
+        assert admission.pools["expensive"].in_flight == 1
+        assert admission.pools["cheap"].in_flight == 1
+        release.set()
+        return await audio, await text
+
+    audio, text = asyncio.run(run())
+    assert (audio["status"], audio["body"]) == (200, body)
+    assert text["status"] == 200
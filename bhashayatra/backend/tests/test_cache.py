@@ -0,0 +1,80 @@
+"""
+Shared cache backends against fakeredis and a temporary SQLite file.
+
+Run from the backend folder: python -m pytest tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+redis = pytest.importorskip("redis")
+
+from app.utils.cache import RedisTTLCache, SQLiteTTLCache
+
+
+@pytest.fixture(params=["redis", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "redis":
+        return RedisTTLCache(100, ttl=60, name="test", client=fakeredis.FakeRedis())
+    return SQLiteTTLCache(str(tmp_path / "cache.db"), 100, ttl=60, name="test")
+
+
+def test_get_many_returns_only_cached_keys(cache):
+    cache.set(("en", "hi", "hello"), "नमस्ते")
+    cache.set(("en", "hi", "thanks"), "धन्यवाद")
+    found = cache.get_many([("en", "hi", "hello"), ("en", "hi", "missing"), ("en", "hi", "thanks")])
+    assert found == {("en", "hi", "hello"): "नमस्ते", ("en", "hi", "thanks"): "धन्यवाद"}
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.get_many([]) == {}
+
+
+def test_compare_and_set_detects_conflicts(cache):
+    assert cache.compare_and_set("k", None, {"v": 1})
+    assert not cache.compare_and_set("k", None, {"v": 2})  # already present
+    assert not cache.compare_and_set("k", {"v": 0}, {"v": 2})  # stale expected value
+    assert cache.get("k") == {"v": 1}
+    assert cache.compare_and_set("k", {"v": 1}, {"v": 2})
+    assert cache.get("k") == {"v": 2}
+
+
+def test_entries_expire_after_their_ttl(cache):
+    cache.set("short", "x", ttl=0.05)
+    cache.set("long", "y")
+    assert 0 < cache.ttl_of("short") <= 0.05
+    assert 59 < cache.ttl_of("long") <= 60
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.ttl_of("short") is None
+    assert cache.get("long") == "y"
+
+
+def test_async_variants(cache):
+    async def run():
+        await cache.aset("a", [1, 2])
+        assert await cache.aget("a") == [1, 2]
+        assert await cache.aget_many(["a", "b"]) == {"a": [1, 2]}
+        assert await cache.acompare_and_set("a", [1, 2], [3])
+
+    asyncio.run(run())
+    assert cache.get("a") == [3]
+
+
+class _DownRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise redis.exceptions.ConnectionError("connection refused")
+        return fail
+
+
+def test_unavailable_backend_degrades_to_misses():
+    cache = RedisTTLCache(100, ttl=60, name="test", client=_DownRedis())
+    assert cache.get_many(["a", "b"]) == {}
+    assert cache.misses == 2
+    cache.set("a", 1)  # skipped, no exception
+    assert cache.compare_and_set("a", None, 1)  # write skipped, nothing to retry
+    assert cache.get("a", "default") == "default"
+    # Bypassed after the first failure, so only one call waited on the backend
+    assert cache.errors == 1
@@ -0,0 +1,93 @@
+"""
+DAG executor (run_plan): concurrency, failures and the request deadline.
+
+Run from the backend folder: python -m pytest tests
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.pipeline import PipelinePlan, Stage, run_plan
+from app.utils.deadline import set_deadline
+
+
+def _stage(name, inputs, output, delay=0.0, fail=False, critical=True):
+    async def run(*args):
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} failed")
+        return f"{name}({', '.join(args)})"
+    return Stage(name, inputs, output, run, critical=critical)
+
+
+def test_independent_stages_run_concurrently():
+    plan = PipelinePlan([
+        _stage("a", ("input",), "a", delay=0.1),
+        _stage("b", ("input",), "b", delay=0.1),
+        _stage("join", ("a", "b"), "out"),
+    ], "out")
+
+    started = time.monotonic()
+    data, results = asyncio.run(run_plan(plan, {"input": "x"}))
+    assert time.monotonic() - started < 0.18
+    assert data["out"] == "join(a(x), b(x))"
+    assert all(result.ok for result in results.values())
+    assert results["a"].started_at < results["b"].finished_at  # overlapped
+
+
+def test_critical_failure_is_raised_and_recorded():
+    plan = PipelinePlan([
+        _stage("asr", ("input",), "text"),
+        _stage("mt", ("text",), "translated", fail=True),
+        _stage("tts", ("translated",), "audio"),
+    ], "audio")
+    results = {}
+
+    with pytest.raises(RuntimeError, match="mt failed"):
+        asyncio.run(run_plan(plan, {"input": "x"}, results=results))
+    assert results["asr"].ok
+    assert results["mt"].error == "mt failed"
+    assert results["mt"].duration_ms is not None
+    assert "tts" not in results
+
+
+def test_non_critical_failure_only_skips_its_dependents():
+    plan = PipelinePlan([
+        _stage("mt:hi", ("input",), "text:hi", fail=True, critical=False),
+        _stage("tts:hi", ("text:hi",), "audio:hi", critical=False),
+        _stage("mt:te", ("input",), "text:te", critical=False),
+    ], "input")
+
+    data, results = asyncio.run(run_plan(plan, {"input": "x"}))
+    assert data["text:te"] == "mt:te(x)"
+    assert results["mt:hi"].error == "mt:hi failed"
+    assert results["tts:hi"].error == "Skipped: text:hi unavailable"
+    assert not results["tts:hi"].timed_out
+    assert "audio:hi" not in data
+
+
+def test_deadline_cancels_running_and_skips_pending_stages():
+    plan = PipelinePlan([
+        _stage("asr", ("input",), "text"),
+        _stage("mt", ("text",), "translated", delay=5),
+        _stage("tts", ("translated",), "audio"),
+    ], "audio")
+
+    async def run():
+        set_deadline(0.1)
+        return await run_plan(plan, {"input": "x"})
+
+    started = time.monotonic()
+    data, results = asyncio.run(run())
+    assert time.monotonic() - started < 1
+    assert data["text"] == "asr(x)" and "audio" not in data
+    assert results["asr"].ok
+    assert results["mt"].timed_out and results["mt"].error == "Deadline exceeded"
+    assert results["tts"].timed_out and results["tts"].error == "Skipped: deadline exceeded"
+
+
+def test_plan_rejects_inputs_nobody_produces():
+    with pytest.raises(ValueError, match="never produced: text"):
+        PipelinePlan([_stage("mt", ("text",), "translated")], "translated")
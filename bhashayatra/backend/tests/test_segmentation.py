@@ -0,0 +1,50 @@
+"""
+Sentence splitting of streamed text and VAD segmentation of PCM audio.
+
+Run from the backend folder: python -m pytest tests
+"""
+
+from array import array
+
+from app.services.streaming import SentenceSplitter
+from app.services.vad import UtteranceSegmenter
+from app.utils.validators import count_words
+
+RATE = 16000
+
+
+def _pcm(ms: int, amplitude: int) -> bytes:
+    return array("h", [amplitude, -amplitude] * (RATE * ms // 2000)).tobytes()
+
+
+def test_sentences_are_emitted_once_complete():
+    splitter = SentenceSplitter(max_words=50)
+    assert splitter.feed("नमस्ते दुनिया। How are") == ["नमस्ते दुनिया।"]
+    assert splitter.feed(" you? Fine\nthanks") == ["How are you?", "Fine"]
+    assert splitter.flush() == ["thanks"]
+    assert splitter.flush() == []
+
+
+def test_long_sentences_are_cut_to_the_word_limit():
+    splitter = SentenceSplitter(max_words=5)
+    pieces = splitter.feed("one two three four five six seven eight nine ten eleven. ") + splitter.flush()
+    assert pieces == ["one two three four five", "six seven eight nine ten", "eleven."]
+    assert all(count_words(piece) <= 5 for piece in pieces)
+
+
+def test_utterances_close_after_silence():
+    segmenter = UtteranceSegmenter(sample_rate=RATE, energy_threshold=500, silence_ms=300, pre_roll_ms=0)
+    speech, silence = _pcm(600, 3000), _pcm(600, 0)
+    utterances = segmenter.feed(silence + speech + silence + speech + silence)
+    assert len(utterances) == 2
+    assert segmenter.flush() is None
+    # Each utterance is the speech plus the silence hangover that closed it
+    assert all(len(speech) < len(u) <= len(speech) + len(_pcm(300, 0)) for u in utterances)
+
+
+def test_short_noise_is_dropped_and_open_speech_is_flushed():
+    segmenter = UtteranceSegmenter(sample_rate=RATE, energy_threshold=500, silence_ms=300, min_speech_ms=250)
+    assert segmenter.feed(_pcm(90, 3000) + _pcm(600, 0)) == []  # 90 ms click
+    assert segmenter.feed(_pcm(900, 3000)) == []
+    assert segmenter.in_utterance
+    assert segmenter.flush() is not None
@@ -0,0 +1,83 @@
+"""
+Upstream call scheduling (weighted fair queueing, bulk reserve) and latency sketches.
+
+Run from the backend folder: python -m pytest tests
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.upstream_scheduler import EndpointScheduler
+from app.services.upstream_stats import LatencySketch
+from app.utils.priority import BULK, INTERACTIVE, STANDARD
+
+
+def test_saturated_endpoint_serves_classes_by_weight():
+    async def run():
+        scheduler = EndpointScheduler(1, {INTERACTIVE: 2.0, STANDARD: 1.0, BULK: 1.0}, reserved=0)
+        await scheduler.acquire(STANDARD)  # holds the only slot
+        order = []
+
+        async def call(cls):
+            await scheduler.acquire(cls)
+            order.append(cls)
+
+        tasks = [asyncio.create_task(call(cls)) for cls in [STANDARD] * 4 + [INTERACTIVE] * 4]
+        await asyncio.sleep(0)
+        holder = STANDARD
+        for _ in tasks:
+            scheduler.release(holder)
+            await asyncio.sleep(0)
+            holder = order[-1]
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(run())
+    # Interactive has twice the weight: two interactive calls per standard one while both queue
+    assert order[:6].count(INTERACTIVE) == 4
+    assert order[:3] == [INTERACTIVE, INTERACTIVE, STANDARD]
+
+
+def test_bulk_never_takes_the_reserved_slots():
+    async def run():
+        scheduler = EndpointScheduler(4, {}, reserved=1)
+        await scheduler.acquire(STANDARD)
+        await scheduler.acquire(BULK)
+        await scheduler.acquire(BULK)
+        third_bulk = asyncio.create_task(scheduler.acquire(BULK))
+        await asyncio.sleep(0)
+        queued = scheduler.stats()["queued"][BULK]
+        await asyncio.wait_for(scheduler.acquire(INTERACTIVE), 1)  # the reserved slot is still free
+        scheduler.release(STANDARD)
+        scheduler.release(INTERACTIVE)
+        await asyncio.wait_for(third_bulk, 1)
+        return queued, scheduler.stats()["in_flight"]
+
+    queued, in_flight = asyncio.run(run())
+    assert queued == 1
+    assert in_flight == {INTERACTIVE: 0, STANDARD: 0, BULK: 3}
+
+
+def test_latency_sketch_quantiles_are_within_one_percent():
+    sketch = LatencySketch()
+    for ms in range(1, 1001):
+        sketch.add(float(ms))
+    assert sketch.quantile(0.5) == pytest.approx(500, rel=0.01)
+    assert sketch.quantile(0.99) == pytest.approx(990, rel=0.01)
+    assert sketch.quantile(1.0) == pytest.approx(1000, rel=0.01)
+    assert LatencySketch().quantile(0.5) is None
+
+
+def test_merged_sketches_match_one_sketch_of_all_values():
+    low, high, both = LatencySketch(), LatencySketch(), LatencySketch()
+    for ms in range(1, 501):
+        low.add(float(ms))
+        both.add(float(ms))
+    for ms in range(501, 1001):
+        high.add(float(ms))
+        both.add(float(ms))
+    merged = LatencySketch.merged([low, high])
+    assert merged.count == both.count
+    for q in (0.5, 0.9, 0.99):
+        assert merged.quantile(q) == both.quantile(q)